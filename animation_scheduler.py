@@ -0,0 +1,112 @@
+"""
+Animation Scheduler for Minesweeper
+Time-ordered cell animations: started at their start time, retired when finished
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class CellAnimation:
+    """Tracks animation state for a cell"""
+
+    start_time: float
+    duration: float
+    animation_type: str  # 'reveal', 'flag', 'unflag', 'explode'
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + self.duration
+
+
+class AnimationScheduler:
+    """
+    Cell animations kept in two heaps: waiting ones by start time and running ones by
+    end time.
+
+    A heap entry is a group of cells sharing one animation, such as a wave of a
+    cascade, so a big opening costs a few entries however many cells it reveals.
+    `update` moves animations along and reports what changed, so a frame only touches
+    animations that start or finish. Finished animations are dropped, so memory
+    follows the number of live (waiting or running) animations.
+    """
+
+    def __init__(self):
+        """Initialize an empty scheduler."""
+        self.pending: Dict[Hashable, CellAnimation] = {}
+        self.active: Dict[Hashable, CellAnimation] = {}
+        self._starts: List[Tuple[float, int, Tuple[Hashable, ...], CellAnimation]] = []
+        self._ends: List[Tuple[float, int, Tuple[Hashable, ...], CellAnimation]] = []
+        self._scheduled: List[Hashable] = []
+        self._sequence = 0
+
+    def schedule(self, key: Hashable, animation: CellAnimation):
+        """Animate a cell, replacing any animation it already has."""
+        self.schedule_group((key,), animation)
+
+    def schedule_group(self, keys: Sequence[Hashable], animation: CellAnimation):
+        """Animate cells together with one shared animation, replacing any they already have."""
+        keys = tuple(keys)
+        for key in keys:
+            self.active.pop(key, None)
+            self.pending[key] = animation
+        self._sequence += 1
+        heapq.heappush(self._starts, (animation.start_time, self._sequence, keys, animation))
+        self._scheduled.extend(keys)
+
+    def update(self, now: float) -> Tuple[List[Hashable], List[Hashable], List[Hashable]]:
+        """
+        Start and retire animations up to `now`.
+
+        Returns:
+            (cells scheduled since the last update that are still waiting to start,
+            cells whose animation started, cells whose animation finished)
+        """
+        started = []
+        while self._starts and self._starts[0][0] <= now:
+            _, sequence, keys, animation = heapq.heappop(self._starts)
+            keys = tuple(key for key in keys if self.pending.get(key) is animation)  # Not replaced before starting
+            if not keys:
+                continue
+            for key in keys:
+                del self.pending[key]
+                self.active[key] = animation
+            heapq.heappush(self._ends, (animation.end_time, sequence, keys, animation))
+            started.extend(keys)
+
+        finished = []
+        while self._ends and self._ends[0][0] <= now:
+            _, _, keys, animation = heapq.heappop(self._ends)
+            for key in keys:
+                if self.active.get(key) is animation:  # Not replaced while running
+                    del self.active[key]
+                    finished.append(key)
+
+        waiting = [key for key in dict.fromkeys(self._scheduled) if key in self.pending]
+        self._scheduled = []
+        return waiting, started, finished
+
+    def get(self, key: Hashable) -> Optional[CellAnimation]:
+        """The cell's waiting or running animation, if any."""
+        return self.active.get(key) or self.pending.get(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.active or key in self.pending
+
+    def __len__(self) -> int:
+        return len(self.active) + len(self.pending)
+
+    @property
+    def entries(self) -> int:
+        """Heap entries (cells or groups), including those of replaced animations not yet popped."""
+        return len(self._starts) + len(self._ends)
+
+    def clear(self):
+        """Drop every animation."""
+        self.pending.clear()
+        self.active.clear()
+        self._starts = []
+        self._ends = []
+        self._scheduled = []
@@ -0,0 +1,219 @@
+"""
+Batched Minesweeper Environment
+Steps many boards in lockstep with NumPy array operations (for training agents)
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Observation value for a cell that has not been revealed yet
+HIDDEN = -1
+
+# Offsets of the eight neighbours of a cell
+NEIGHBOR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+
+def count_adjacent(mines: np.ndarray) -> np.ndarray:
+    """
+    Count adjacent mines for every cell of a stack of boards.
+
+    Args:
+        mines: Boolean array of shape (K, size, size)
+
+    Returns:
+        int8 array of the same shape with the number of mines around each cell
+    """
+    size = mines.shape[-1]
+    padded = np.pad(mines, ((0, 0), (1, 1), (1, 1))).astype(np.int8)
+    counts = np.zeros(mines.shape, dtype=np.int8)
+    for dy, dx in NEIGHBOR_OFFSETS:
+        counts += padded[:, 1 + dy:1 + dy + size, 1 + dx:1 + dx + size]
+    return counts
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """Grow a boolean (K, size, size) mask by one cell in all eight directions."""
+    size = mask.shape[-1]
+    padded = np.pad(mask, ((0, 0), (1, 1), (1, 1)))
+    grown = mask.copy()
+    for dy, dx in NEIGHBOR_OFFSETS:
+        grown |= padded[:, 1 + dy:1 + dy + size, 1 + dx:1 + dx + size]
+    return grown
+
+
+def sample_mines(rng: np.random.Generator, size: int, num_mines: int,
+                 first_x: np.ndarray, first_y: np.ndarray) -> np.ndarray:
+    """
+    Place mines on several boards at once, following the game's first-click rule.
+
+    The first clicked cell and its neighbours are never mined, and the mine count is
+    clamped to the number of available cells.
+
+    Args:
+        rng: Random generator to draw from
+        size: Board side length
+        num_mines: Requested number of mines per board
+        first_x: Column of the first click for each board, shape (K,)
+        first_y: Row of the first click for each board, shape (K,)
+
+    Returns:
+        Boolean mine mask of shape (K, size, size)
+    """
+    count = len(first_x)
+    rows = np.arange(size)
+    excluded = ((np.abs(rows[None, :, None] - first_y[:, None, None]) <= 1) &
+                (np.abs(rows[None, None, :] - first_x[:, None, None]) <= 1))
+    available = size * size - excluded.reshape(count, -1).sum(axis=1)
+    actual_mines = int(min(num_mines, available.min()))
+
+    # Uniform sample without replacement: the `actual_mines` smallest random keys win
+    keys = rng.random((count, size * size))
+    keys[excluded.reshape(count, -1)] = np.inf
+    mines = np.zeros((count, size * size), dtype=bool)
+    if actual_mines > 0:
+        chosen = np.argpartition(keys, actual_mines - 1, axis=1)[:, :actual_mines]
+        np.put_along_axis(mines, chosen, True, axis=1)
+    return mines.reshape(count, size, size)
+
+
+class BatchedMinesweeperEnv:
+    """
+    Gym-style vectorized environment holding K boards as stacked arrays.
+
+    Each step applies one reveal action per board. Actions are flat cell indices
+    (`y * board_size + x`). Mines are placed on a board's first action, with the same
+    safe 3x3 first click as the game. Finished boards are reset automatically.
+    """
+
+    REWARD_WIN = 1.0
+    REWARD_LOSS = -1.0
+    REWARD_PROGRESS = 0.1
+    REWARD_NO_PROGRESS = -0.1
+
+    def __init__(self, num_envs: int, board_size: int = 10, num_mines: int = 15,
+                 seed: Optional[int] = None, autoreset: bool = True):
+        """
+        Initialize the batched environment.
+
+        Args:
+            num_envs: Number of boards stepped in lockstep
+            board_size: Board side length
+            num_mines: Number of mines per board
+            seed: Seed for the initial reset
+            autoreset: Reset finished boards at the end of each step
+        """
+        self.num_envs = num_envs
+        self.board_size = board_size
+        self.num_mines = num_mines
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_envs, board_size, board_size)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.adjacent = np.zeros(shape, dtype=np.int8)
+        self.first_click = np.ones(num_envs, dtype=bool)
+        self.safe_cells = np.zeros(num_envs, dtype=np.int32)
+        self.cells_revealed = np.zeros(num_envs, dtype=np.int32)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Reset every board.
+
+        Args:
+            seed: Reseed the environment's generator before resetting
+
+        Returns:
+            Observation array of shape (K, size, size)
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_boards(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    def _reset_boards(self, mask: np.ndarray):
+        """Clear the boards selected by a boolean (K,) mask."""
+        self.mines[mask] = False
+        self.revealed[mask] = False
+        self.adjacent[mask] = 0
+        self.first_click[mask] = True
+        self.cells_revealed[mask] = 0
+        self.steps[mask] = 0
+
+    def observe(self) -> np.ndarray:
+        """Visible state: adjacent counts on revealed cells, HIDDEN elsewhere."""
+        return np.where(self.revealed, self.adjacent, np.int8(HIDDEN))
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Reveal one cell on every board.
+
+        Args:
+            actions: Flat cell index per board, shape (K,)
+
+        Returns:
+            (observations, rewards, dones, info). `info` holds the boolean `won`
+            array and, with autoreset, `final_observation` for finished boards.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        size = self.board_size
+        ys, xs = np.divmod(actions, size)
+        envs = np.arange(self.num_envs)
+
+        # Lazily place mines on boards receiving their first click
+        placing = self.first_click.copy()
+        if placing.any():
+            self._place_mines(placing, xs[placing], ys[placing])
+
+        was_revealed = self.revealed[envs, ys, xs]
+        hit_mine = self.mines[envs, ys, xs] & ~was_revealed
+        before = self.cells_revealed.copy()
+
+        self.revealed[envs, ys, xs] = True
+        self._flood_fill(~was_revealed & ~hit_mine & (self.adjacent[envs, ys, xs] == 0))
+        self.cells_revealed = (self.revealed & ~self.mines).reshape(self.num_envs, -1).sum(axis=1, dtype=np.int32)
+        self.steps += 1
+
+        won = ~hit_mine & (self.cells_revealed >= self.safe_cells)
+        dones = hit_mine | won
+        rewards = np.where(self.cells_revealed > before, self.REWARD_PROGRESS, self.REWARD_NO_PROGRESS)
+        rewards = np.where(won, self.REWARD_WIN, rewards)
+        rewards = np.where(hit_mine, self.REWARD_LOSS, rewards)
+
+        info: Dict[str, np.ndarray] = {"won": won}
+        if self.autoreset and dones.any():
+            info["final_observation"] = self.observe()
+            self._reset_boards(dones)
+        return self.observe(), rewards.astype(np.float32), dones, info
+
+    def _place_mines(self, mask: np.ndarray, xs: np.ndarray, ys: np.ndarray):
+        """Generate the mine layout of the boards selected by `mask`."""
+        mines = sample_mines(self.rng, self.board_size, self.num_mines, xs, ys)
+        self.mines[mask] = mines
+        self.adjacent[mask] = count_adjacent(mines)
+        self.safe_cells[mask] = self.board_size * self.board_size - mines.reshape(len(xs), -1).sum(axis=1)
+        self.first_click[mask] = False
+
+    def _flood_fill(self, cascading: np.ndarray):
+        """
+        Expand openings on the boards selected by `cascading` until they settle.
+
+        Only boards whose last wave revealed new cells are processed, so cost follows
+        the number of active cascades rather than K.
+        """
+        active = np.flatnonzero(cascading)
+        while active.size:
+            revealed = self.revealed[active]
+            safe = ~self.mines[active]
+            zeros = revealed & safe & (self.adjacent[active] == 0)
+            grown = dilate(zeros) & safe
+            new_cells = grown & ~revealed
+            changed = new_cells.reshape(active.size, -1).any(axis=1)
+            self.revealed[active] = revealed | new_cells
+            active = active[changed]
+
+    def action_mask(self) -> np.ndarray:
+        """Boolean (K, size * size) mask of actions that reveal something new."""
+        return ~self.revealed.reshape(self.num_envs, -1)
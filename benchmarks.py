@@ -0,0 +1,881 @@
+"""
+Benchmarks for Minesweeper
+Measures throughput of the simulation and rendering paths
+
+Usage:
+    python benchmarks.py [name ...]
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+
+def bench_batched_env(num_envs: int = 4096, board_size: int = 10, num_mines: int = 15,
+                      steps: int = 200) -> float:
+    """
+    Step a batched environment with random actions on one core.
+
+    Returns:
+        Board steps per second
+    """
+    import numpy as np
+    from batched_env import BatchedMinesweeperEnv
+
+    env = BatchedMinesweeperEnv(num_envs, board_size, num_mines, seed=0)
+    env.reset()
+    rng = np.random.default_rng(1)
+    cells = board_size * board_size
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(rng.integers(0, cells, num_envs))
+    elapsed = time.perf_counter() - start
+
+    rate = num_envs * steps / elapsed
+    print(f"batched_env: {num_envs} boards x {steps} steps in {elapsed:.2f}s -> {rate:,.0f} steps/s")
+    return rate
+
+
+def bench_rating(board_size: int = 16, num_mines: int = 40, boards: int = 20) -> float:
+    """
+    Rate freshly generated boards with the process-pool rater.
+
+    Returns:
+        Boards rated per second
+    """
+    import random
+    from difficulty import BoardRater
+
+    rng = random.Random(0)
+    cells = board_size * board_size
+    first = cells // 2
+    rater = BoardRater()
+    available = [i for i in range(cells) if i not in _around(board_size, first)]
+    layouts = []
+    for _ in range(boards):
+        mines = set(rng.sample(available, num_mines))
+        layouts.append([i in mines for i in range(cells)])
+    rater.rate(board_size, layouts[0], first)  # Warm up the pool
+
+    start = time.perf_counter()
+    classes: Dict[str, int] = {}
+    for mines in layouts:
+        rating = rater.rate(board_size, mines, first)
+        classes[rating.difficulty] = classes.get(rating.difficulty, 0) + 1
+    elapsed = time.perf_counter() - start
+    rater.shutdown()
+
+    rate = boards / elapsed
+    print(f"rating: {boards} boards {board_size}x{board_size}/{num_mines} in {elapsed:.2f}s "
+          f"-> {elapsed / boards * 1000:.1f} ms/board {classes}")
+    return rate
+
+
+def bench_idle_render(board_size: int = 30, frames: int = 300) -> float:
+    """
+    Render frames of a game in progress that nobody touches, with and without dirty rectangles.
+
+    Returns:
+        CPU time ratio of full redraws to dirty-rectangle frames
+    """
+    import pygame
+    from dirty_rects import DirtyRegions
+
+    cpu_per_frame = {}
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        game.board_size = board_size
+        game.num_mines = board_size * board_size // 6
+        game._create_board()
+        game.state = GameState.PLAYING
+        x = y = board_size // 2
+        for _ in range(2):  # Generate, then open the first cells
+            bx, by, cs, _ = game._calculate_board_dimensions()
+            pos = (bx + x * cs + cs // 2, by + y * cs + cs // 2)
+            game._dispatch_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+        game.animations.clear()
+        _draw_settled(game)
+
+        for enabled in (False, True):
+            game.dirty = DirtyRegions(enabled)
+            start = time.process_time()
+            for _ in range(frames):
+                game.current_time = time.perf_counter()
+                game._draw_current_state()
+                full = game.dirty.needs_full_redraw()
+                rects = game.dirty.collect(game.screen.get_rect())
+                if full:
+                    pygame.display.flip()
+                elif rects:
+                    pygame.display.update(rects)
+            cpu_per_frame[enabled] = (time.process_time() - start) / frames
+            print(f"idle_render: dirty rects {'on ' if enabled else 'off'} {cpu_per_frame[enabled] * 1000:.2f} ms CPU/frame, "
+                  f"{game.dirty.get_average_pixels():,.0f} px/frame")
+
+    ratio = cpu_per_frame[False] / max(cpu_per_frame[True], 1e-9)
+    print(f"idle_render: {board_size}x{board_size} board, {ratio:.1f}x less CPU per idle frame")
+    return ratio
+
+
+def bench_frame(board_size: int = 25, frames: int = 200, dark_mode: bool = True) -> float:
+    """
+    Fully redraw a game in progress whose revealed cells are all mid-animation.
+
+    The board is the same on every run.
+
+    Returns:
+        Frames per second
+    """
+    import random
+    import pygame
+    from animation_scheduler import CellAnimation
+    from dirty_rects import DirtyRegions
+
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        random.seed(0)
+        game.board_size = board_size
+        game.num_mines = board_size * board_size // 8
+        game.dark_mode = dark_mode
+        game._create_board()
+        game.state = GameState.PLAYING
+        game.dirty = DirtyRegions(enabled=False)
+        bx, by, cs, _ = game._calculate_board_dimensions()
+        x = y = board_size // 2
+        for _ in range(2):  # Generate, then open the first cells
+            pos = (bx + x * cs + cs // 2, by + y * cs + cs // 2)
+            game._dispatch_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+        scheduler = game.animations
+        animations = {key: scheduler.get(key) for key in [*scheduler.pending, *scheduler.active]}
+        now = time.perf_counter()
+        for key, animation in animations.items():
+            scheduler.schedule(key, CellAnimation(now - animation.duration / 2, animation.duration,
+                                                  animation.animation_type))
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            game.current_time = now  # Frozen, so every animation stays halfway through
+            game._draw_current_state()
+        elapsed = time.perf_counter() - start
+
+    rate = frames / elapsed
+    print(f"frame: {board_size}x{board_size} board, {len(animations)} animating cells, "
+          f"{elapsed / frames * 1000:.2f} ms/frame ({rate:,.0f} fps)")
+    return rate
+
+
+def bench_board_area(sizes: Tuple[int, ...] = (10, 25, 50, 100), frames: int = 100) -> float:
+    """
+    Fully redraw settled boards of growing size with a few cells animating.
+
+    Returns:
+        Frame time ratio of the largest board to the smallest
+    """
+    import random
+    import pygame
+    from dirty_rects import DirtyRegions
+
+    frame_times = []
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        game.dirty = DirtyRegions(enabled=False)
+        for size in sizes:
+            random.seed(0)
+            game.board_size = size
+            game.num_mines = size * size // 8
+            game.current_time = time.perf_counter()
+            game._create_board()
+            game.state = GameState.PLAYING
+            bx, by, cs, _ = game._calculate_board_dimensions()
+            x = y = size // 2
+            for _ in range(2):  # Generate, then open the first cells
+                pos = (bx + x * cs + cs // 2, by + y * cs + cs // 2)
+                game._dispatch_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            game.current_time = time.perf_counter() + 60  # Let the opening settle
+            _draw_settled(game)
+
+            start = time.perf_counter()
+            for i in range(frames):
+                game.current_time = time.perf_counter() + 60
+                if i % 10 == 0:  # Keep a few flags animating
+                    for fx in range(4):
+                        game._toggle_flag(fx, 0)
+                game._draw_current_state()
+            elapsed = time.perf_counter() - start
+            frame_times.append(elapsed / frames)
+            print(f"board_area: {size}x{size} {elapsed / frames * 1000:.2f} ms/frame")
+
+    return frame_times[-1] / frame_times[0]
+
+
+def bench_camera(sizes: Tuple[int, ...] = (25, 50, 100, 200), frames: int = 100) -> float:
+    """
+    Pan across zoomed-in boards of growing size while a diagonal of flags animates.
+
+    Every frame is a full redraw, since panning moves the whole board.
+
+    Returns:
+        Frame time ratio of the largest board to the smallest
+    """
+    import random
+    import pygame
+
+    frame_times = []
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        for size in sizes:
+            random.seed(0)
+            game.board_size = size
+            game.num_mines = size * size // 8
+            game.current_time = time.perf_counter()
+            game._create_board()
+            game.state = GameState.PLAYING
+            bx, by, cs, _ = game._calculate_board_dimensions()
+            x = y = size // 2
+            for _ in range(2):  # Generate, then open the first cells
+                pos = (bx + x * cs + cs // 2, by + y * cs + cs // 2)
+                game._dispatch_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            game.camera.zoom_at(game.camera.viewport.center, 2)
+            game.current_time = time.perf_counter() + 60  # Let the opening settle
+            _draw_settled(game)
+
+            step = (7, 5)
+            start = time.perf_counter()
+            for i in range(frames):
+                game.current_time = time.perf_counter() + 60
+                if i % 10 == 0:  # Flags animating all over the board, mostly out of view
+                    for d in range(size):
+                        game._toggle_flag(d, d)
+                if not game.camera.pan(*step):
+                    step = (-step[0], -step[1])
+                game.dirty.invalidate_all()
+                game._draw_current_state()
+            elapsed = time.perf_counter() - start
+            frame_times.append(elapsed / frames)
+            print(f"camera: {size}x{size} at {game.camera.cell_size}px cells {elapsed / frames * 1000:.2f} ms/frame")
+
+    return frame_times[-1] / frame_times[0]
+
+
+def bench_pixel_board(board_size: int = 500, frames: int = 50) -> float:
+    """
+    Fully redraw a zoomed-out 500x500 board from cell codes at several cell sizes,
+    against one `pygame.draw.rect` per visible cell, and time the minimap.
+
+    Returns:
+        Speedup of the pixel path over per-cell rectangles at the smallest cell size
+    """
+    import random
+    import pygame
+    from dirty_rects import DirtyRegions
+    from pixel_renderer import build_color_table, render_minimap
+
+    speedups = []
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        random.seed(0)
+        game.board_size = board_size
+        game.num_mines = board_size * board_size // 8
+        game._create_board()
+        game.state = GameState.PLAYING
+        game.dirty = DirtyRegions(enabled=False)
+        rng = random.Random(1)
+        game.cell_codes[:] = [[rng.randrange(13) for _ in range(board_size)] for _ in range(board_size)]
+        theme = game._get_theme()
+        table = build_color_table(theme)
+
+        game._calculate_board_dimensions()  # Fit the camera
+        for cell_size in (1, 3, 5):
+            game.camera.cell_size = cell_size
+            game.camera.pan(0, 0)  # Re-clamp to the new size
+            bx, by, cs, _ = game._calculate_board_dimensions()
+            start = time.perf_counter()
+            for _ in range(frames):
+                game._draw_board_pixels(theme, bx, by, cs)
+            pixel_time = (time.perf_counter() - start) / frames
+
+            x0, y0, x1, y1 = game.camera.visible_cells()
+            start = time.perf_counter()
+            for _ in range(max(1, frames // 10)):
+                for y in range(y0, y1):
+                    for x in range(x0, x1):
+                        color = table[game.cell_codes[x, y]]
+                        pygame.draw.rect(game.screen, color, (bx + x * cs, by + y * cs, cs, cs))
+            rect_time = (time.perf_counter() - start) / max(1, frames // 10)
+            speedups.append(rect_time / pixel_time)
+            print(f"pixel_board: {(x1 - x0) * (y1 - y0):,} cells at {cs}px: pixel path {pixel_time * 1000:.2f} ms, "
+                  f"per-cell rects {rect_time * 1000:.1f} ms ({rect_time / pixel_time:.0f}x)")
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            render_minimap(game.cell_codes, table, 40)
+        print(f"pixel_board: minimap of {board_size}x{board_size} {(time.perf_counter() - start) / frames * 1000:.3f} ms")
+
+    return speedups[0]
+
+
+def bench_animation_scheduler(cells: int = 100_000, frame_time: float = 1 / 60) -> float:
+    """
+    Run a 100k-cell cascade through the animation scheduler at 60 FPS of simulated time.
+
+    Returns:
+        Mean microseconds per frame spent starting and retiring animations
+    """
+    import math
+    from animation_scheduler import AnimationScheduler, CellAnimation
+
+    side = math.isqrt(cells)
+    scheduler = AnimationScheduler()
+    now = 0.0
+    for i in range(cells):
+        y, x = divmod(i, side)
+        depth = max(abs(x - side // 2), abs(y - side // 2))  # Rings around the click, like a flood fill
+        scheduler.schedule((x, y), CellAnimation(now + depth * 0.03, 0.3, "reveal"))
+
+    frames = 0
+    changes = 0
+    peak_active = 0
+    start = time.perf_counter()
+    while len(scheduler):
+        now += frame_time
+        waiting, started, finished = scheduler.update(now)
+        changes += len(started) + len(finished)
+        peak_active = max(peak_active, len(scheduler.active))
+        frames += 1
+    elapsed = time.perf_counter() - start
+
+    per_frame = elapsed / frames * 1e6
+    print(f"animation_scheduler: {cells:,} cells over {frames} frames, {per_frame:.0f} us/frame, "
+          f"peak {peak_active:,} running, {len(scheduler)} left after the cascade")
+    return per_frame
+
+
+def bench_menu_background(width: int = 3840, height: int = 2160, frames: int = 120) -> float:
+    """
+    Draw the menu's parallax background at 4K.
+
+    Returns:
+        Frames per second
+    """
+    import pygame
+    from menu_animation import ParallaxBackground
+    from themes import compile_theme
+
+    screen = pygame.Surface((width, height))
+    theme = compile_theme("Ocean")
+    background = ParallaxBackground(width, height)
+    background.draw(screen, theme)  # Render the cached gradient
+
+    start = time.process_time()
+    for _ in range(frames):
+        background.update(1 / 60)
+        background.draw(screen, theme)
+    elapsed = time.process_time() - start
+
+    print(f"menu_background: {width}x{height} {elapsed / frames * 1000:.2f} ms CPU/frame")
+    return frames / elapsed
+
+
+def bench_screens(frames: int = 100) -> float:
+    """
+    Fully redraw every screen repeatedly, reporting the text cache's hit rate.
+
+    Returns:
+        Mean frames per second over the screens
+    """
+    from dirty_rects import DirtyRegions
+    from text_cache import text_cache
+
+    rates = []
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        game._create_board()
+        game.dirty = DirtyRegions(enabled=False)
+        for state in (GameState.MENU, GameState.SETTINGS, GameState.LEADERBOARD, GameState.ACHIEVEMENTS,
+                      GameState.PLAYING):
+            game.state = state
+            start = time.perf_counter()
+            for _ in range(frames):
+                game.current_time = time.perf_counter()
+                game._draw_current_state()
+            elapsed = time.perf_counter() - start
+            rates.append(frames / elapsed)
+            print(f"screens: {state.name.lower():<12} {elapsed / frames * 1000:.2f} ms/frame")
+
+    print(f"screens: text cache {text_cache.hits:,} hits, {text_cache.misses:,} misses "
+          f"({text_cache.get_hit_rate():.1%} hit rate)")
+    return sum(rates) / len(rates)
+
+
+def bench_resize(frames: int = 120, events_per_frame: int = 10) -> float:
+    """
+    Drag-resize the window on the settings screen (the most widgets), with the resize
+    events of each frame laid out once as the game does, and once per event as before.
+
+    Returns:
+        CPU time ratio of laying out per event to laying out once per frame
+    """
+    import pygame
+    from font_pool import font_pool
+
+    cpu_per_frame = {}
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        game.state = GameState.SETTINGS
+        game._get_idle_timeout = lambda: None  # Measure every frame
+        for per_event in (True, False):
+            loads = font_pool.loads
+            start = time.process_time()
+            for i in range(frames):
+                width, height = 900 + (i * 37) % 500, 650 + (i * 23) % 300
+                pygame.display.set_mode((width, height), pygame.RESIZABLE)  # The window manager's part
+                for j in range(events_per_frame):
+                    event = pygame.event.Event(pygame.VIDEORESIZE, w=width - j, h=height - j, size=(width - j, height - j))
+                    if per_event:  # What the loop used to do for each event
+                        game.windowed_size = event.size
+                        game._setup_fonts()
+                        game._setup_ui()
+                    pygame.event.post(event)
+                game._run_frame()
+            cpu_per_frame[per_event] = (time.process_time() - start) / frames
+            print(f"resize: layout {'per event ' if per_event else 'per frame '} "
+                  f"{cpu_per_frame[per_event] * 1000:.2f} ms CPU/frame, {font_pool.loads - loads} fonts loaded")
+
+    ratio = cpu_per_frame[True] / cpu_per_frame[False]
+    print(f"resize: {events_per_frame} resize events per frame, {ratio:.1f}x less CPU per frame; "
+          f"font pool {font_pool.hits:,} hits, {font_pool.loads} loads")
+    return ratio
+
+
+def bench_settings_motion(frames: int = 120, events_per_frame: int = 8) -> float:
+    """
+    Sweep the pointer across the settings screen's buttons with several motion events
+    per frame, coalesced and repainting only the widgets whose hover changed as the game
+    does, and once handling every event and redrawing the whole screen as before.
+
+    Returns:
+        CPU time ratio of the full redraws to the retained repaints
+    """
+    import pygame
+    import minesweeper
+
+    cpu_per_frame = {}
+    with _headless_game() as game:
+        game.state = minesweeper.GameState.SETTINGS
+        game._get_idle_timeout = lambda: None  # Measure every frame
+        # SDL's dummy driver copies the whole window on any update, so time the game's
+        # side only and count the pixels it would push
+        update, flip = pygame.display.update, pygame.display.flip
+        pygame.display.update = pygame.display.flip = lambda *args: None
+        buttons = [widget.rect for name, widget in game.settings_ui.widgets.items() if name.startswith("theme:")]
+        coalesce_motion = minesweeper.coalesce_motion
+        for retained in (False, True):
+            minesweeper.coalesce_motion = coalesce_motion if retained else list
+            pushed = 0
+            start = time.process_time()
+            for i in range(frames):
+                for j in range(events_per_frame):
+                    rect = buttons[(i * events_per_frame + j) // 3 % len(buttons)]
+                    pygame.event.post(pygame.event.Event(
+                        pygame.MOUSEMOTION, pos=(rect.x + j, rect.centery), rel=(1, 0), buttons=(0, 0, 0)))
+                if not retained:  # Any input used to redraw the screen
+                    game.input_since_draw = True
+                game._run_frame()
+                pushed += game.dirty.pixels_pushed
+            cpu_per_frame[retained] = (time.process_time() - start) / frames
+            print(f"settings_motion: {'retained' if retained else 'full redraw'} "
+                  f"{cpu_per_frame[retained] * 1000:.2f} ms CPU/frame, {pushed // frames:,} pixels pushed/frame")
+        minesweeper.coalesce_motion = coalesce_motion
+        pygame.display.update, pygame.display.flip = update, flip
+
+    ratio = cpu_per_frame[False] / cpu_per_frame[True]
+    print(f"settings_motion: {events_per_frame} motion events per frame, {ratio:.1f}x less CPU per frame")
+    return ratio
+
+
+def bench_frame_pacing(caps: Tuple[int, ...] = (60, 144, 240, 0), seconds: float = 1.0) -> float:
+    """
+    Run the menu (its background animates every frame) under several frame rate caps,
+    0 being uncapped, checking the pacing and that the background moves at the same
+    speed whatever the frame rate.
+
+    Returns:
+        Largest deviation of the background's speed from real time, as a fraction
+    """
+    with _headless_game() as game:
+        from frame_clock import FrameClock
+        from minesweeper import GameState
+
+        game.state = GameState.MENU
+        game._get_idle_timeout = lambda: None  # Measure every frame
+        worst = 0.0
+        for cap in caps:
+            game.frame_clock = FrameClock(cap)
+            game._run_frame()
+            start = game.frame_clock.now
+            animated = 0.0
+            while game.frame_clock.now - start < seconds:
+                game._run_frame()
+                animated += game.frame_clock.dt
+            wall = game.frame_clock.now - start
+            stats = game.frame_clock.get_stats()
+            speed = animated / wall
+            worst = max(worst, abs(speed - 1))
+            print(f"frame_pacing: cap {cap or 'none':>4} -> {stats.fps:6.1f} fps, mean {stats.mean_ms:5.2f} ms, "
+                  f"worst {stats.worst_ms:5.2f} ms, {stats.late} late; background at {speed:.3f}x real time "
+                  f"(fixed 16 ms steps: {stats.fps * 0.016:.2f}x)")
+
+    return worst
+
+
+def bench_loss_reveal(board_size: int = 25, mine_ratio: float = 0.25, frame_time: float = 1 / 60) -> float:
+    """
+    Draw the loss screen of a dense board while every mine's explosion plays, counting
+    surfaces the effects allocate.
+
+    Returns:
+        Mean surface allocations per frame after the first
+    """
+    import random
+    import pygame
+
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        random.seed(0)
+        game.board_size = board_size
+        game.num_mines = int(board_size * board_size * mine_ratio)
+        game.current_time = now = time.perf_counter()
+        game._create_board()
+        game.state = GameState.PLAYING
+        bx, by, cs, _ = game._calculate_board_dimensions()
+        click = lambda x, y: game._dispatch_event(
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(bx + x * cs + cs // 2, by + y * cs + cs // 2), button=1))
+        x = y = board_size // 2
+        click(x, y)  # Generate
+        click(*next((x, y) for y in range(board_size) for x in range(board_size) if game.board[y][x].is_mine))
+
+        frames = 0
+        first_frame_allocations = 0
+        start = time.perf_counter()
+        while len(game.animations):
+            game.current_time = now + frames * frame_time
+            game._draw_current_state()
+            if frames == 0:
+                first_frame_allocations = game.surfaces.allocations
+            frames += 1
+        elapsed = time.perf_counter() - start
+        later = game.surfaces.allocations - first_frame_allocations
+
+    per_frame = later / max(frames - 1, 1)
+    print(f"loss_reveal: {game.num_mines} mines over {frames} frames, {elapsed / frames * 1000:.2f} ms/frame, "
+          f"{first_frame_allocations} surfaces allocated in the first frame, {later} after "
+          f"({game.surfaces.reuses:,} reuses, {game.surfaces.reuses / frames:.1f} per frame)")
+    return per_frame
+
+
+def bench_cascade(board_size: int = 60, frame_time: float = 1 / 60) -> float:
+    """
+    Open most of a sparse board with one click and draw the cascade until it settles,
+    with cells animated in waves and, for comparison, one by one with no duration cap.
+
+    Returns:
+        Ratio of the per-cell mode's drawing time for the whole cascade to the wave mode's
+    """
+    import random
+    import pygame
+    import minesweeper
+    from animation_scheduler import CellAnimation
+
+    totals = {}
+    spread = minesweeper.MAX_CASCADE_SPREAD
+    for mode in ("per cell", "waves"):
+        with _headless_game() as game:
+            from minesweeper import GameState
+
+            if mode == "per cell":
+                minesweeper.MAX_CASCADE_SPREAD = board_size * board_size * minesweeper.CASCADE_STEP_DELAY
+                schedule_group = game.animations.schedule_group
+                game.animations.schedule_group = lambda keys, animation: [
+                    schedule_group((key,), CellAnimation(animation.start_time, animation.duration, animation.animation_type))
+                    for key in keys
+                ]
+            random.seed(0)
+            game.board_size = board_size
+            game.num_mines = board_size * board_size // 50
+            game.start_time = None  # Freeze the timer label
+            game.current_time = now = time.perf_counter()
+            game._create_board()
+            game.state = GameState.PLAYING
+            bx, by, cs, _ = game._calculate_board_dimensions()
+            x = y = board_size // 2
+            try:
+                for _ in range(2):  # Generate, then open the first cells
+                    pos = (bx + x * cs + cs // 2, by + y * cs + cs // 2)
+                    game._dispatch_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            finally:
+                minesweeper.MAX_CASCADE_SPREAD = spread
+            cells = len(game.animations)
+            entries = game.animations.entries
+            duration = max(game.animations.get(cell).end_time for cell in game.animations.pending) - now
+
+            _draw_settled(game)
+            frames = 0
+            cell_frames = 0
+            start = time.perf_counter()
+            while len(game.animations):
+                game.current_time = now + frames * frame_time
+                game._draw_current_state()
+                cell_frames += len(game.animations.active)
+                frames += 1
+            elapsed = time.perf_counter() - start
+
+        totals[mode] = elapsed
+        print(f"cascade ({mode}): {cells:,} cells in {entries:,} scheduler entries, settles after {duration:.2f}s "
+              f"({frames} frames at {cs}px cells), {elapsed * 1000:.0f} ms drawing, {elapsed / frames * 1000:.2f} ms/frame, "
+              f"{elapsed / max(cell_frames, 1) * 1e6:.1f} us per animated cell per frame")
+    return totals["per cell"] / totals["waves"]
+
+
+def bench_board_raster(board_size: int = 500, cell_size: int = 8, repeats: int = 3) -> float:
+    """
+    Rebuild the board layer of a 500x500 board on the calling thread (the default with
+    one core) and with tile threads up to one per core, next to the per-cell blits a
+    rebuild used to be.
+
+    Returns:
+        Speedup of one thread per core over drawing on the calling thread
+    """
+    import numpy as np
+    import pygame
+    from board_layer import BoardLayer
+    from pixel_renderer import CODE_BACKGROUND, TILE_CODES
+
+    cores = os.cpu_count() or 1
+    codes = np.random.default_rng(0).integers(0, CODE_BACKGROUND + 1, (board_size, board_size), dtype=np.uint8)
+    with _headless_game() as game:
+        atlas = game._get_atlas(cell_size)
+        background = game._get_theme().background
+
+        tiles = {code: atlas.get(key) for key, code in TILE_CODES.items()}
+        surface = pygame.Surface((board_size * cell_size, board_size * cell_size))
+        start = time.perf_counter()
+        surface.fill(background)
+        for x, column in enumerate(codes.tolist()):
+            for y, code in enumerate(column):
+                if code != CODE_BACKGROUND:
+                    surface.blit(tiles[code], (x * cell_size, y * cell_size))
+        per_cell = time.perf_counter() - start
+        print(f"board_raster: {board_size}x{board_size} at {cell_size}px cells, per-cell blits {per_cell * 1000:.0f} ms")
+
+        times = {}
+        for workers in sorted({1, 2, 4, cores}):
+            layer = BoardLayer(workers)
+            best = blocked = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                layer.rebuild(atlas, board_size, background, codes)
+                submitted = time.perf_counter()
+                while layer.poll() is None:
+                    time.sleep(0.0005)
+                best = min(best, time.perf_counter() - start)
+                blocked = min(blocked, submitted - start)
+                layer.invalidate()
+            layer.shutdown()
+            times[workers] = best
+            label = "inline" if workers == 1 else f"{workers} threads"
+            print(f"board_raster: {label:9} {best * 1000:.0f} ms to a finished layer "
+                  f"({times[1] / best:.2f}x), {blocked * 1000:.1f} ms of it blocking the frame")
+
+    print(f"board_raster: {cores} core(s) available")
+    return times[1] / times[cores]
+
+
+def bench_capture(seconds: float = 2.0) -> float:
+    """
+    Run the menu (redrawn every frame) at 60 FPS while recording it, with
+    `pygame.image.save` in the loop and through the frame recorder in both formats.
+
+    Returns:
+        Time the loop spends saving a frame inline, over the time it spends in `capture`
+    """
+    import pygame
+
+    spent_ms = {}
+    for mode in ("inline save", "png", "raw"):
+        settings = {"max_fps": 60}
+        if mode != "inline save":
+            settings.update(capture_dir="capture", capture_format=mode)
+        with _headless_game(settings) as game:
+            spent = [0.0, 0]
+            if mode == "inline save":
+                os.makedirs("capture")
+                run_frame = game._run_frame
+
+                def save_frame():
+                    running = run_frame()
+                    start = time.perf_counter()
+                    pygame.image.save(game.screen, f"capture/frame_{spent[1]:06d}.png")
+                    spent[0] += time.perf_counter() - start
+                    spent[1] += 1
+                    return running
+                game._run_frame = save_frame
+            else:
+                capture = game.recorder.capture
+
+                def timed_capture(screen, timestamp):
+                    start = time.perf_counter()
+                    capture(screen, timestamp)
+                    spent[0] += time.perf_counter() - start
+                    spent[1] += 1
+                game.recorder.capture = timed_capture
+
+            pygame.event.clear()
+            frames = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                game._run_frame()
+                frames += 1
+            elapsed = time.perf_counter() - start
+            recorder = game.recorder
+            if recorder is not None:
+                game.recorder = None
+                recorder.close()
+
+        spent_ms[mode] = spent[0] / max(spent[1], 1) * 1000
+        detail = f"{frames / elapsed:.1f} fps, {spent_ms[mode]:.2f} ms/frame in the loop"
+        if mode != "inline save":
+            detail += f", {recorder.written} written, {recorder.dropped} dropped"
+        print(f"capture ({mode}): {detail}")
+    return spent_ms["inline save"] / spent_ms["png"]
+
+
+def bench_idle_cpu(seconds: float = 1.0) -> float:
+    """
+    Run the main loop untouched on each screen, with and without sleeping while idle.
+
+    Returns:
+        Ratio of the CPU used polling every frame to the CPU used with idle sleeps
+    """
+    import pygame
+
+    cpu = {False: 0.0, True: 0.0}
+    with _headless_game() as game:
+        from minesweeper import GameState
+
+        game._create_board()
+        idle_timeout = game._get_idle_timeout
+        for state, focused in ((GameState.MENU, True), (GameState.SETTINGS, True), (GameState.LEADERBOARD, True),
+                               (GameState.ACHIEVEMENTS, True), (GameState.PLAYING, True),
+                               (GameState.PLAYING, False), (GameState.MENU, False)):
+            results = []
+            for sleeping in (False, True):
+                game._get_idle_timeout = idle_timeout if sleeping else lambda: None
+                game.state = state
+                game.window_focused = focused
+                if state == GameState.PLAYING:
+                    game.start_time = game.frame_clock.now  # Timer running
+                pygame.event.clear()
+                frames = 0
+                start_wall, start_cpu = time.perf_counter(), time.process_time()
+                while time.perf_counter() - start_wall < seconds:
+                    game._run_frame()
+                    frames += 1
+                wall = time.perf_counter() - start_wall
+                used = (time.process_time() - start_cpu) / wall
+                cpu[sleeping] += used
+                results.append(f"{used:6.1%} CPU {frames / wall:4.0f} fps")
+            label = f"{state.name.lower()}{'' if focused else ' (unfocused)'}"
+            print(f"idle_cpu: {label:<22} polling {results[0]}, sleeping {results[1]}")
+
+    ratio = cpu[False] / max(cpu[True], 1e-9)
+    print(f"idle_cpu: {ratio:.1f}x less CPU on average")
+    return ratio
+
+
+@contextlib.contextmanager
+def _headless_game(settings: Optional[Dict[str, object]] = None) -> Iterator:
+    """A game on SDL's dummy drivers, saving its files in a temporary directory, with optional settings."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    cwd = os.getcwd()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            if settings:
+                with open("game_settings.json", "w") as f:
+                    json.dump(settings, f)
+            from minesweeper import Minesweeper
+
+            game = Minesweeper()
+            try:
+                yield game
+            finally:
+                game.board_rater.shutdown()
+                game.post_mortem.shutdown()
+                game.board_layer.shutdown()
+                if game.recorder is not None:
+                    game.recorder.close()
+        finally:
+            os.chdir(cwd)
+
+
+def _draw_settled(game):
+    """Draw a frame, then wait for any board layer rebuild it started, so the frames after it draw the board."""
+    game._draw_current_state()
+    while game.board_layer.building:
+        time.sleep(0.001)
+        game._draw_current_state()
+
+
+def _around(size: int, cell: int) -> Set[int]:
+    """Cells of the 3x3 block centred on `cell`."""
+    y, x = divmod(cell, size)
+    return {ny * size + nx for ny in range(y - 1, y + 2) for nx in range(x - 1, x + 2)}
+
+
+BENCHMARKS: Dict[str, Callable[[], float]] = {
+    "batched_env": bench_batched_env,
+    "rating": bench_rating,
+    "idle_render": bench_idle_render,
+    "frame": bench_frame,
+    "screens": bench_screens,
+    "board_area": bench_board_area,
+    "camera": bench_camera,
+    "pixel_board": bench_pixel_board,
+    "animation_scheduler": bench_animation_scheduler,
+    "menu_background": bench_menu_background,
+    "idle_cpu": bench_idle_cpu,
+    "loss_reveal": bench_loss_reveal,
+    "resize": bench_resize,
+    "settings_motion": bench_settings_motion,
+    "frame_pacing": bench_frame_pacing,
+    "cascade": bench_cascade,
+    "board_raster": bench_board_raster,
+    "capture": bench_capture,
+}
+
+
+def main(names):
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
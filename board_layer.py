@@ -0,0 +1,220 @@
+"""
+Board Layer for Minesweeper
+Offscreen image of the settled board, rasterized in tiles (on worker threads with several cores) and updated one cell at a time as animations finish
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+import pygame
+
+from pixel_renderer import CODE_BACKGROUND, TILE_CODES
+from themes import Color
+from tile_atlas import TileAtlas, TileKey
+
+# Side of the tiles a rebuild is split into, in pixels; a board that fits in one is drawn at once
+TILE_PIXELS = 512
+
+# Tile of each cell code
+_CODE_TILES = {code: key for key, code in TILE_CODES.items()}
+
+
+@dataclass
+class _Build:
+    """A rebuild in progress: the new surface and the tiles being drawn into it."""
+
+    atlas: TileAtlas
+    board_size: int
+    background: Color
+    surface: pygame.Surface
+    pixels: np.ndarray  # The surface's pixels, locked by the main thread until the rebuild is polled
+    tiles: List[Future]
+
+
+class BoardLayer:
+    """
+    The board's cells that are not animating, pre-composited into one surface.
+
+    A cell whose animation is running is left empty (background) so the animated
+    cell can be drawn over it; when the animation ends the cell's tile is stamped in.
+
+    A rebuild (new board, theme or cell size) is drawn tile by tile into a new surface.
+    With more than one worker, the tiles of a large board are drawn by a thread pool
+    while the layer keeps its old surface (`building`); cells stamped or cleared in the
+    meantime are handed back by `poll` to be redrawn. The workers only write numpy
+    slices of the new surface's pixels, which the main thread locks and unlocks.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize layer (built on first use).
+
+        Args:
+            workers: Threads drawing the tiles of a rebuild (defaults to the CPU count);
+                with one, rebuilds are drawn at once on the calling thread
+        """
+        self.surface: Optional[pygame.Surface] = None
+        self.atlas: Optional[TileAtlas] = None
+        self.board_size = 0
+        self.background: Color = (0, 0, 0)
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._build: Optional[_Build] = None
+        self._stale: Set[Tuple[int, int]] = set()
+
+        # Statistics
+        self.rebuilds = 0
+        self.stamps = 0
+
+    @property
+    def building(self) -> bool:
+        """True while a rebuild's tiles are being drawn."""
+        return self._build is not None
+
+    def invalidate(self):
+        """Force a rebuild on next use (new board), dropping any rebuild in progress."""
+        self.surface = None
+        self._cancel()
+
+    def needs_rebuild(self, atlas: TileAtlas, board_size: int) -> bool:
+        """True if the layer was built (or is being built) for another board, theme or cell size."""
+        if self._build is not None:
+            return atlas is not self._build.atlas or board_size != self._build.board_size
+        return self.surface is None or atlas is not self.atlas or board_size != self.board_size
+
+    def rebuild(self, atlas: TileAtlas, board_size: int, background: Color, codes: np.ndarray):
+        """
+        Start rendering every cell; `poll` puts the result in place.
+
+        Args:
+            atlas: Tiles to draw with (fixes the theme and cell size)
+            board_size: Board side length
+            background: Color behind the tiles
+            codes: Code of each cell's tile (see `pixel_renderer.TILE_CODES`) indexed [x, y],
+                CODE_BACKGROUND to leave it empty
+        """
+        self._cancel()
+        cell_size = atlas.cell_size
+        size = board_size * cell_size
+        surface = pygame.Surface((size, size))
+        blocks = _get_cell_pixels(atlas, background, surface)
+        pixels = pygame.surfarray.pixels2d(surface)
+        step = max(1, TILE_PIXELS // cell_size)
+        threaded = self.workers > 1 and step < board_size  # One tile is not worth a thread
+        tiles = []
+        for x in range(0, board_size, step):
+            for y in range(0, board_size, step):
+                tile_codes = codes[x:x + step, y:y + step].copy()
+                width, height = tile_codes.shape
+                tile = pixels[x * cell_size:(x + width) * cell_size, y * cell_size:(y + height) * cell_size]
+                if threaded:
+                    tiles.append(self._get_pool().submit(_draw_tile, tile, tile_codes, blocks))
+                else:
+                    tiles.append(_done(_draw_tile(tile, tile_codes, blocks)))
+        self._build = _Build(atlas, board_size, background, surface, pixels, tiles)
+
+    def poll(self) -> Optional[Set[Tuple[int, int]]]:
+        """
+        Put a finished rebuild in place.
+
+        Returns:
+            None if no rebuild finished; otherwise the cells stamped or cleared since it
+            started, which it doesn't show
+        """
+        build = self._build
+        if build is None or not all(tile.done() for tile in build.tiles):
+            return None
+        for tile in build.tiles:
+            tile.result()  # Raise a worker's error here
+        build.pixels = None  # Unlock the surface
+        self.surface = build.surface
+        self.atlas = build.atlas
+        self.board_size = build.board_size
+        self.background = build.background
+        self._build = None
+        self.rebuilds += 1
+        stale, self._stale = self._stale, set()
+        return stale
+
+    def stamp(self, x: int, y: int, key: TileKey):
+        """Draw a settled cell."""
+        if self._build is not None:
+            self._stale.add((x, y))
+            return
+        self.surface.fill(self.background, self._cell_rect(x, y))
+        self.surface.blit(self.atlas.get(key), self._cell_pos(x, y))
+        self.stamps += 1
+
+    def clear(self, x: int, y: int):
+        """Empty a cell that is about to be drawn animated."""
+        if self._build is not None:
+            self._stale.add((x, y))
+            return
+        self.surface.fill(self.background, self._cell_rect(x, y))
+
+    def shutdown(self):
+        """Stop the tile threads."""
+        self._cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _cancel(self):
+        """Drop a rebuild in progress; its tiles still being drawn finish into the dropped pixels."""
+        if self._build is not None:
+            for tile in self._build.tiles:
+                tile.cancel()
+            self._build = None
+        self._stale.clear()
+
+    def _cell_pos(self, x: int, y: int) -> Tuple[int, int]:
+        return x * self.atlas.cell_size, y * self.atlas.cell_size
+
+    def _cell_rect(self, x: int, y: int) -> pygame.Rect:
+        cell_size = self.atlas.cell_size
+        return pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+
+
+def _get_cell_pixels(atlas: TileAtlas, background: Color, surface: pygame.Surface) -> np.ndarray:
+    """
+    Pixels of a whole cell (tile over background, gap included) for every cell code.
+
+    Returns:
+        Mapped colors in `surface`'s format, of shape (CODE_BACKGROUND + 1, cell_size, cell_size) indexed [code, x, y]
+    """
+    cell_size = atlas.cell_size
+    blocks = np.zeros((CODE_BACKGROUND + 1, cell_size, cell_size), dtype=np.uint32)
+    block = pygame.Surface((cell_size, cell_size), 0, surface)
+    for code in range(CODE_BACKGROUND + 1):
+        block.fill(background)
+        if code != CODE_BACKGROUND:
+            block.blit(atlas.get(_CODE_TILES[code]), (0, 0))
+        blocks[code] = pygame.surfarray.array2d(block)
+    return blocks
+
+
+def _draw_tile(pixels: np.ndarray, codes: np.ndarray, blocks: np.ndarray):
+    """
+    Rasterize cells into a tile of the layer's pixels, indexed [x, y] (may run on a worker thread).
+
+    Only numpy touches the pixels, and it releases the GIL, so tiles are drawn in parallel.
+    """
+    width, height = codes.shape
+    cell_size = blocks.shape[1]
+    # Splitting the axes is always a view, so this writes straight into the surface
+    pixels.reshape(width, cell_size, height, cell_size)[...] = blocks[codes].transpose(0, 2, 1, 3)
+
+
+def _done(result) -> Future:
+    """A future that already has its result."""
+    future = Future()
+    future.set_result(result)
+    return future
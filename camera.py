@@ -0,0 +1,143 @@
+"""
+Board Camera for Minesweeper
+Maps between board cells and the screen, with zoom, panning and visible-cell culling
+"""
+
+from typing import Optional, Tuple
+
+import pygame
+
+# Cell size change per mouse-wheel notch
+ZOOM_STEP = 1.25
+
+
+class Camera:
+    """
+    Which part of the board is shown in the board viewport, and at what cell size.
+
+    A board smaller than the viewport is centred in it; a larger one can be panned
+    until its edges reach the viewport's. Fitting (on a new board size or window
+    size) shows the whole board if the cell size limits allow.
+    """
+
+    def __init__(self, min_cell_size: int, max_cell_size: int, max_board_pixels: int):
+        """
+        Initialize camera (fitted on first use).
+
+        Args:
+            min_cell_size: Smallest fitted cell size; a board too large for the screen
+                at this size can be zoomed out until it fits
+            max_cell_size: Largest fitted cell size; zooming may go up to twice this
+            max_board_pixels: Largest board side in pixels zooming may reach
+        """
+        self.min_cell_size = min_cell_size
+        self.max_cell_size = max_cell_size
+        self.max_board_pixels = max_board_pixels
+        self.viewport = pygame.Rect(0, 0, 0, 0)
+        self.board_size = 0
+        self.cell_size = min_cell_size
+        self.zoom_floor = min_cell_size
+        self.zoom_limit = min_cell_size
+        self.board_x = 0
+        self.board_y = 0
+
+    def fit(self, viewport: pygame.Rect, board_size: int) -> bool:
+        """
+        Show the whole board centred in `viewport`, unless it is what is shown already.
+
+        Returns:
+            True if the view changed
+        """
+        if viewport == self.viewport and board_size == self.board_size:
+            return False
+        self.viewport = pygame.Rect(viewport)
+        self.board_size = board_size
+
+        fitted = min(viewport.width // board_size, viewport.height // board_size)
+        self.cell_size = max(self.min_cell_size, min(self.max_cell_size, fitted))
+        self.zoom_floor = max(1, min(self.cell_size, fitted))
+        zoom_limit = min(2 * self.max_cell_size, self.max_board_pixels // board_size)
+        self.zoom_limit = max(self.cell_size, zoom_limit)
+        self.board_x = viewport.x + (viewport.width - self.board_pixels) // 2
+        self.board_y = viewport.y + (viewport.height - self.board_pixels) // 2
+        return True
+
+    @property
+    def board_pixels(self) -> int:
+        """Side length of the whole board on screen."""
+        return self.board_size * self.cell_size
+
+    def zoom_at(self, pos: Tuple[int, int], notches: float) -> bool:
+        """
+        Zoom in (positive notches) or out, keeping the board point under `pos` in place.
+
+        Returns:
+            True if the view changed
+        """
+        cell_size = round(self.cell_size * ZOOM_STEP ** notches)
+        if cell_size == self.cell_size and notches:  # Small cells: step by at least a pixel
+            cell_size += 1 if notches > 0 else -1
+        cell_size = max(self.zoom_floor, min(self.zoom_limit, cell_size))
+        if cell_size == self.cell_size:
+            return False
+
+        scale = cell_size / self.cell_size
+        self.board_x = pos[0] - round((pos[0] - self.board_x) * scale)
+        self.board_y = pos[1] - round((pos[1] - self.board_y) * scale)
+        self.cell_size = cell_size
+        self._clamp()
+        return True
+
+    def pan(self, dx: int, dy: int) -> bool:
+        """
+        Move the board by (dx, dy) screen pixels, as far as the board's edges allow.
+
+        Returns:
+            True if the view changed
+        """
+        before = (self.board_x, self.board_y)
+        self.board_x += dx
+        self.board_y += dy
+        self._clamp()
+        return (self.board_x, self.board_y) != before
+
+    def cell_at(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """The cell under a screen position, or None outside the board or viewport."""
+        if not self.viewport.collidepoint(pos):
+            return None
+        x = (pos[0] - self.board_x) // self.cell_size
+        y = (pos[1] - self.board_y) // self.cell_size
+        if 0 <= x < self.board_size and 0 <= y < self.board_size:
+            return x, y
+        return None
+
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """
+        Cells intersecting the viewport.
+
+        Returns:
+            (first column, first row, last column + 1, last row + 1)
+        """
+        cell_size = self.cell_size
+        x0 = max(0, (self.viewport.left - self.board_x) // cell_size)
+        y0 = max(0, (self.viewport.top - self.board_y) // cell_size)
+        x1 = min(self.board_size, -(-(self.viewport.right - self.board_x) // cell_size))
+        y1 = min(self.board_size, -(-(self.viewport.bottom - self.board_y) // cell_size))
+        return x0, y0, max(x0, x1), max(y0, y1)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """True if the cell intersects the viewport."""
+        x0, y0, x1, y1 = self.visible_cells()
+        return x0 <= x < x1 and y0 <= y < y1
+
+    def _clamp(self):
+        size = self.board_pixels
+        self.board_x = _clamp_axis(self.board_x, self.viewport.x, self.viewport.width, size)
+        self.board_y = _clamp_axis(self.board_y, self.viewport.y, self.viewport.height, size)
+
+
+def _clamp_axis(origin: int, start: int, length: int, size: int) -> int:
+    """Centre the board along an axis where it fits, else keep the viewport covered."""
+    if size <= length:
+        return start + (length - size) // 2
+    return max(start + length - size, min(start, origin))
@@ -0,0 +1,181 @@
+"""
+Board Difficulty Rating for Minesweeper
+Rates a generated board by simulated solving: forced guesses, guess risk and 3BV
+"""
+
+import multiprocessing
+import os
+import random
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from solver import HIDDEN, adjacent_counts, deduce, mine_probabilities, neighbors, reveal
+
+# Difficulty classes, easiest first
+DIFFICULTY_CLASSES = ["Easy", "Medium", "Hard", "Evil"]
+
+
+@dataclass
+class BoardRating:
+    """Result of rating a board."""
+
+    three_bv: int
+    forced_guesses: float  # Mean number of guesses per rollout
+    guess_risk: float  # Probability that at least one guess hits a mine
+    rollouts: int
+    difficulty: str
+
+
+def three_bv(size: int, mines: List[bool]) -> int:
+    """
+    Compute the 3BV of a board: the minimum number of clicks to clear it.
+
+    Every opening counts once, plus every numbered cell not bordering an opening.
+    """
+    counts = adjacent_counts(size, mines)
+    adj = neighbors(size)
+    marked = [False] * (size * size)
+    clicks = 0
+
+    for start in range(size * size):
+        if marked[start] or mines[start] or counts[start]:
+            continue
+        clicks += 1
+        marked[start] = True
+        stack = [start]
+        while stack:
+            cell = stack.pop()
+            for n in adj[cell]:
+                if not marked[n] and not mines[n]:
+                    marked[n] = True
+                    if counts[n] == 0:
+                        stack.append(n)
+
+    clicks += sum(1 for i in range(size * size) if not marked[i] and not mines[i])
+    return clicks
+
+
+def play_rollout(size: int, mines: List[bool], first_click: int, seed: int) -> Tuple[int, float, bool]:
+    """
+    Solve a board with deductions, guessing the safest cell whenever stuck.
+
+    Ties between equally safe guesses are broken with the rollout's own random
+    generator, so different seeds explore different guessing orders. A guess that
+    hits a mine marks it as known and solving continues, so the guess count and
+    risk always cover the whole board.
+
+    Args:
+        size: Board side length
+        mines: Flat mine layout
+        first_click: Cell of the (always safe) first click
+        seed: Seed for tie-breaking
+
+    Returns:
+        (number of guesses, survival probability of those guesses, won without hitting a mine)
+    """
+    rng = random.Random(seed)
+    counts = adjacent_counts(size, mines)
+    total_mines = sum(mines)
+    safe_total = size * size - total_mines
+    visible = [HIDDEN] * (size * size)
+    revealed = reveal(size, mines, counts, visible, first_click)
+    known_mines = set()
+    guesses = 0
+    survival = 1.0
+    won = True
+
+    while revealed < safe_total:
+        safe, known_mines = deduce(size, visible, known_mines)
+        if safe:
+            for cell in safe:
+                revealed += reveal(size, mines, counts, visible, cell)
+            continue
+
+        probs = mine_probabilities(size, visible, total_mines, known_mines)
+        best = min(probs.values())
+        guess = rng.choice([cell for cell, p in probs.items() if p <= best + 1e-12])
+        guesses += 1
+        survival *= 1.0 - best
+        if mines[guess]:
+            won = False
+            known_mines = known_mines | {guess}
+            continue
+        revealed += reveal(size, mines, counts, visible, guess)
+
+    return guesses, survival, won
+
+
+def _rollout_chunk(size: int, mines: List[bool], first_click: int, seeds: List[int]) -> List[Tuple[int, float, bool]]:
+    return [play_rollout(size, mines, first_click, seed) for seed in seeds]
+
+
+def difficulty_class(forced_guesses: float, guess_risk: float) -> str:
+    """Bucket a rating into one of DIFFICULTY_CLASSES."""
+    if forced_guesses == 0:
+        return "Easy"
+    if guess_risk < 0.25:
+        return "Medium"
+    if guess_risk < 0.6:
+        return "Hard"
+    return "Evil"
+
+
+def summarize(size: int, mines: List[bool], results: List[Tuple[int, float, bool]]) -> BoardRating:
+    """Combine rollout results into a BoardRating."""
+    forced = sum(r[0] for r in results) / len(results)
+    risk = 1.0 - sum(r[1] for r in results) / len(results)
+    return BoardRating(three_bv(size, mines), forced, risk, len(results), difficulty_class(forced, risk))
+
+
+def rate_board(size: int, mines: List[bool], first_click: int, rollouts: int = 8, seed: int = 0) -> BoardRating:
+    """Rate a board in the current process."""
+    results = _rollout_chunk(size, mines, first_click, [seed + i for i in range(rollouts)])
+    return summarize(size, mines, results)
+
+
+class BoardRater:
+    """Rates boards with rollouts spread over a process pool."""
+
+    def __init__(self, rollouts: int = 8, workers: Optional[int] = None):
+        """
+        Initialize board rater.
+
+        Args:
+            rollouts: Guessing rollouts per board
+            workers: Worker processes (defaults to the CPU count)
+        """
+        self.rollouts = rollouts
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._submitter: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the game's SDL state or threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def rate(self, size: int, mines: List[bool], first_click: int, seed: int = 0) -> BoardRating:
+        """Rate a board, running its rollouts in parallel and waiting for the result."""
+        pool = self._get_pool()
+        chunks = max(1, min(self.rollouts, self.workers or os.cpu_count() or 1))
+        seeds = [seed + i for i in range(self.rollouts)]
+        futures = [pool.submit(_rollout_chunk, size, mines, first_click, seeds[i::chunks]) for i in range(chunks)]
+        results = [result for future in futures for result in future.result()]
+        return summarize(size, mines, results)
+
+    def submit(self, size: int, mines: List[bool], first_click: int, seed: int = 0) -> Future:
+        """Rate a board in the background; returns a Future of the BoardRating."""
+        if self._submitter is None:
+            self._submitter = ThreadPoolExecutor(max_workers=1)
+        return self._submitter.submit(self.rate, size, list(mines), first_click, seed)
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        if self._submitter is not None:
+            self._submitter.shutdown(wait=False, cancel_futures=True)
+            self._submitter = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
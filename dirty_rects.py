@@ -0,0 +1,86 @@
+"""
+Dirty-Rectangle Tracking for Minesweeper
+Collects the screen regions changed in a frame so only those are redrawn and pushed
+"""
+
+from typing import List
+
+import pygame
+
+# Above this many rectangles a single full-screen update is cheaper
+MAX_RECTS = 64
+
+
+class DirtyRegions:
+    """Screen regions waiting to be pushed to the display, with push statistics."""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize tracker.
+
+        Args:
+            enabled: If False every frame is a full redraw (the old behaviour)
+        """
+        self.enabled = enabled
+        self.full = True
+        self.rects: List[pygame.Rect] = []
+
+        # Statistics
+        self.frames = 0
+        self.pixels_pushed = 0  # Pixels pushed by the last frame
+        self.total_pixels_pushed = 0
+
+    def add(self, rect: pygame.Rect):
+        """Mark a screen region as changed."""
+        if not self.full:
+            self.rects.append(pygame.Rect(rect))
+
+    def invalidate_all(self):
+        """Mark the whole screen as changed."""
+        self.full = True
+        self.rects = []
+
+    def needs_full_redraw(self) -> bool:
+        """True if the next frame must redraw the whole screen."""
+        return self.full or not self.enabled
+
+    def collect(self, screen_rect: pygame.Rect) -> List[pygame.Rect]:
+        """
+        Take the regions to push this frame and reset the tracker.
+
+        Overlapping rectangles are merged and everything is clipped to the screen.
+
+        Returns:
+            Rectangles to pass to `pygame.display.update` (the whole screen for a
+            full redraw, empty if nothing changed)
+        """
+        if self.needs_full_redraw():
+            rects = [pygame.Rect(screen_rect)]
+        else:
+            rects = _merge([rect.clip(screen_rect) for rect in self.rects if rect.colliderect(screen_rect)])
+            if len(rects) > MAX_RECTS:
+                rects = [rects[0].unionall(rects[1:])]
+
+        self.full = False
+        self.rects = []
+        self.frames += 1
+        self.pixels_pushed = sum(rect.width * rect.height for rect in rects)
+        self.total_pixels_pushed += self.pixels_pushed
+        return rects
+
+    def get_average_pixels(self) -> float:
+        """Average pixels pushed per frame so far."""
+        return self.total_pixels_pushed / self.frames if self.frames else 0.0
+
+
+def _merge(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Merge overlapping rectangles until none overlap."""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        while True:
+            index = rect.collidelist(merged)
+            if index < 0:
+                break
+            rect = rect.union(merged.pop(index))
+        merged.append(rect)
+    return merged
@@ -0,0 +1,56 @@
+"""
+Font Pool for Minesweeper
+Shares the default font by size, so re-laying out the UI never loads a font it already has
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Number of font sizes kept; the least recently used are dropped first
+MAX_FONTS = 64
+
+
+class FontPool:
+    """Least-recently-used pool of the default pygame font by size, with load/hit counters."""
+
+    def __init__(self, capacity: int = MAX_FONTS):
+        """
+        Initialize pool.
+
+        Args:
+            capacity: Number of font sizes to keep
+        """
+        self.capacity = capacity
+        self._fonts: "OrderedDict[int, pygame.font.Font]" = OrderedDict()
+        self.loads = 0
+        self.hits = 0
+
+    def get(self, size: int) -> pygame.font.Font:
+        """
+        Get the default font at a size, loading it on first use.
+
+        The font is shared: widgets may keep it, but must not change its style.
+        """
+        size = max(1, size)
+        font = self._fonts.get(size)
+        if font is not None:
+            self.hits += 1
+            self._fonts.move_to_end(size)
+            return font
+
+        self.loads += 1
+        font = pygame.font.Font(None, size)
+        self._fonts[size] = font
+        if len(self._fonts) > self.capacity:
+            self._fonts.popitem(last=False)
+        return font
+
+
+# Shared by every widget and screen
+font_pool = FontPool()
+
+
+def get_font(size: int) -> pygame.font.Font:
+    """Get a font through the shared pool."""
+    return font_pool.get(size)
@@ -0,0 +1,157 @@
+"""
+Frame Capture for Minesweeper
+Records the frames the game shows, copying them into a ring of reusable buffers that a background thread writes to disk
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import Optional, Tuple
+
+import pygame
+
+# Frames waiting to be written; when all buffers are waiting, new frames are dropped
+RING_SIZE = 8
+
+# Output formats: numbered PNG files, or one stream of zlib-compressed RGB frames
+FORMATS = ("png", "raw")
+
+# Raw stream layout: the magic, then per frame a header (timestamp, width, height,
+# compressed size) followed by the compressed RGB pixels, rows top to bottom
+RAW_MAGIC = b"MINESREC1\n"
+RAW_FRAME_HEADER = struct.Struct("<dIII")
+
+# zlib level of the raw stream: fast, since the writer has to keep up with the game
+RAW_COMPRESSION = 1
+
+
+class FrameRecorder:
+    """
+    Records gameplay without slowing the game loop down.
+
+    `capture` copies a frame into a free buffer of the ring and queues it; a writer
+    thread encodes queued frames and hands their buffers back. If the writer falls
+    behind and no buffer is free, the frame is dropped rather than waited for, and
+    counted in `dropped`.
+    """
+
+    def __init__(self, directory: str, fmt: str = "png", ring_size: int = RING_SIZE):
+        """
+        Start recording.
+
+        Args:
+            directory: Folder for the recording (created if needed)
+            fmt: "png" for numbered PNG files (with a timestamps.txt index) or "raw"
+                for a compressed stream in capture.raw
+            ring_size: Frame buffers; how far the writer may fall behind before frames drop
+
+        Raises:
+            ValueError: If the format is unknown
+            OSError: If the output can't be created
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown capture format {fmt!r} (use {' or '.join(FORMATS)})")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = fmt
+        if fmt == "raw":
+            self._output = open(os.path.join(directory, "capture.raw"), "wb")
+            self._output.write(RAW_MAGIC)
+        else:
+            self._output = open(os.path.join(directory, "timestamps.txt"), "w")
+
+        self._free: "queue.Queue[Optional[pygame.Surface]]" = queue.Queue()
+        for _ in range(ring_size):
+            self._free.put(None)  # Allocated on first use, at the frame's size
+        self._queued: "queue.Queue[Optional[Tuple[int, float, pygame.Surface]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_frames, name="FrameRecorder", daemon=True)
+        self._writer.start()
+
+        # Statistics
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.error: Optional[str] = None
+
+    def capture(self, screen: pygame.Surface, timestamp: float) -> bool:
+        """
+        Queue a frame for writing, or drop it if every buffer is still queued.
+
+        Args:
+            screen: The frame, as pushed to the display
+            timestamp: When the frame was shown, in seconds
+
+        Returns:
+            True if the frame was queued
+        """
+        if self.error is not None:
+            return False
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        if buffer is None or buffer.get_size() != screen.get_size():
+            buffer = pygame.Surface(screen.get_size(), 0, screen)
+        buffer.blit(screen, (0, 0))
+        self._queued.put((self.captured, timestamp, buffer))
+        self.captured += 1
+        return True
+
+    def close(self):
+        """Write the frames still queued, stop the writer and report what was recorded."""
+        if self._writer.is_alive():
+            self._queued.put(None)
+            self._writer.join()
+        self._output.close()
+        print(f"Capture: {self.written} frames written to {self.directory}, {self.dropped} dropped")
+
+    def _write_frames(self):
+        """Writer thread: encode queued frames until `close`."""
+        while True:
+            item = self._queued.get()
+            if item is None:
+                return
+            index, timestamp, buffer = item
+            try:
+                if self.error is None:
+                    self._write_frame(index, timestamp, buffer)
+                    self.written += 1
+            except (OSError, pygame.error) as e:
+                self.error = str(e)
+                print(f"Capture stopped: {e}")
+            finally:
+                self._free.put(buffer)
+
+    def _write_frame(self, index: int, timestamp: float, buffer: pygame.Surface):
+        if self.format == "png":
+            name = f"frame_{index:06d}.png"
+            pygame.image.save(buffer, os.path.join(self.directory, name))
+            self._output.write(f"{name} {timestamp:.4f}\n")
+        else:
+            width, height = buffer.get_size()
+            pixels = zlib.compress(pygame.image.tobytes(buffer, "RGB"), RAW_COMPRESSION)
+            self._output.write(RAW_FRAME_HEADER.pack(timestamp, width, height, len(pixels)))
+            self._output.write(pixels)
+
+
+def read_raw_capture(path: str):
+    """
+    Read back a raw capture.
+
+    Yields:
+        (timestamp, surface) for each frame
+    """
+    with open(path, "rb") as f:
+        if f.read(len(RAW_MAGIC)) != RAW_MAGIC:
+            raise ValueError(f"{path} is not a raw capture")
+        while True:
+            header = f.read(RAW_FRAME_HEADER.size)
+            if len(header) < RAW_FRAME_HEADER.size:
+                return
+            timestamp, width, height, size = RAW_FRAME_HEADER.unpack(header)
+            pixels = zlib.decompress(f.read(size))
+            yield timestamp, pygame.image.frombytes(pixels, (width, height), "RGB")
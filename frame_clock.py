@@ -0,0 +1,94 @@
+"""
+Frame Clock for Minesweeper
+Samples the time once per frame, gives animations the real time between frames and paces the frame rate
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+
+# Longest step animations take, so a stall (window drag, debugger) doesn't make them jump
+MAX_FRAME_DT = 0.25
+
+# Frames kept for the pacing statistics
+PACING_WINDOW = 240
+
+# A paced frame this many times longer than the target interval counts as late
+LATE_FACTOR = 1.5
+
+
+@dataclass
+class FrameStats:
+    """Pacing of the recent frames that ran at full rate (not those sleeping until input)."""
+
+    frames: int
+    fps: float
+    mean_ms: float
+    worst_ms: float
+    late: int  # Frames longer than LATE_FACTOR times the target interval (0 when uncapped)
+
+
+class FrameClock:
+    """
+    The game's clock: `now` is a monotonic time sampled once at the start of each frame,
+    `dt` the real time since the previous frame, and `limit` sleeps off the rest of the
+    frame to hold a maximum frame rate (or not, when uncapped).
+    """
+
+    def __init__(self, max_fps: int = 60):
+        """
+        Initialize clock.
+
+        Args:
+            max_fps: Frame rate cap, e.g. 60 or 144; 0 for uncapped
+        """
+        self.max_fps = max_fps
+        self.now = time.perf_counter()
+        self.dt = 0.0
+        self.frames = 0
+        self._deadline = self.now
+        self._intervals: Deque[float] = deque(maxlen=PACING_WINDOW)
+
+    def tick(self, paced: bool = True) -> float:
+        """
+        Start a frame.
+
+        Args:
+            paced: False for a frame that slept until input, which is left out of the
+                pacing statistics
+
+        Returns:
+            Seconds since the previous frame, at most MAX_FRAME_DT
+        """
+        now = time.perf_counter()
+        interval = now - self.now
+        self.now = now
+        self.dt = min(interval, MAX_FRAME_DT)
+        if paced and self.frames:  # The first frame has no previous one
+            self._intervals.append(interval)
+        self.frames += 1
+        return self.dt
+
+    def limit(self):
+        """End a frame, sleeping until the next one is due under the frame rate cap."""
+        if not self.max_fps:
+            return
+        now = time.perf_counter()
+        # Frames are due at fixed intervals, so sleep overshoot doesn't add up
+        self._deadline += 1 / self.max_fps
+        if self._deadline < now:
+            self._deadline = now  # Running behind: carry on from here rather than rush to catch up
+        else:
+            time.sleep(self._deadline - now)
+
+    def get_stats(self) -> FrameStats:
+        """Pacing statistics of the last PACING_WINDOW paced frames."""
+        intervals = self._intervals
+        if not intervals:
+            return FrameStats(0, 0.0, 0.0, 0.0, 0)
+        mean = sum(intervals) / len(intervals)
+        late = 0
+        if self.max_fps:
+            late = sum(1 for interval in intervals if interval > LATE_FACTOR / self.max_fps)
+        return FrameStats(len(intervals), 1 / mean if mean else 0.0, mean * 1000, max(intervals) * 1000, late)
@@ -0,0 +1,213 @@
+"""
+Forced-Guess Advisor for Minesweeper
+Ranks guesses by a bounded expectimax search over the numbers they may reveal
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from solver import (
+    HIDDEN,
+    Constraint,
+    constraint_probabilities,
+    constraint_weight,
+    constraints,
+    deduce_constraints,
+    neighbors,
+    substitute,
+)
+
+
+@dataclass
+class GuessAdvice:
+    """One ranked guess."""
+
+    x: int
+    y: int
+    mine_probability: float
+    win_probability: float  # Estimated chance of eventually winning after this click
+
+
+@dataclass(frozen=True)
+class _Node:
+    """Search position: what is known about the hidden cells."""
+
+    rules: FrozenSet[Constraint]
+    unknown: FrozenSet[int]  # Hidden cells not yet decided
+    safe: FrozenSet[int]  # Hidden cells proven safe (free reveals)
+    mines: FrozenSet[int]  # Hidden cells proven to be mines
+    remaining: int  # Mines among the unknown cells
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the deadline passes."""
+
+
+class GuessAdvisor:
+    """
+    Suggests the click most likely to lead to a win.
+
+    Each click is a chance node over the number the cell may show, weighted by
+    layout counts, so a guess is worth its survival chance times the value of what
+    it reveals. The search deepens iteratively until the deadline and keeps the
+    ranking of the deepest completed depth. Cascades from a revealed zero are not
+    expanded, which makes estimates slightly pessimistic.
+    """
+
+    def __init__(self, deadline: float = 0.05, max_candidates: int = 6, max_depth: int = 6):
+        """
+        Initialize advisor.
+
+        Args:
+            deadline: Time budget per call in seconds
+            max_candidates: Guesses expanded at each decision node (lowest risk first)
+            max_depth: Deepest search attempted
+        """
+        self.deadline = deadline
+        self.max_candidates = max_candidates
+        self.max_depth = max_depth
+        self._table: Dict[Tuple[_Node, int], float] = {}
+        self._stop_at = 0.0
+        self._size = 0
+        self.completed_depth = 0
+
+    def advise(self, size: int, visible: List[int], total_mines: int,
+               known_safe: Optional[Set[int]] = None) -> List[GuessAdvice]:
+        """
+        Rank candidate clicks on a visible board, best first.
+
+        Provably safe cells, when any exist, are returned alone with a mine
+        probability of 0.
+
+        Args:
+            size: Board side length
+            visible: Visible board
+            total_mines: Number of mines on the board
+            known_safe: Hidden cells known to be safe (such as the first-click zone)
+        """
+        self._stop_at = time.perf_counter() + self.deadline
+        self._size = size
+        self._table.clear()
+        self.completed_depth = 0
+
+        hidden = {i for i, v in enumerate(visible) if v == HIDDEN}
+        safe = hidden & set(known_safe or ())
+        root = self._normalize(_Node(
+            frozenset(constraints(size, visible, set(), safe)),
+            frozenset(hidden - safe), frozenset(safe), frozenset(), total_mines,
+        ))
+        if root.safe:
+            return [GuessAdvice(cell % size, cell // size, 0.0, 1.0) for cell in sorted(root.safe)]
+
+        probs = self._probabilities(root)
+        if not probs:
+            return []
+        sure = sorted(cell for cell, p in probs.items() if p == 0.0)
+        if sure:
+            return [GuessAdvice(cell % size, cell // size, 0.0, 1.0) for cell in sure]
+
+        candidates = self._candidates(probs)
+        values = {cell: 1.0 - probs[cell] for cell in candidates}
+        try:
+            for depth in range(1, self.max_depth + 1):
+                values = {cell: self._click_value(root, cell, probs[cell], depth) for cell in candidates}
+                self.completed_depth = depth
+        except _Timeout:
+            pass
+
+        ranked = sorted(candidates, key=lambda cell: (-values[cell], probs[cell], cell))
+        return [GuessAdvice(cell % size, cell // size, probs[cell], values[cell]) for cell in ranked]
+
+    def _normalize(self, node: _Node) -> _Node:
+        """Apply every certain deduction to a node."""
+        safe, mines = deduce_constraints(node.rules)
+        if not safe and not mines:
+            return node
+        return _Node(
+            frozenset(substitute(node.rules, safe, mines)),
+            node.unknown - safe - mines,
+            node.safe | safe,
+            node.mines | mines,
+            node.remaining - len(mines),
+        )
+
+    def _interior(self, node: _Node) -> int:
+        frontier = set().union(*(cells for cells, _ in node.rules)) if node.rules else set()
+        return len(node.unknown) - len(frontier)
+
+    def _probabilities(self, node: _Node) -> Dict[int, float]:
+        """Mine probability of every unknown cell of a node (empty if inconsistent)."""
+        result = constraint_probabilities(node.rules, self._interior(node), node.remaining)
+        if result is None:
+            return {}
+        frontier_probs, interior_prob = result
+        return {cell: frontier_probs.get(cell, interior_prob) for cell in node.unknown}
+
+    def _candidates(self, probs: Dict[int, float]) -> List[int]:
+        """Lowest-risk cells, preferring cells with fewer neighbours (corners, edges) on ties."""
+        adj = neighbors(self._size)
+        order = sorted(probs, key=lambda cell: (round(probs[cell], 9), len(adj[cell]), cell))
+        return order[:self.max_candidates]
+
+    def _child(self, node: _Node, cell: int, number: int) -> _Node:
+        """Node after `cell` is revealed showing `number`."""
+        around = neighbors(self._size)[cell]
+        unknown = node.unknown - {cell}
+        rules = {(cells - {cell}, needed) if cell in cells else (cells, needed) for cells, needed in node.rules}
+        rules.add((frozenset(n for n in around if n in unknown), number - sum(1 for n in around if n in node.mines)))
+        rules = {rule for rule in rules if rule[0] or rule[1] != 0}
+        return self._normalize(_Node(frozenset(rules), unknown, node.safe - {cell}, node.mines, node.remaining))
+
+    def _click_value(self, node: _Node, cell: int, mine_probability: float, depth: int) -> float:
+        """
+        Expected win probability of clicking `cell`: averaged over the number it shows.
+
+        Positions too large to count fall back to the depth-0 estimate, the
+        chance of surviving the click.
+        """
+        base = constraint_weight(node.rules, self._interior(node), node.remaining)
+        if base is None:
+            return 1.0 - mine_probability
+        if base == 0:
+            return 0.0
+
+        around = neighbors(self._size)[cell]
+        known = sum(1 for n in around if n in node.mines)
+        open_cells = sum(1 for n in around if n in node.unknown)
+        expected = 0.0
+        for number in range(known, known + open_cells + 1):
+            if time.perf_counter() > self._stop_at:
+                raise _Timeout()
+            child = self._child(node, cell, number)
+            weight = constraint_weight(child.rules, self._interior(child), child.remaining)
+            if weight is None:
+                return 1.0 - mine_probability
+            if weight:
+                expected += weight / base * self._node_value(child, depth - 1)
+        return expected
+
+    def _node_value(self, node: _Node, depth: int) -> float:
+        """Win probability estimate of a node (transposition-cached)."""
+        if not node.safe and node.remaining == len(node.unknown):
+            return 1.0
+
+        key = (node, depth)
+        cached = self._table.get(key)
+        if cached is not None:
+            return cached
+
+        if node.safe:
+            # Free reveal: no risk, only information
+            value = 1.0 if depth <= 0 else self._click_value(node, min(node.safe), 0.0, depth)
+        else:
+            probs = self._probabilities(node)
+            if not probs:
+                value = 0.0
+            elif depth <= 0:
+                value = 1.0 - min(probs.values())
+            else:
+                value = max(self._click_value(node, cell, probs[cell], depth) for cell in self._candidates(probs))
+
+        self._table[key] = value
+        return value
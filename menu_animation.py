@@ -5,7 +5,10 @@ Provides animated menu with parallax background
 
 import math
 import time
-from typing import Tuple
+from typing import Optional, Tuple
+
+import numpy as np
+import pygame
 
 
 class ParallaxBackground:
@@ -24,57 +27,87 @@ class ParallaxBackground:
         self.time = 0.0
         self.speed = 0.5  # Background scroll speed
 
+        # Pre-rendered gradient and its (width, height, top color, bottom color)
+        self._gradient: Optional[pygame.Surface] = None
+        self._gradient_key = None
+
+        # Wave x coordinates for the current width
+        self._wave_x = np.arange(0)
+
     def update(self, dt: float):
-        """Update background animation."""
+        """
+        Advance background animation.
+
+        Args:
+            dt: Seconds since the last update
+        """
         self.time += dt
         self.time = self.time % (2 * math.pi)  # Loop animation
 
     def draw(self, screen, theme: dict):
         """Draw parallax background with waves/gradient."""
-        # Base gradient background
-        for y in range(self.height):
-            # Interpolate between two colors
-            progress = y / self.height
-            r = int(theme["background"][0] * (1 - progress) + 
-                   theme["header"][0] * progress)
-            g = int(theme["background"][1] * (1 - progress) + 
-                   theme["header"][1] * progress)
-            b = int(theme["background"][2] * (1 - progress) + 
-                   theme["header"][2] * progress)
-            
-            import pygame
-            pygame.draw.line(screen, (r, g, b), (0, y), (self.width, y))
-        
-        # Draw animated waves overlay
+        # Base gradient background, rendered once per size and theme
+        screen.blit(self._get_gradient(theme["background"], theme["header"]), (0, 0))
+
+        # Animated wave overlay: one 2x2 dot per column (a radius 1 circle)
         wave_height = int(self.height * 0.15)
-        for x in range(self.width):
-            y_offset = int(wave_height * math.sin(
-                x * 0.01 + self.time * self.speed
-            ))
-            y = self.height // 3 + y_offset
-            
-            # Draw wave particles
-            color = theme["cell_hidden"]
-            alpha = int(50 * (0.5 + 0.5 * math.sin(self.time * 2)))
-            
-            # Simple dot to represent wave
-            if y >= 0 and y < self.height:
-                import pygame
-                pygame.draw.circle(screen, color, (x, y), 1)
+        if len(self._wave_x) != self.width:
+            self._wave_x = np.arange(self.width)
+        x = self._wave_x
+        y = self.height // 3 + (wave_height * np.sin(x * 0.01 + self.time * self.speed)).astype(np.int64)
+        visible = (y >= 0) & (y < self.height)
+        x, y = x[visible], y[visible]
+
+        width, height = screen.get_size()
+        pixels = pygame.surfarray.pixels3d(screen)
+        try:
+            for dx, dy in ((0, 0), (-1, 0), (0, -1), (-1, -1)):
+                px, py = x + dx, y + dy
+                inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                pixels[px[inside], py[inside]] = theme["cell_hidden"]
+        finally:
+            del pixels  # Unlock the screen
+
+    def _get_gradient(self, top: Tuple[int, int, int], bottom: Tuple[int, int, int]) -> pygame.Surface:
+        """Vertical gradient filling the background, cached until the size or colors change."""
+        key = (self.width, self.height, tuple(top), tuple(bottom))
+        if key != self._gradient_key:
+            # Interpolate between two colors, one row at a time, then stretch the column
+            column = pygame.Surface((1, self.height))
+            for y in range(self.height):
+                progress = y / self.height
+                r = int(top[0] * (1 - progress) + bottom[0] * progress)
+                g = int(top[1] * (1 - progress) + bottom[1] * progress)
+                b = int(top[2] * (1 - progress) + bottom[2] * progress)
+                column.set_at((0, y), (r, g, b))
+            self._gradient = pygame.transform.scale(column, (self.width, self.height))
+            self._gradient_key = key
+        return self._gradient
 
 
 class MenuAnimation:
-    """Handles menu element animations."""
+    """Handles menu element animations, timed by the frame time passed to `update`."""
+
+    def __init__(self, now: Optional[float] = None):
+        """
+        Initialize menu animations.
 
-    def __init__(self):
-        """Initialize menu animations."""
+        Args:
+            now: Current time on the clock later passed to `update` (default: time.perf_counter())
+        """
         self.element_positions = {}  # Store animated positions
-        self.start_time = time.time()
+        self.start_time = time.perf_counter() if now is None else now
+        self.elapsed = 0.0
         self.animation_duration = 0.8  # Duration in seconds
 
-    def update(self):
-        """Update all animations."""
-        elapsed = time.time() - self.start_time
+    def update(self, now: float):
+        """
+        Update all animations to the frame's time.
+
+        Args:
+            now: Current time, sampled once per frame
+        """
+        self.elapsed = now - self.start_time
 
     def get_bounce_offset(self, base_y: int, element_id: str, index: int = 0) -> Tuple[int, int]:
         """
@@ -88,7 +121,7 @@ class MenuAnimation:
         Returns:
             (x, y) offset tuple
         """
-        elapsed = time.time() - self.start_time
+        elapsed = self.elapsed
         # Stagger animation based on index
         delay = index * 0.1
         
@@ -111,8 +144,7 @@ class MenuAnimation:
         Returns:
             Alpha value (0.0 to 1.0)
         """
-        elapsed = time.time() - self.start_time
-        return min(1.0, elapsed / self.animation_duration)
+        return min(1.0, self.elapsed / self.animation_duration)
 
     def get_pulse_scale(self, element_id: str) -> float:
         """
@@ -124,32 +156,37 @@ class MenuAnimation:
         Returns:
             Scale factor (0.95 to 1.05)
         """
-        elapsed = time.time() - self.start_time
-        pulse = 0.95 + 0.05 * (0.5 + 0.5 * math.sin(elapsed * math.pi * 2))
+        pulse = 0.95 + 0.05 * (0.5 + 0.5 * math.sin(self.elapsed * math.pi * 2))
         return pulse
 
-    def reset(self):
-        """Reset animation timer."""
-        self.start_time = time.time()
+    def reset(self, now: float):
+        """Reset animation timer to the frame's time."""
+        self.start_time = now
+        self.elapsed = 0.0
 
 
 class TextGlow:
     """Animated glowing text effect."""
 
-    def __init__(self, base_color: Tuple[int, int, int]):
+    def __init__(self, base_color: Tuple[int, int, int], now: Optional[float] = None):
         """
         Initialize text glow.
         
         Args:
             base_color: Base RGB color
+            now: Current time on the clock later passed to `update` (default: time.perf_counter())
         """
         self.base_color = base_color
-        self.start_time = time.time()
+        self.start_time = time.perf_counter() if now is None else now
+        self.elapsed = 0.0
+
+    def update(self, now: float):
+        """Advance the glow to the frame's time."""
+        self.elapsed = now - self.start_time
 
     def get_color(self) -> Tuple[int, int, int]:
         """Get current glowing color."""
-        elapsed = time.time() - self.start_time
-        glow = 0.5 + 0.5 * math.sin(elapsed * math.pi * 2)
+        glow = 0.5 + 0.5 * math.sin(self.elapsed * math.pi * 2)
         
         r = int(self.base_color[0] + (255 - self.base_color[0]) * glow * 0.3)
         g = int(self.base_color[1] + (255 - self.base_color[1]) * glow * 0.3)
@@ -3,32 +3,61 @@ Minesweeper Game
 A fully-featured Minesweeper with customization, themes, timer, and leaderboards.
 """
 
+import numpy as np
 import pygame
 import random
 import time
 import os
 import json
-import math
+from collections import Counter, deque
+from contextlib import ExitStack
+from concurrent.futures import Future
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Dict
+from typing import Callable, List, Optional, Set, Tuple, Dict
 
 # Import new modules
+from animation_scheduler import AnimationScheduler, CellAnimation
 from audio_manager import AudioManager
+from board_layer import BoardLayer
+from camera import Camera
+from dirty_rects import DirtyRegions
+from font_pool import get_font
+from frame_capture import FrameRecorder
+from frame_clock import FrameClock
+from surface_pool import SurfacePool
+from text_cache import render_text
+from tile_atlas import (
+    AtlasCache, TileAtlas, TileKey, draw_flag, draw_mine,
+    TILE_FLAG, TILE_FLAG_HOVER, TILE_HIDDEN, TILE_HIDDEN_HOVER, TILE_MINE, TILE_REVEALED,
+)
 from stats_manager import StatsManager
 from settings_manager import SettingsManager
 from menu_animation import ParallaxBackground, MenuAnimation, TextGlow
-from themes import THEMES
-
-# Initialize Pygame
-pygame.init()
-pygame.font.init()
-
-# Get display info
-display_info = pygame.display.Info()
-FULLSCREEN_WIDTH = display_info.current_w
-FULLSCREEN_HEIGHT = display_info.current_h
+from pixel_renderer import (
+    CODE_BACKGROUND, CODE_HIDDEN, PIXEL_CELL_SIZE, TILE_CODES, build_color_table, render_cells, render_minimap,
+)
+from difficulty import DIFFICULTY_CLASSES, BoardRater, BoardRating
+from post_mortem import PostMortemAnalyzer, SAFE, FORCED_GUESS, AVOIDABLE_GUESS
+from guess_advisor import GuessAdvisor, GuessAdvice
+from solver import HIDDEN
+from themes import THEMES, Palette, compile_theme
+from ui_tree import WidgetTree, coalesce_motion
+
+# Solver worker processes are started with the "spawn" method, which re-imports
+# this module as __mp_main__; only the game process initializes SDL.
+if __name__ != "__mp_main__":
+    # Initialize Pygame
+    pygame.init()
+    pygame.font.init()
+
+    # Get display info
+    display_info = pygame.display.Info()
+    FULLSCREEN_WIDTH = display_info.current_w
+    FULLSCREEN_HEIGHT = display_info.current_h
+else:
+    FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT = 1280, 720
 
 # Default windowed mode size (80% of screen)
 WINDOWED_WIDTH = int(FULLSCREEN_WIDTH * 0.8)
@@ -43,10 +72,18 @@ MIN_CELL_SIZE = max(20, int(SCREEN_HEIGHT * 0.025))
 MAX_CELL_SIZE = max(40, int(SCREEN_HEIGHT * 0.06))
 HEADER_HEIGHT = int(SCREEN_HEIGHT * 0.12)
 MENU_WIDTH = int(SCREEN_WIDTH * 0.25)
+MAX_BOARD_PIXELS = 4096  # Largest board side zooming in may reach (the board layer's size)
 
 # Animation constants
 REVEAL_ANIMATION_DURATION = 0.15  # seconds
 FLAG_ANIMATION_DURATION = 0.1
+CASCADE_STEP_DELAY = 0.03  # Reveal delay per cascade step
+MAX_CASCADE_SPREAD = 0.6  # Longest delay of a cascade's last wave; deeper cascades share waves between steps
+HINT_DISPLAY_DURATION = 3.0
+IDLE_TIMEOUT = 0.25  # Longest sleep between frames while nothing on screen changes
+
+# Settings presets: (board size, mines)
+PRESETS = {"beginner": (9, 10), "intermediate": (16, 40), "expert": (22, 99)}
 
 
 class GameState(Enum):
@@ -71,15 +108,6 @@ class Cell:
     animation_active: bool = False
 
 
-@dataclass
-class CellAnimation:
-    """Tracks animation state for a cell"""
-
-    start_time: float
-    duration: float
-    animation_type: str  # 'reveal', 'flag', 'unflag', 'explode'
-
-
 @dataclass
 class LeaderboardEntry:
     name: str
@@ -87,21 +115,31 @@ class LeaderboardEntry:
     date: str
     board_size: int
     mines: int
+    difficulty: str = ""
+
+
+@dataclass
+class PendingRating:
+    """A game recorded before its board rating was ready; the rating is filled in when it is."""
+
+    future: Future
+    won: bool
+    entry: Optional[LeaderboardEntry] = None
 
 
 class Button:
     def __init__(self, x: int, y: int, width: int, height: int, text: str, font_size: int = 24):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
         self.hovered = False
 
-    def draw(self, screen: pygame.Surface, theme: dict):
+    def draw(self, screen: pygame.Surface, theme: Palette):
         color = theme["button_hover"] if self.hovered else theme["button"]
         pygame.draw.rect(screen, color, self.rect, border_radius=10)
         pygame.draw.rect(screen, theme["border"], self.rect, 2, border_radius=10)
 
-        text_surface = self.font.render(self.text, True, theme["text"])
+        text_surface = render_text(self.font, self.text, theme["text"])
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -122,11 +160,11 @@ class Slider:
         self.value = current
         self.label = label
         self.dragging = False
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(24)
 
-    def draw(self, screen: pygame.Surface, theme: dict):
+    def draw(self, screen: pygame.Surface, theme: Palette):
         # Label
-        label_surface = self.font.render(f"{self.label}: {self.value}", True, theme["text"])
+        label_surface = render_text(self.font, f"{self.label}: {self.value}", theme["text"])
         screen.blit(label_surface, (self.rect.x, self.rect.y - 25))
 
         # Track
@@ -158,6 +196,12 @@ class Slider:
             return True
         return False
 
+    @property
+    def bounds(self) -> pygame.Rect:
+        """Area drawn in: the track, the handle overhanging its ends and the label above."""
+        label_width = self.font.size(f"{self.label}: 000")[0]
+        return pygame.Rect(self.rect.x - 14, self.rect.y - 25, max(self.rect.width + 28, label_width + 14), 55)
+
     def _update_value(self, mouse_x: int):
         rel_x = max(0, min(mouse_x - self.rect.x, self.rect.width))
         self.value = int(self.min_val + (rel_x / self.rect.width) * (self.max_val - self.min_val))
@@ -174,7 +218,16 @@ class Minesweeper:
         self.is_fullscreen = False
         self.screen = pygame.display.set_mode((WINDOWED_WIDTH, WINDOWED_HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("Minesweeper")
-        self.clock = pygame.time.Clock()
+        self.frame_clock = FrameClock(self.settings_mgr.get("max_fps", 60))
+
+        # Record the shown frames if configured (e.g. to review kiosk sessions)
+        self.recorder: Optional[FrameRecorder] = None
+        capture_dir = self.settings_mgr.get("capture_dir", "")
+        if capture_dir:
+            try:
+                self.recorder = FrameRecorder(capture_dir, self.settings_mgr.get("capture_format", "png"))
+            except (OSError, ValueError) as e:
+                print(f"Frame capture unavailable: {e}")
 
         # Update global screen dimensions
         global SCREEN_WIDTH, SCREEN_HEIGHT, MIN_CELL_SIZE, MAX_CELL_SIZE, HEADER_HEIGHT
@@ -189,6 +242,8 @@ class Minesweeper:
         self.num_mines = self.settings_mgr.get("num_mines", 15)
         self.current_theme = self.settings_mgr.get("theme", "Ocean")
         self.dark_mode = self.settings_mgr.get("dark_mode", False)
+        self.theme_key: Optional[Tuple[str, bool]] = None
+        self.palette: Optional[Palette] = None
 
         # Game state
         self.state = GameState.MENU
@@ -199,13 +254,50 @@ class Minesweeper:
         self.cells_revealed = 0
         self.flags_placed = 0
 
+        # Difficulty rating of the current board (computed in the background)
+        self.board_rater = BoardRater()
+        self.board_rating_future = None
+        self.pending_ratings: List[PendingRating] = []
+
+        # Move recording for the post-game analysis
+        self.move_history: List[Tuple[str, int, int]] = []
+        self.first_click_pos: Optional[Tuple[int, int]] = None
+        self.post_mortem = PostMortemAnalyzer()
+
+        # Guess advisor (hint key / button)
+        self.guess_advisor = GuessAdvisor(self.settings_mgr.get("hint_deadline_ms", 50) / 1000)
+        self.hint: Optional[GuessAdvice] = None
+        self.hint_time = 0.0
+
         # Animation tracking
-        self.animations: Dict[Tuple[int, int], CellAnimation] = {}
-        self.current_time = time.time()
+        self.animations = AnimationScheduler()
+        self.current_time = self.frame_clock.now  # Frame time, on the frame clock's monotonic timeline
+
+        # Dirty-rectangle rendering: what was on screen after the last frame
+        self.dirty = DirtyRegions()
+        self.atlas_cache = AtlasCache()
+        self.board_layer = BoardLayer()
+        self.surfaces = SurfacePool()
+        self.drawn_state: Optional[GameState] = None
+        self.drawn_size: Tuple[int, int] = (0, 0)
+        self.input_since_draw = False
+        self.header_signature = None
+        self.end_screen_signature = None
+        self.animated_cells: Set[Tuple[int, int]] = set()
+        self.hovered_cell: Optional[Tuple[int, int]] = None
+        self.window_focused = True
+
+        # Board view: zoomed with the mouse wheel, panned by dragging with the middle button
+        self.camera = Camera(MIN_CELL_SIZE, MAX_CELL_SIZE, MAX_BOARD_PIXELS)
+        self.pan_anchor: Optional[Tuple[int, int]] = None
+
+        # What each cell shows, as pixel_renderer codes indexed [x, y] (zoomed-out board, minimap)
+        self.cell_codes = np.full((self.board_size, self.board_size), CODE_HIDDEN, dtype=np.uint8)
+        self.cell_codes_version = 0
         
         # Menu animations
         self.parallax_bg = ParallaxBackground(WINDOWED_WIDTH, WINDOWED_HEIGHT)
-        self.menu_animation = MenuAnimation()
+        self.menu_animation = MenuAnimation(self.current_time)
 
         # Player info
         self.player_name = self.settings_mgr.get("player_name", "Player")
@@ -219,6 +311,13 @@ class Minesweeper:
         # Achievements display
         self.current_ach_index = 0
 
+        # Widgets of each screen, for hit-testing and (settings, leaderboard) repainting one at a time
+        self.menu_ui = WidgetTree()
+        self.settings_ui = WidgetTree()
+        self.game_ui = WidgetTree()
+        self.end_ui = WidgetTree()
+        self.leaderboard_ui = WidgetTree()
+
         # UI elements
         self._setup_ui()
 
@@ -229,11 +328,11 @@ class Minesweeper:
         """Setup fonts based on current screen size."""
         current_height = self.screen.get_height()
         base_size = int(current_height / 15)
-        self.title_font = pygame.font.Font(None, int(base_size * 1.5))
-        self.header_font = pygame.font.Font(None, base_size)
-        self.text_font = pygame.font.Font(None, int(base_size * 0.7))
-        self.cell_font = pygame.font.Font(None, int(base_size * 0.75))
-        self.small_font = pygame.font.Font(None, int(base_size * 0.5))
+        self.title_font = get_font(int(base_size * 1.5))
+        self.header_font = get_font(base_size)
+        self.text_font = get_font(int(base_size * 0.7))
+        self.cell_font = get_font(int(base_size * 0.75))
+        self.small_font = get_font(int(base_size * 0.5))
 
     def _toggle_fullscreen(self):
         """Toggle between fullscreen and windowed mode."""
@@ -354,6 +453,14 @@ class Minesweeper:
                 "Restart",
                 small_font_size,
             ),
+            "hint": Button(
+                int(current_width * 0.02) + (game_btn_width + 10) * 2,
+                int(current_height * 0.02),
+                game_btn_width,
+                game_btn_height,
+                "Hint (H)",
+                small_font_size,
+            ),
         }
 
         # Leaderboard buttons
@@ -405,42 +512,34 @@ class Minesweeper:
         # Name input rect
         self.name_input_rect = pygame.Rect(center_x - btn_width // 2, int(current_height * 0.22), btn_width, small_btn_height)
 
-    def _get_theme(self) -> dict:
-        theme = THEMES[self.current_theme].copy()
-        
-        # Apply dark mode if enabled
-        if self.dark_mode:
-            theme = self._apply_dark_mode(theme)
-        
-        return theme
-    
-    def _apply_dark_mode(self, theme: dict) -> dict:
-        """Apply dark mode adjustment to theme colors with better contrast."""
-        darkened = theme.copy()
-        
-        # Darken backgrounds more substantially for dark mode
-        darkened["background"] = tuple(max(0, c - 50) for c in theme["background"])
-        darkened["header"] = tuple(max(0, c - 50) for c in theme["header"])
-        darkened["cell_revealed"] = tuple(max(0, c - 80) for c in theme["cell_revealed"])
-        darkened["cell_hidden"] = tuple(max(0, c - 40) for c in theme["cell_hidden"])
-        darkened["cell_hidden_hover"] = tuple(max(0, c - 40) for c in theme.get("cell_hidden_hover", theme["cell_hidden"]))
-        
-        # Make text much lighter for visibility on dark backgrounds
-        darkened["text"] = tuple(min(255, max(200, c + 120)) for c in theme.get("text", (200, 200, 200)))
-        darkened["text_dark"] = tuple(min(255, max(150, c + 100)) for c in theme.get("text_dark", (50, 50, 50)))
-        
-        # Enhance number colors for dark mode - make them brighter and more saturated
-        original_numbers = theme.get("numbers", [(0, 0, 0)] * 9)
-        darkened["numbers"] = []
-        for color in original_numbers:
-            # Increase brightness and saturation for numbers
-            enhanced = tuple(min(255, c + 80) for c in color)
-            darkened["numbers"].append(enhanced)
-        
-        # Ensure good contrast on buttons and borders
-        darkened["border"] = tuple(min(255, c + 60) for c in theme.get("border", (100, 100, 100)))
-        
-        return darkened
+        # Widget trees, in each screen's drawing order
+        self.menu_ui.set_widgets(self.menu_buttons)
+        settings_widgets = {"size": self.size_slider, "mines": self.mines_slider}
+        settings_widgets.update((name, button) for name, button in self.settings_buttons.items() if name != "back")
+        settings_widgets.update((f"theme:{name}", button) for name, button in self.theme_buttons.items())
+        settings_widgets["back"] = self.settings_buttons["back"]
+        self.settings_ui.set_widgets(settings_widgets)
+        self.game_ui.set_widgets(self.game_buttons)
+        self.end_ui.set_widgets(self.end_buttons)
+        self.leaderboard_ui.set_widgets(self.lb_buttons)
+        self._sync_mines_slider()
+
+    def _sync_mines_slider(self):
+        """Limit the mines slider to what fits on the chosen board size."""
+        max_mines = max(10, self.size_slider.value**2 - 9)
+        value = min(self.mines_slider.value, max_mines)
+        if (max_mines, value) != (self.mines_slider.max_val, self.mines_slider.value):
+            self.mines_slider.max_val = max_mines
+            self.mines_slider.value = value
+            self.settings_ui.mark_changed("mines")
+
+    def _get_theme(self) -> Palette:
+        """Get the palette of the current theme, recompiled only when the theme or dark mode changes."""
+        key = (self.current_theme, self.dark_mode)
+        if key != self.theme_key:
+            self.theme_key = key
+            self.palette = compile_theme(self.current_theme, self.dark_mode)
+        return self.palette
 
     def _toggle_fullscreen(self):
         """Toggle between fullscreen and windowed mode."""
@@ -462,14 +561,17 @@ class Minesweeper:
         MAX_CELL_SIZE = max(40, int(SCREEN_HEIGHT * 0.06))
         HEADER_HEIGHT = int(SCREEN_HEIGHT * 0.12)
 
+        # Overlays and effect surfaces were sized for the old screen and cells
+        self.surfaces.clear()
+
         # Recreate UI elements and fonts for new size
         self._setup_ui()
         base_size = int(SCREEN_HEIGHT / 15)
-        self.title_font = pygame.font.Font(None, int(base_size * 1.5))
-        self.header_font = pygame.font.Font(None, base_size)
-        self.text_font = pygame.font.Font(None, int(base_size * 0.7))
-        self.cell_font = pygame.font.Font(None, int(base_size * 0.75))
-        self.small_font = pygame.font.Font(None, int(base_size * 0.5))
+        self.title_font = get_font(int(base_size * 1.5))
+        self.header_font = get_font(base_size)
+        self.text_font = get_font(int(base_size * 0.7))
+        self.cell_font = get_font(int(base_size * 0.75))
+        self.small_font = get_font(int(base_size * 0.5))
 
     def _get_leaderboard_file(self, size: int, mines: int) -> str:
         return os.path.join(self.leaderboard_dir, f"leaderboard_{size}x{size}_{mines}mines.txt")
@@ -509,6 +611,7 @@ class Minesweeper:
                                     date=parts[2],
                                     board_size=int(parts[3]),
                                     mines=int(parts[4]),
+                                    difficulty=parts[5] if len(parts) >= 6 else "",
                                 )
                             )
             except:
@@ -519,20 +622,32 @@ class Minesweeper:
         filepath = self._get_leaderboard_file(size, mines)
         with open(filepath, "w") as f:
             for entry in entries[:10]:
-                f.write(f"{entry.name}|{entry.time:.2f}|{entry.date}|{entry.board_size}|{entry.mines}\n")
+                f.write(f"{entry.name}|{entry.time:.2f}|{entry.date}|{entry.board_size}|{entry.mines}|{entry.difficulty}\n")
 
-    def _add_to_leaderboard(self, time: float):
+    def _add_to_leaderboard(self, time: float, difficulty: str) -> LeaderboardEntry:
         entry = LeaderboardEntry(
             name=self.player_name,
             time=time,
             date=datetime.now().strftime("%Y-%m-%d %H:%M"),
             board_size=self.board_size,
             mines=self.num_mines,
+            difficulty=difficulty,
         )
         entries = self._load_leaderboard(self.board_size, self.num_mines)
         entries.append(entry)
         entries = sorted(entries, key=lambda x: x.time)[:10]
         self._save_leaderboard(entries, self.board_size, self.num_mines)
+        return entry
+
+    def _set_leaderboard_difficulty(self, entry: LeaderboardEntry, difficulty: str):
+        """Fill in the difficulty of an entry recorded as "pending" (if it is still on the leaderboard)."""
+        entries = self._load_leaderboard(entry.board_size, entry.mines)
+        for saved in entries:
+            if (saved.difficulty == "pending" and saved.name == entry.name and saved.date == entry.date
+                    and f"{saved.time:.2f}" == f"{entry.time:.2f}"):
+                saved.difficulty = difficulty
+                self._save_leaderboard(entries, entry.board_size, entry.mines)
+                return
 
     def _clear_current_leaderboard(self):
         configs = self._get_all_leaderboard_configs()
@@ -550,76 +665,217 @@ class Minesweeper:
         self.start_time = None
         self.elapsed_time = 0
         self.animations.clear()
+        future = self.board_rating_future
+        if future is not None and not any(pending.future is future for pending in self.pending_ratings):
+            future.cancel()
+        self.board_rating_future = None
+        self.move_history = []
+        self.first_click_pos = None
+        self.post_mortem.cancel()
+        self.hint = None
+        self._generate_field()
+        self.dirty.invalidate_all()
+        self.board_layer.invalidate()
+        self.cell_codes = np.full((self.board_size, self.board_size), CODE_HIDDEN, dtype=np.uint8)
+        self.cell_codes_version += 1
+
+    def _generate_field(self):
+        """
+        Place mines on a fresh board ahead of the first click.
 
-    def _place_mines(self, exclude_x: int, exclude_y: int):
-        """Place mines, excluding the first clicked cell and its neighbors."""
-        excluded = set()
-        for dy in range(-1, 2):
-            for dx in range(-1, 2):
-                nx, ny = exclude_x + dx, exclude_y + dy
-                if 0 <= nx < self.board_size and 0 <= ny < self.board_size:
-                    excluded.add((nx, ny))
-
-        available = [(x, y) for x in range(self.board_size) for y in range(self.board_size) if (x, y) not in excluded]
-
-        # Ensure we don't place more mines than available cells
-        actual_mines = min(self.num_mines, len(available))
-        mine_positions = random.sample(available, actual_mines)
-
-        for x, y in mine_positions:
-            self.board[y][x].is_mine = True
+        The first click later only relocates the few mines inside its safe zone,
+        see `_clear_safe_zone`.
+        """
+        cells = self.board_size * self.board_size
+        # Keep room outside any 3x3 safe zone for relocated mines
+        actual_mines = max(0, min(self.num_mines, cells - 9))
+        for index in random.sample(range(cells), actual_mines):
+            self.board[index // self.board_size][index % self.board_size].is_mine = True
 
         # Calculate adjacent mines
         for y in range(self.board_size):
             for x in range(self.board_size):
-                if not self.board[y][x].is_mine:
-                    count = 0
-                    for dy in range(-1, 2):
-                        for dx in range(-1, 2):
-                            nx, ny = x + dx, y + dy
-                            if 0 <= nx < self.board_size and 0 <= ny < self.board_size:
-                                if self.board[ny][nx].is_mine:
-                                    count += 1
-                    self.board[y][x].adjacent_mines = count
-
-    def _reveal_cell(self, x: int, y: int, delay: float = 0):
-        if not (0 <= x < self.board_size and 0 <= y < self.board_size):
-            return
+                count = 0
+                for dy in range(-1, 2):
+                    for dx in range(-1, 2):
+                        nx, ny = x + dx, y + dy
+                        if 0 <= nx < self.board_size and 0 <= ny < self.board_size:
+                            if (dx or dy) and self.board[ny][nx].is_mine:
+                                count += 1
+                self.board[y][x].adjacent_mines = count
+
+    def _clear_safe_zone(self, center_x: int, center_y: int):
+        """Move every mine in the 3x3 block around the first click to a random free cell."""
+        zone = {
+            (nx, ny)
+            for ny in range(max(0, center_y - 1), min(self.board_size, center_y + 2))
+            for nx in range(max(0, center_x - 1), min(self.board_size, center_x + 2))
+        }
+        free_cells: Optional[List[Tuple[int, int]]] = None
+        for x, y in zone:
+            if not self.board[y][x].is_mine:
+                continue
+
+            # Random probing finds a free cell quickly unless the board is nearly full
+            target = None
+            if free_cells is None:
+                for _ in range(64):
+                    tx, ty = random.randrange(self.board_size), random.randrange(self.board_size)
+                    if not self.board[ty][tx].is_mine and (tx, ty) not in zone:
+                        target = (tx, ty)
+                        break
+                else:
+                    free_cells = [
+                        (tx, ty)
+                        for ty in range(self.board_size)
+                        for tx in range(self.board_size)
+                        if not self.board[ty][tx].is_mine and (tx, ty) not in zone
+                    ]
+            if target is None:
+                target = free_cells.pop(random.randrange(len(free_cells)))
+
+            self._move_mine(x, y, *target)
+
+    def _move_mine(self, from_x: int, from_y: int, to_x: int, to_y: int):
+        """Move a mine, updating the adjacent counts around both cells."""
+        self.board[from_y][from_x].is_mine = False
+        self.board[to_y][to_x].is_mine = True
+        for (cx, cy), change in (((from_x, from_y), -1), ((to_x, to_y), 1)):
+            for dy in range(-1, 2):
+                for dx in range(-1, 2):
+                    nx, ny = cx + dx, cy + dy
+                    if (dx or dy) and 0 <= nx < self.board_size and 0 <= ny < self.board_size:
+                        self.board[ny][nx].adjacent_mines += change
+
+    def _rate_board(self, first_x: int, first_y: int):
+        """Rate the board while the player starts solving it."""
+        mines = [self.board[y][x].is_mine for y in range(self.board_size) for x in range(self.board_size)]
+        self.board_rating_future = self.board_rater.submit(
+            self.board_size, mines, first_y * self.board_size + first_x
+        )
 
-        cell = self.board[y][x]
-        if cell.is_revealed or cell.is_flagged:
-            return
+    def _get_board_rating(self) -> Optional[BoardRating]:
+        """Get the current board's rating, or None while it is still being computed."""
+        future = self.board_rating_future
+        if future is None or not future.done() or future.cancelled() or future.exception():
+            return None
+        return future.result()
+
+    def _get_board_difficulty(self) -> str:
+        """Get the current board's difficulty class ("pending" while it is rated, "" if it is not rated)."""
+        future = self.board_rating_future
+        if future is not None and not future.done():
+            return "pending"
+        rating = self._get_board_rating()
+        return rating.difficulty if rating else ""
+
+    def _record_pending_ratings(self):
+        """Fill in the ratings of recorded games whose rating has finished (polled every frame)."""
+        for pending in [pending for pending in self.pending_ratings if pending.future.done()]:
+            self.pending_ratings.remove(pending)
+            future = pending.future
+            rating = None if future.cancelled() or future.exception() else future.result()
+            difficulty = rating.difficulty if rating else ""
+            self.stats_mgr.record_rating(difficulty, pending.won)
+            if pending.entry is not None:
+                self._set_leaderboard_difficulty(pending.entry, difficulty)
+                if self.state == GameState.LEADERBOARD:
+                    self.dirty.invalidate_all()
+
+    def _apply_move(self, cells: List[Tuple[int, int]]):
+        """
+        Reveal cells as one transaction.
 
-        cell.is_revealed = True
-        cell.reveal_time = self.current_time + delay
-        self.cells_revealed += 1
+        Every cell the move opens, including cascades, is revealed first; the
+        win/loss check and its side effects then run once for the whole move.
 
-        # Add reveal animation
-        self.animations[(x, y)] = CellAnimation(
-            start_time=self.current_time + delay,
-            duration=REVEAL_ANIMATION_DURATION,
-            animation_type="explode" if cell.is_mine else "reveal",
-        )
+        Args:
+            cells: Cells opened directly by the move (one for a click, several for a chord)
+        """
+        opened = self._open_cells(cells)
+        if opened:
+            self._finish_move(opened)
 
-        if cell.is_mine:
-            self.state = GameState.LOST
-            self._reveal_all_mines()
-            # Record loss
-            self.audio_mgr.play("lose")
-            self.stats_mgr.record_game(
-                self.board_size, self.num_mines,
-                time.time() - self.start_time if self.start_time else 0,
-                False, self.flags_placed, self.cells_revealed
-            )
-            return
+    def _open_cells(self, cells: List[Tuple[int, int]]) -> List[Tuple[int, int, int]]:
+        """
+        Reveal cells and flood-fill the openings they start, breadth first.
+
+        Returns:
+            (x, y, cascade depth) of every newly revealed cell
+        """
+        opened = []
+        queue = deque()
+        for x, y in cells:
+            cell = self.board[y][x]
+            if not cell.is_revealed and not cell.is_flagged:
+                cell.is_revealed = True
+                opened.append((x, y, 0))
+                queue.append((x, y, 0))
+
+        while queue:
+            x, y, depth = queue.popleft()
+            cell = self.board[y][x]
+            if cell.is_mine or cell.adjacent_mines > 0:
+                continue
+            for dy in range(-1, 2):
+                for dx in range(-1, 2):
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < self.board_size and 0 <= ny < self.board_size:
+                        neighbor = self.board[ny][nx]
+                        if not neighbor.is_revealed and not neighbor.is_flagged:
+                            neighbor.is_revealed = True
+                            opened.append((nx, ny, depth + 1))
+                            queue.append((nx, ny, depth + 1))
+
+        self.cells_revealed += len(opened)
+        return opened
+
+    def _finish_move(self, opened: List[Tuple[int, int, int]]):
+        """
+        Animate the cells a move opened, then check for a win or loss once.
+
+        The cells are animated in waves by cascade depth, each wave one shared
+        animation. A cascade deeper than MAX_CASCADE_SPREAD allows puts several depths
+        in a wave, so it finishes in bounded time whatever its size.
+        """
+        steps = max((depth for _, _, depth in opened), default=0) + 1
+        waves = min(steps, int(MAX_CASCADE_SPREAD / CASCADE_STEP_DELAY) + 1)
+        groups: Dict[Tuple[int, str], List[Tuple[int, int]]] = {}
+        hit_mine = False
+        for x, y, depth in opened:
+            cell = self.board[y][x]
+            wave = depth * waves // steps
+            cell.reveal_time = self.current_time + wave * CASCADE_STEP_DELAY
+            groups.setdefault((wave, "explode" if cell.is_mine else "reveal"), []).append((x, y))
+            hit_mine = hit_mine or cell.is_mine
+
+        for (wave, animation_type), cells in groups.items():
+            self.animations.schedule_group(cells, CellAnimation(
+                start_time=self.current_time + wave * CASCADE_STEP_DELAY,
+                duration=REVEAL_ANIMATION_DURATION,
+                animation_type=animation_type,
+            ))
 
-        # Check win condition
         total_non_mines = self.board_size * self.board_size - self.num_mines
-        if self.cells_revealed >= total_non_mines:
+        if hit_mine:
+            self._end_game(won=False)
+        elif self.cells_revealed >= total_non_mines:
+            self._end_game(won=True)
+
+    def _end_game(self, won: bool):
+        """
+        Switch to the end state and record the game (stats, leaderboard).
+
+        The game is recorded at once; if its board is still being rated, the leaderboard
+        entry says "pending" and `_record_pending_ratings` fills the class in later.
+        """
+        difficulty = self._get_board_difficulty()
+        entry = None
+        if won:
             self.state = GameState.WON
-            self.elapsed_time = time.time() - self.start_time
-            self._add_to_leaderboard(self.elapsed_time)
-            
+            self.elapsed_time = self.current_time - self.start_time
+            entry = self._add_to_leaderboard(self.elapsed_time, difficulty)
+
             # Record win
             self.audio_mgr.play("win")
             flags_correct = self._check_all_flags_correct()
@@ -627,53 +883,83 @@ class Minesweeper:
             self.stats_mgr.record_game(
                 self.board_size, self.num_mines, self.elapsed_time,
                 True, self.flags_placed, self.cells_revealed,
-                flags_correct, no_flags_used
+                flags_correct, no_flags_used, "" if difficulty == "pending" else difficulty
+            )
+        else:
+            self.state = GameState.LOST
+            self._reveal_all_mines()
+            self._start_post_mortem()
+            # Record loss
+            self.audio_mgr.play("lose")
+            self.stats_mgr.record_game(
+                self.board_size, self.num_mines,
+                self.current_time - self.start_time if self.start_time else 0,
+                False, self.flags_placed, self.cells_revealed,
+                difficulty="" if difficulty == "pending" else difficulty
             )
+        if difficulty == "pending":
+            self.pending_ratings.append(PendingRating(self.board_rating_future, won, entry))
+
+    def _start_post_mortem(self):
+        """Analyze the recorded moves of the lost game in the background."""
+        if self.first_click_pos is None:
             return
+        mines = [self.board[y][x].is_mine for y in range(self.board_size) for x in range(self.board_size)]
+        self.post_mortem.start(self.board_size, mines, self.first_click_pos, self.move_history)
 
-        # Flood fill for empty cells with cascading delay
-        if cell.adjacent_mines == 0:
-            for dy in range(-1, 2):
-                for dx in range(-1, 2):
-                    if dx != 0 or dy != 0:
-                        self._reveal_cell(x + dx, y + dy, delay + 0.03)
+    def _request_hint(self):
+        """Ask the guess advisor for the best click on the current board."""
+        if self.first_click or self.first_click_pos is None:
+            return
+        visible = [
+            cell.adjacent_mines if cell.is_revealed else HIDDEN
+            for row in self.board
+            for cell in row
+        ]
+        fx, fy = self.first_click_pos
+        safe_zone = {
+            ny * self.board_size + nx
+            for ny in range(max(0, fy - 1), min(self.board_size, fy + 2))
+            for nx in range(max(0, fx - 1), min(self.board_size, fx + 2))
+        }
+        total_mines = sum(cell.is_mine for row in self.board for cell in row)
+        advice = self.guess_advisor.advise(self.board_size, visible, total_mines, safe_zone)
+        self.hint = advice[0] if advice else None
+        self.hint_time = self.current_time
+        self.dirty.invalidate_all()
 
-    def _check_auto_reveal(self, x: int, y: int) -> bool:
+    def _get_chord_targets(self, x: int, y: int) -> List[Tuple[int, int]]:
         """
-        Check if a numbered cell has all mines flagged correctly.
-        If yes, reveal all adjacent safe cells.
-        Returns True if auto-reveal was performed.
+        Get the cells a click on a revealed number opens.
+
+        A numbered cell whose adjacent flags match its number opens all of its
+        unflagged safe neighbours; otherwise the click opens nothing.
         """
         cell = self.board[y][x]
         if cell.is_mine or not cell.is_revealed or cell.adjacent_mines == 0:
-            return False
-        
+            return []
+
         # Count adjacent flags and mines
         adjacent_flags = 0
         adjacent_unflagged_safe = []
-        
+
         for dy in range(-1, 2):
             for dx in range(-1, 2):
                 if dx == 0 and dy == 0:
                     continue
-                    
+
                 nx, ny = x + dx, y + dy
                 if 0 <= nx < self.board_size and 0 <= ny < self.board_size:
                     adj_cell = self.board[ny][nx]
-                    
+
                     if adj_cell.is_flagged:
                         adjacent_flags += 1
                     elif not adj_cell.is_revealed and not adj_cell.is_mine:
                         adjacent_unflagged_safe.append((nx, ny))
-        
-        # If flags match adjacent mines and there are safe cells to reveal
-        if adjacent_flags == cell.adjacent_mines and adjacent_unflagged_safe:
-            # Reveal all adjacent unflagged safe cells
-            for nx, ny in adjacent_unflagged_safe:
-                self._reveal_cell(nx, ny)
-            return True
-        
-        return False
+
+        if adjacent_flags == cell.adjacent_mines:
+            return adjacent_unflagged_safe
+        return []
 
     def _check_all_flags_correct(self) -> bool:
         """Check if all flags are placed on actual mines and all mines are flagged."""
@@ -695,9 +981,9 @@ class Minesweeper:
                 if self.board[y][x].is_mine and not self.board[y][x].is_revealed:
                     self.board[y][x].is_revealed = True
                     self.board[y][x].reveal_time = self.current_time + delay
-                    self.animations[(x, y)] = CellAnimation(
+                    self.animations.schedule((x, y), CellAnimation(
                         start_time=self.current_time + delay, duration=REVEAL_ANIMATION_DURATION * 1.5, animation_type="explode"
-                    )
+                    ))
                     delay += 0.05
 
     def _toggle_flag(self, x: int, y: int):
@@ -712,47 +998,41 @@ class Minesweeper:
             cell.is_flagged = False
             cell.flag_time = self.current_time
             self.flags_placed -= 1
-            self.animations[(x, y)] = CellAnimation(
+            self.animations.schedule((x, y), CellAnimation(
                 start_time=self.current_time, duration=FLAG_ANIMATION_DURATION, animation_type="unflag"
-            )
+            ))
         else:
             cell.is_flagged = True
             cell.flag_time = self.current_time
             self.flags_placed += 1
-            self.animations[(x, y)] = CellAnimation(
+            self.animations.schedule((x, y), CellAnimation(
                 start_time=self.current_time, duration=FLAG_ANIMATION_DURATION, animation_type="flag"
-            )
+            ))
 
     def _calculate_board_dimensions(self) -> Tuple[int, int, int, int]:
-        """Calculate board position and cell size to fit the screen."""
+        """
+        Get the board's screen position and cell size from the camera, which fits the
+        board to the screen whenever the board or window size changes.
+
+        Returns:
+            (board x, board y, cell size, board width); the board may extend past the
+            viewport when zoomed in or too large for the screen
+        """
+        self.camera.fit(self._get_board_viewport(), self.board_size)
+        camera = self.camera
+        return camera.board_x, camera.board_y, camera.cell_size, camera.board_pixels
+
+    def _get_board_viewport(self) -> pygame.Rect:
+        """Screen area the board is shown in, below the header."""
         current_width = self.screen.get_width()
         current_height = self.screen.get_height()
         current_header_height = int(current_height * 0.12)
-
-        available_width = current_width - 40
-        available_height = current_height - current_header_height - 40
-
-        cell_size = min(available_width // self.board_size, available_height // self.board_size)
-        cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, cell_size))
-
-        board_width = cell_size * self.board_size
-        board_height = cell_size * self.board_size
-
-        board_x = (current_width - board_width) // 2
-        board_y = current_header_height + (available_height - board_height) // 2
-
-        return board_x, board_y, cell_size, board_width
+        return pygame.Rect(20, current_header_height, current_width - 40, current_height - current_header_height - 40)
 
     def _get_cell_from_pos(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
-        """Convert mouse position to cell coordinates."""
-        board_x, board_y, cell_size, _ = self._calculate_board_dimensions()
-
-        x = (pos[0] - board_x) // cell_size
-        y = (pos[1] - board_y) // cell_size
-
-        if 0 <= x < self.board_size and 0 <= y < self.board_size:
-            return x, y
-        return None
+        """Convert mouse position to cell coordinates (None outside the board or its viewport)."""
+        self._calculate_board_dimensions()
+        return self.camera.cell_at(pos)
 
     def _draw_cell(self, x: int, y: int, board_x: int, board_y: int, cell_size: int, mouse_pos: Tuple[int, int]):
         cell = self.board[y][x]
@@ -783,19 +1063,36 @@ class Minesweeper:
 
         # Draw cell background with potential glow for explosions
         if anim and anim.animation_type == "explode" and anim_progress < 1.0:
-            glow_size = int(cell_size * (1 + 0.3 * math.sin(anim_progress * math.pi)))
-            glow_rect = pygame.Rect(0, 0, glow_size, glow_size)
-            glow_rect.center = base_rect.center
-            glow_color = (255, 200, 100, int(150 * (1 - anim_progress)))
-            glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, glow_color, glow_surface.get_rect(), border_radius=6)
-            self.screen.blit(glow_surface, glow_rect)
+            glow_surface = self.surfaces.get_explosion_glow(cell_size, anim_progress)
+            self.screen.blit(glow_surface, glow_surface.get_rect(center=base_rect.center))
 
         pygame.draw.rect(self.screen, color, rect, border_radius=4)
 
         # Draw cell content
         self._draw_cell_content(cell, rect, cell_size, anim, anim_progress)
 
+    def _get_atlas(self, cell_size: int) -> TileAtlas:
+        """Get the tile atlas for the current theme and cell size."""
+        return self.atlas_cache.get(
+            self.current_theme, self.dark_mode, cell_size, self._get_theme(), self._get_cell_font(cell_size)
+        )
+
+    def _get_cell_font(self, cell_size: int) -> pygame.font.Font:
+        """Font for the numbers; cells zoomed out below MIN_CELL_SIZE get a smaller one that fits."""
+        if cell_size >= MIN_CELL_SIZE:
+            return self.cell_font
+        return get_font(int(cell_size * 1.2))
+
+    def _get_tile_key(self, cell: Cell, hovered: bool) -> TileKey:
+        """Get the atlas tile showing a cell that is not animating."""
+        if cell.is_revealed:
+            if cell.is_mine:
+                return TILE_MINE
+            return cell.adjacent_mines or TILE_REVEALED
+        if cell.is_flagged:
+            return TILE_FLAG_HOVER if hovered else TILE_FLAG
+        return TILE_HIDDEN_HOVER if hovered else TILE_HIDDEN
+
     def _get_cell_color(
         self, cell: Cell, rect: pygame.Rect, mouse_pos: Tuple[int, int], anim: Optional[CellAnimation], anim_progress: float
     ) -> Tuple[int, int, int]:
@@ -807,18 +1104,18 @@ class Minesweeper:
                 # Animate mine color
                 if anim and anim.animation_type == "explode" and anim_progress < 1.0:
                     t = self._ease_out_quad(anim_progress)
-                    return self._lerp_color((255, 255, 200), theme["cell_mine"], t)
-                return theme["cell_mine"]
+                    return self._lerp_color((255, 255, 200), theme.cell_mine, t)
+                return theme.cell_mine
             else:
                 # Animate reveal color
                 if anim and anim.animation_type == "reveal" and anim_progress < 1.0:
                     t = self._ease_out_quad(anim_progress)
-                    return self._lerp_color(theme["cell_hidden"], theme["cell_revealed"], t)
-                return theme["cell_revealed"]
+                    return self._lerp_color(theme.cell_hidden, theme.cell_revealed, t)
+                return theme.cell_revealed
         else:
             if rect.collidepoint(mouse_pos) and self.state == GameState.PLAYING:
-                return theme["cell_hidden_hover"]
-            return theme["cell_hidden"]
+                return theme.cell_hidden_hover
+            return theme.cell_hidden
 
     def _draw_cell_content(
         self, cell: Cell, rect: pygame.Rect, cell_size: int, anim: Optional[CellAnimation], anim_progress: float
@@ -828,7 +1125,7 @@ class Minesweeper:
             if cell.is_mine:
                 self._draw_mine(rect, cell_size, anim_progress if anim and anim.animation_type == "explode" else 1.0)
             elif cell.adjacent_mines > 0:
-                self._draw_number(rect, cell.adjacent_mines, anim_progress if anim else 1.0)
+                self._draw_number(rect, cell_size, cell.adjacent_mines, anim_progress if anim else 1.0)
         elif cell.is_flagged:
             flag_scale = 1.0
             if anim and anim.animation_type == "flag" and anim_progress < 1.0:
@@ -837,59 +1134,31 @@ class Minesweeper:
 
     def _draw_mine(self, rect: pygame.Rect, cell_size: int, progress: float):
         """Draw a mine with animation."""
-        center = rect.center
-        scale = 0.8 + 0.2 * progress
-
-        # Main circle
-        radius = int(cell_size // 4 * scale)
-        pygame.draw.circle(self.screen, (0, 0, 0), center, radius)
-        pygame.draw.circle(self.screen, (50, 50, 50), center, int(radius * 0.6))
-
-        # Spikes with rotation animation
-        rotation_offset = (1 - progress) * 45
-        for angle in range(0, 360, 45):
-            actual_angle = angle + rotation_offset
-            end_x = center[0] + int(math.cos(math.radians(actual_angle)) * cell_size // 3 * scale)
-            end_y = center[1] + int(math.sin(math.radians(actual_angle)) * cell_size // 3 * scale)
-            pygame.draw.line(self.screen, (0, 0, 0), center, (end_x, end_y), 2)
-
-    def _draw_number(self, rect: pygame.Rect, number: int, progress: float):
+        draw_mine(self.screen, rect.center, cell_size, progress)
+
+    def _draw_number(self, rect: pygame.Rect, cell_size: int, number: int, progress: float):
         """Draw a number with fade-in animation."""
         theme = self._get_theme()
-        num_color = theme["numbers"][number]
+        num_color = theme.numbers[number]
 
-        num_surface = self.cell_font.render(str(number), True, num_color)
+        num_surface = render_text(self._get_cell_font(cell_size), str(number), num_color)
 
         # Scale effect
         if progress < 1.0:
             scale = 0.5 + 0.5 * self._ease_out_back(progress)
             new_size = (int(num_surface.get_width() * scale), int(num_surface.get_height() * scale))
             if new_size[0] > 0 and new_size[1] > 0:
-                num_surface = pygame.transform.scale(num_surface, new_size)
+                with self.surfaces.borrow(new_size) as scaled:
+                    pygame.transform.scale(num_surface, new_size, scaled)
+                    self.screen.blit(scaled, scaled.get_rect(center=rect.center))
+                return
 
         num_rect = num_surface.get_rect(center=rect.center)
         self.screen.blit(num_surface, num_rect)
 
     def _draw_flag(self, rect: pygame.Rect, cell_size: int, scale: float):
         """Draw a flag with scale animation."""
-        theme = self._get_theme()
-        center = rect.center
-        flag_color = theme["cell_flag"]
-
-        # Pole
-        pole_height = int(cell_size // 2 * scale)
-        pygame.draw.line(
-            self.screen, (100, 100, 100), (center[0], center[1] + pole_height // 2), (center[0], center[1] - pole_height // 2), 2
-        )
-
-        # Flag triangle
-        flag_size = int(cell_size // 4 * scale)
-        points = [
-            (center[0], center[1] - pole_height // 2),
-            (center[0] + flag_size, center[1] - pole_height // 2 + flag_size // 2),
-            (center[0], center[1] - pole_height // 2 + flag_size),
-        ]
-        pygame.draw.polygon(self.screen, flag_color, points)
+        draw_flag(self.screen, rect.center, cell_size, scale, self._get_theme().cell_flag)
 
     # Animation easing functions
     def _ease_out_quad(self, t: float) -> float:
@@ -910,16 +1179,16 @@ class Minesweeper:
         current_height = self.screen.get_height()
 
         # Update and draw parallax background
-        self.parallax_bg.update(0.016)  # ~60 FPS
+        self.parallax_bg.update(self.frame_clock.dt)
         self.parallax_bg.width = current_width
         self.parallax_bg.height = current_height
         self.parallax_bg.draw(self.screen, theme)
 
         # Update menu animation
-        self.menu_animation.update()
+        self.menu_animation.update(self.current_time)
 
         # Title - positioned at top with animation
-        title = self.title_font.render("MINESWEEPER", True, theme["text"])
+        title = render_text(self.title_font, "MINESWEEPER", theme["text"])
         title_rect = title.get_rect(center=(current_width // 2, int(current_height * 0.10)))
         
         # Add bounce animation to title
@@ -929,7 +1198,7 @@ class Minesweeper:
         self.screen.blit(title, title_rect)
 
         # Subtitle with fade-in
-        subtitle = self.text_font.render("A classic puzzle game", True, theme["text"])
+        subtitle = render_text(self.text_font, "A classic puzzle game", theme["text"])
         subtitle_rect = subtitle.get_rect(center=(current_width // 2, int(current_height * 0.16)))
         alpha = int(255 * self.menu_animation.get_fade_alpha("subtitle"))
         
@@ -951,7 +1220,7 @@ class Minesweeper:
 
         # Draw player name input section - positioned at bottom
         name_section_y = int(current_height * 0.78)
-        name_label = self.text_font.render("Player Name:", True, theme["text"])
+        name_label = render_text(self.text_font, "Player Name:", theme["text"])
         name_label_rect = name_label.get_rect(center=(current_width // 2, name_section_y))
         self.screen.blit(name_label, name_label_rect)
 
@@ -966,27 +1235,47 @@ class Minesweeper:
         pygame.draw.rect(self.screen, theme["border"], name_input_rect, 2, border_radius=5)
         self.name_input_rect = name_input_rect
 
-        name_surface = self.text_font.render(self.player_name, True, theme["text"])
+        name_surface = render_text(self.text_font, self.player_name, theme["text"])
         name_text_rect = name_surface.get_rect(center=name_input_rect.center)
         self.screen.blit(name_surface, name_text_rect)
 
         # Current settings display - at the very bottom
         settings_y = int(current_height * 0.90)
         dark_mode_text = " (Dark Mode)" if self.dark_mode else ""
-        settings_line1 = self.small_font.render(
+        settings_line1 = render_text(
+            self.small_font,
             f"Board: {self.board_size}x{self.board_size} | Mines: {self.num_mines} | Theme: {self.current_theme}{dark_mode_text}",
-            True,
             theme["text"],
         )
         settings1_rect = settings_line1.get_rect(center=(current_width // 2, settings_y))
         self.screen.blit(settings_line1, settings1_rect)
 
         mode_text = "Fullscreen" if self.is_fullscreen else "Windowed"
-        settings_line2 = self.small_font.render(f"Display Mode: {mode_text} | Press F11 to toggle", True, theme["text"])
+        settings_line2 = render_text(self.small_font, f"Display Mode: {mode_text} | Press F11 to toggle", theme["text"])
         settings2_rect = settings_line2.get_rect(center=(current_width // 2, settings_y + int(current_height * 0.04)))
         self.screen.blit(settings_line2, settings2_rect)
 
+    def _draw_retained(self, tree: WidgetTree, draw_static: Callable[[], None]):
+        """
+        Draw a screen whose widgets live in `tree`: its static part into the tree's
+        cached image (which `WidgetTree.repaint` draws changed widgets over), then the widgets.
+        """
+        screen = self.screen
+        if tree.static is None or tree.static.get_size() != screen.get_size():
+            tree.static = pygame.Surface(screen.get_size())
+        self.screen = tree.static
+        try:
+            draw_static()
+        finally:
+            self.screen = screen
+        screen.blit(tree.static, (0, 0))
+        tree.draw(screen, self._get_theme())
+
     def _draw_settings(self):
+        self._draw_retained(self.settings_ui, self._draw_settings_static)
+
+    def _draw_settings_static(self):
+        """Draw the settings screen without its sliders and buttons."""
         theme = self._get_theme()
         current_width = self.screen.get_width()
         current_height = self.screen.get_height()
@@ -994,12 +1283,12 @@ class Minesweeper:
         self.screen.fill(theme["background"])
 
         # Title with more space
-        title = self.header_font.render("Settings", True, theme["text"])
+        title = render_text(self.header_font, "Settings", theme["text"])
         title_rect = title.get_rect(center=(current_width // 2, int(current_height * 0.04)))
         self.screen.blit(title, title_rect)
 
         # Player name section
-        name_label = self.text_font.render("Player Name:", True, theme["text"])
+        name_label = render_text(self.text_font, "Player Name:", theme["text"])
         name_label_rect = name_label.get_rect(center=(current_width // 2, int(current_height * 0.10)))
         self.screen.blit(name_label, name_label_rect)
 
@@ -1014,12 +1303,12 @@ class Minesweeper:
         pygame.draw.rect(self.screen, theme["border"], name_rect, 2, border_radius=5)
         self.name_input_rect = name_rect
 
-        name_surface = self.text_font.render(self.player_name, True, theme["text"])
+        name_surface = render_text(self.text_font, self.player_name, theme["text"])
         name_text_rect = name_surface.get_rect(center=name_rect.center)
         self.screen.blit(name_surface, name_text_rect)
 
         # Dark mode toggle - separate row with better spacing
-        dark_mode_label = self.text_font.render("Dark Mode:", True, theme["text"])
+        dark_mode_label = render_text(self.text_font, "Dark Mode:", theme["text"])
         dark_mode_label_rect = dark_mode_label.get_rect(center=(current_width // 2 - int(current_width * 0.20), int(current_height * 0.19)))
         self.screen.blit(dark_mode_label, dark_mode_label_rect)
         
@@ -1035,64 +1324,302 @@ class Minesweeper:
         pygame.draw.rect(self.screen, theme["border"], toggle_rect, 2, border_radius=5)
         self.dark_mode_toggle_rect = toggle_rect
         
-        toggle_text = self.text_font.render("ON" if self.dark_mode else "OFF", True, theme["text"])
+        toggle_text = render_text(self.text_font, "ON" if self.dark_mode else "OFF", theme["text"])
         toggle_text_rect = toggle_text.get_rect(center=toggle_rect.center)
         self.screen.blit(toggle_text, toggle_text_rect)
 
         # Sliders section
-        slider_label = self.text_font.render("Board Configuration", True, theme["text"])
+        slider_label = render_text(self.text_font, "Board Configuration", theme["text"])
         slider_label_rect = slider_label.get_rect(center=(current_width // 2, int(current_height * 0.28)))
         self.screen.blit(slider_label, slider_label_rect)
 
-        self.size_slider.draw(self.screen, theme)
-        self.mines_slider.draw(self.screen, theme)
-
-        # Update mines slider max based on board size
-        max_mines = (self.size_slider.value**2) - 9
-        self.mines_slider.max_val = max(10, max_mines)
-        if self.mines_slider.value > self.mines_slider.max_val:
-            self.mines_slider.value = self.mines_slider.max_val
-
         # Preset buttons section with better spacing
-        preset_label = self.text_font.render("Quick Presets", True, theme["text"])
+        preset_label = render_text(self.text_font, "Quick Presets", theme["text"])
         preset_label_rect = preset_label.get_rect(center=(current_width // 2, int(current_height * 0.52)))
         self.screen.blit(preset_label, preset_label_rect)
 
-        for button_name, button in self.settings_buttons.items():
-            if button_name != "back":
-                button.draw(self.screen, theme)
-
         # Theme selection section - with current theme highlighted and more space
-        theme_label = self.text_font.render(f"Theme: {self.current_theme}", True, theme["text"])
+        theme_label = render_text(self.text_font, f"Theme: {self.current_theme}", theme["text"])
         theme_label_rect = theme_label.get_rect(center=(current_width // 2, int(current_height * 0.63)))
         self.screen.blit(theme_label, theme_label_rect)
 
-        # Draw theme buttons in a grid
-        for name, button in self.theme_buttons.items():
-            # Highlight current theme with a border
-            if name == self.current_theme:
-                highlight_rect = button.rect.inflate(4, 4)
-                pygame.draw.rect(self.screen, theme["cell_flag"], highlight_rect, 3, border_radius=8)
-            button.draw(self.screen, theme)
-
-        # Back button at the bottom
-        self.settings_buttons["back"].draw(self.screen, theme)
+        # Highlight current theme with a border around its button
+        highlight_rect = self.theme_buttons[self.current_theme].rect.inflate(4, 4)
+        pygame.draw.rect(self.screen, theme["cell_flag"], highlight_rect, 3, border_radius=8)
 
         # Help text at bottom
-        help_text = self.small_font.render(
-            "Click theme buttons to preview | Use sliders or presets to configure board", True, theme["text"]
+        help_text = render_text(
+            self.small_font, "Click theme buttons to preview | Use sliders or presets to configure board", theme["text"]
         )
         help_rect = help_text.get_rect(center=(current_width // 2, current_height - int(current_height * 0.03)))
         self.screen.blit(help_text, help_rect)
 
     def _draw_game(self):
+        """
+        Draw the game screen, redrawing only changed regions unless a full redraw is due.
+
+        Only cells inside the camera's viewport are drawn, so the cost of a frame
+        follows the viewport, not the board.
+
+        While the board layer is being rebuilt the header keeps updating and the board
+        is drawn as colour blocks from `cell_codes`, like a zoomed-out board.
+        """
         theme = self._get_theme()
+        mouse_pos = pygame.mouse.get_pos()
+        board_x, board_y, cell_size, board_width = self._calculate_board_dimensions()
+        viewport = self.camera.viewport
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        relaid = self._update_board_layer(cell_size)
+
+        full = self.dirty.needs_full_redraw()
+        if full:
+            self.screen.fill(theme["background"])
+
+        # Draw board: the settled layer, then the hovered and animated cells on top
+        self._draw_header(theme, full)
+        if cell_size < PIXEL_CELL_SIZE or self.board_layer.building:
+            # Too small for tiles, animations or hover (or no layer yet): one bulk copy of the visible cells
+            if full or relaid:
+                self._draw_board_pixels(theme, board_x, board_y, cell_size)
+            self.animated_cells = set()
+            self.hovered_cell = None
+            self._draw_hint(board_x, board_y, cell_size, theme)
+            return
+
+        # Animations overhang their cell, so those just outside the viewport are drawn too
+        animated = {(x, y) for x, y in self.animations.active if x0 - 1 <= x <= x1 and y0 - 1 <= y <= y1}
+        hovered = self._get_hovered_cell(mouse_pos, board_x, board_y, cell_size)
+        changed = animated | self.animated_cells | {(x, y) for x, y in relaid if x0 - 1 <= x <= x1 and y0 - 1 <= y <= y1}
+        if hovered != self.hovered_cell:
+            changed |= {cell for cell in (hovered, self.hovered_cell) if cell is not None}
+        self.animated_cells = animated
+        self.hovered_cell = hovered
+
+        if full or len(changed) > (x1 - x0) * (y1 - y0) // 4:
+            board_rect = pygame.Rect(board_x, board_y, board_width, board_width)
+            region = board_rect.inflate(cell_size, cell_size).clip(viewport)
+            self.screen.set_clip(region)
+            if not full:
+                self.screen.fill(theme["background"])
+                self.dirty.add(region)
+            self.screen.blit(self.board_layer.surface, board_rect)
+            self._draw_board_overlay(animated, board_x, board_y, cell_size, mouse_pos)
+            self.screen.set_clip(None)
+        else:
+            for x, y in changed:
+                self._redraw_cell_region(x, y, board_x, board_y, cell_size, mouse_pos, theme)
+
+        self._draw_hint(board_x, board_y, cell_size, theme)
+
+    def _draw_board_pixels(self, theme: Palette, board_x: int, board_y: int, cell_size: int):
+        """Draw the visible cells as colour blocks, straight from `cell_codes`."""
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        region = pygame.Rect(board_x + x0 * cell_size, board_y + y0 * cell_size, (x1 - x0) * cell_size, (y1 - y0) * cell_size)
+        if not region.width or not region.height:
+            return
+        pixels = render_cells(self.cell_codes[x0:x1, y0:y1], build_color_table(theme), cell_size)
+        with self.surfaces.borrow(region.size, 0) as surface:
+            pygame.surfarray.blit_array(surface, pixels)
+            self.screen.set_clip(self.camera.viewport)
+            self.screen.blit(surface, region)
+            self.screen.set_clip(None)
+        self.dirty.add(region.clip(self.camera.viewport))
+
+    def _update_board_layer(self, cell_size: int) -> Set[Tuple[int, int]]:
+        """
+        Bring the board layer up to date with the animation scheduler.
+
+        Cells waiting for a delayed animation are drawn into the layer in their
+        first-frame look, cells that start animating are emptied (they are drawn on top
+        every frame) and cells that finish are stamped with their settled tile. Cost
+        follows the number of animations that changed state.
+
+        A rebuild (new board, theme or cell size) is drawn in tiles, on worker threads
+        with several cores; until it is done `self.board_layer.building` is set and the
+        board is drawn from `cell_codes`.
+
+        Cells smaller than PIXEL_CELL_SIZE are drawn from `cell_codes` instead, which is
+        updated here as well, and the layer is dropped until the board is zoomed in again.
+
+        Returns:
+            Cells whose look in the layer changed
+        """
+        pixel_mode = cell_size < PIXEL_CELL_SIZE
+        if pixel_mode:
+            self.board_layer.invalidate()
+        else:
+            atlas = self._get_atlas(cell_size)
+            if self.board_layer.needs_rebuild(atlas, self.board_size):
+                self.board_layer.rebuild(atlas, self.board_size, self._get_theme().background, self._get_layer_codes())
+
+        waiting, started, finished = self.animations.update(self.current_time)
+        changed = set(waiting) | set(started) | set(finished)
+        for x, y in changed:
+            self.cell_codes[x, y] = TILE_CODES[self._get_tile_key(self.board[y][x], False)]
+        if changed:
+            self.cell_codes_version += 1
+        if pixel_mode:
+            return changed
+
+        if not self.board_layer.building:
+            self._draw_waiting_cells(waiting, cell_size)
+        for x, y in started:
+            self.board_layer.clear(x, y)
+        for x, y in finished:
+            if (x, y) not in self.animations:
+                self.board_layer.stamp(x, y, self._get_tile_key(self.board[y][x], False))
+
+        stale = self.board_layer.poll()
+        if stale is not None:
+            # A rebuild just finished: bring in what changed while its tiles were drawn
+            for x, y in stale:
+                if (x, y) in self.animations.active:
+                    self.board_layer.clear(x, y)
+                elif (x, y) not in self.animations:
+                    self.board_layer.stamp(x, y, self._get_tile_key(self.board[y][x], False))
+            self._draw_waiting_cells(list(self.animations.pending), cell_size)
+            self.dirty.invalidate_all()
+        return set(waiting) | set(finished)
+
+    def _draw_waiting_cells(self, cells: List[Tuple[int, int]], cell_size: int):
+        """Draw cells whose animation has not started into the board layer, as their first frame."""
+        self._draw_cells_batched(
+            self.board_layer.surface, cells, 0, 0, cell_size, self._draw_waiting_cell,
+            background=self.board_layer.background,
+        )
+
+    def _draw_waiting_cell(self, x: int, y: int, cell_size: int):
+        """
+        Draw a cell whose animation has not started into the board layer, as its first frame.
+
+        Drawing is clipped to the cell so nothing is left behind on settled neighbours.
+        """
+        self.board_layer.clear(x, y)
+        layer = self.board_layer.surface
+        layer.set_clip(pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size))
+        try:
+            self._draw_cell_into(layer, x, y, 0, 0, cell_size)
+        finally:
+            layer.set_clip(None)
+
+    def _draw_cell_into(self, target: pygame.Surface, x: int, y: int, board_x: int, board_y: int, cell_size: int):
+        """Draw a cell (ignoring the mouse) into another surface than the screen."""
+        screen, self.screen = self.screen, target
+        try:
+            self._draw_cell(x, y, board_x, board_y, cell_size, (-1, -1))
+        finally:
+            self.screen = screen
+
+    def _draw_cells_batched(
+        self,
+        target: pygame.Surface,
+        cells: List[Tuple[int, int]],
+        board_x: int,
+        board_y: int,
+        cell_size: int,
+        draw_single: Callable[[int, int, int], None],
+        margin: int = 0,
+        background: Optional[Tuple[int, int, int]] = None,
+    ):
+        """
+        Draw cells in order, the revealed cells of a cascade wave from one sprite per number.
+
+        The cells of a wave share one animation, so they look alike apart from their
+        number: each look is drawn once into a scratch sprite and copied with `blits`.
+
+        Args:
+            target: Surface to draw into
+            cells: Cells to draw, in drawing order
+            board_x: X position of the board in `target`
+            board_y: Y position of the board in `target`
+            cell_size: Size of each cell
+            draw_single: Draws a cell outside a wave, given (x, y, cell_size)
+            margin: Room around a sprite's cell for drawing that overhangs it
+            background: Fill of opaque sprites, or None for transparent ones
+        """
+        animations = [self.animations.get(cell) for cell in cells]
+        sizes = Counter(id(animation) for animation in animations)
+        sprite_size = (cell_size + 2 * margin, cell_size + 2 * margin)
+        sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+        blits = []
+        with ExitStack() as stack:
+            for (x, y), animation in zip(cells, animations):
+                cell = self.board[y][x]
+                if (animation is None or animation.animation_type != "reveal" or sizes[id(animation)] < 2
+                        or not cell.is_revealed or cell.is_mine):
+                    target.blits(blits, doreturn=False)
+                    blits.clear()
+                    draw_single(x, y, cell_size)
+                    continue
+                key = (id(animation), cell.adjacent_mines)
+                sprite = sprites.get(key)
+                if sprite is None:
+                    if background is None:
+                        sprite = stack.enter_context(self.surfaces.borrow(sprite_size))
+                        sprite.fill((0, 0, 0, 0))
+                    else:
+                        sprite = stack.enter_context(self.surfaces.borrow(sprite_size, 0))
+                        sprite.fill(background)
+                    self._draw_cell_into(sprite, x, y, margin - x * cell_size, margin - y * cell_size, cell_size)
+                    sprites[key] = sprite
+                blits.append((sprite, (board_x + x * cell_size - margin, board_y + y * cell_size - margin)))
+            target.blits(blits, doreturn=False)
+
+    def _get_layer_codes(self) -> np.ndarray:
+        """Cell codes of the board layer: `cell_codes` with the cells animating or waiting to left empty."""
+        codes = self.cell_codes.copy()
+        for animations in (self.animations.active, self.animations.pending):
+            for x, y in animations:
+                codes[x, y] = CODE_BACKGROUND
+        return codes
+
+    def _draw_board_overlay(
+        self, cells: Set[Tuple[int, int]], board_x: int, board_y: int, cell_size: int, mouse_pos: Tuple[int, int]
+    ):
+        """Draw the hovered cell and the animated cells among `cells` over the board layer."""
+        hovered = self.hovered_cell
+        if hovered is not None and hovered not in self.animations:
+            x, y = hovered
+            tile = self._get_atlas(cell_size).get(self._get_tile_key(self.board[y][x], True))
+            self.screen.blit(tile, (board_x + x * cell_size, board_y + y * cell_size))
+
+        active = sorted((cell for cell in cells if cell in self.animations.active), key=lambda cell: (cell[1], cell[0]))
+        self._draw_cells_batched(
+            self.screen, active, board_x, board_y, cell_size,
+            lambda x, y, cell_size: self._draw_cell(x, y, board_x, board_y, cell_size, mouse_pos),
+            margin=cell_size // 4,
+        )
+
+    def _draw_header(self, theme: Palette, full: bool):
+        """Draw the header bar if anything on it changed (or on a full redraw)."""
         current_width = self.screen.get_width()
         current_height = self.screen.get_height()
         current_header_height = int(current_height * 0.12)
-        mouse_pos = pygame.mouse.get_pos()
 
-        self.screen.fill(theme["background"])
+        # Timer
+        if self.state == GameState.PLAYING and self.start_time:
+            current_time = self.current_time - self.start_time
+        else:
+            current_time = self.elapsed_time
+        time_label = f"Time: {current_time:.1f}s"
+
+        # Mines counter
+        remaining = self.num_mines - self.flags_placed
+        mines_label = f"Mines: {remaining}"
+
+        minimap_rect = self._get_minimap_rect()
+        camera = self.camera
+        minimap = (self.cell_codes_version, camera.board_x, camera.board_y, camera.cell_size) if minimap_rect else None
+
+        signature = (time_label, mines_label, tuple(button.hovered for button in self.game_buttons.values()), minimap)
+        if not full and signature == self.header_signature:
+            return
+        self.header_signature = signature
+
+        header_rect = pygame.Rect(0, 0, current_width, current_header_height)
+        if not full:
+            self.screen.fill(theme["background"], header_rect)
+            self.dirty.add(header_rect)
 
         # Header background
         pygame.draw.rect(self.screen, theme["header"], (0, 0, current_width, current_header_height - 10))
@@ -1101,38 +1628,107 @@ class Minesweeper:
         for button in self.game_buttons.values():
             button.draw(self.screen, theme)
 
-        # Timer
-        if self.state == GameState.PLAYING and self.start_time:
-            current_time = time.time() - self.start_time
-        else:
-            current_time = self.elapsed_time
-
-        time_text = self.header_font.render(f"Time: {current_time:.1f}s", True, theme["text"])
+        time_text = render_text(self.header_font, time_label, theme["text"])
         self.screen.blit(time_text, (SCREEN_WIDTH // 2 - int(SCREEN_WIDTH * 0.06), int(SCREEN_HEIGHT * 0.03)))
 
-        # Mines counter
-        remaining = self.num_mines - self.flags_placed
-        mines_text = self.header_font.render(f"Mines: {remaining}", True, theme["text"])
+        mines_text = render_text(self.header_font, mines_label, theme["text"])
         self.screen.blit(mines_text, (SCREEN_WIDTH - int(SCREEN_WIDTH * 0.14), int(SCREEN_HEIGHT * 0.03)))
 
         # Board info
-        info_text = self.small_font.render(f"{self.board_size}x{self.board_size} • {self.num_mines} mines", True, theme["text"])
+        info_text = render_text(self.small_font, f"{self.board_size}x{self.board_size} • {self.num_mines} mines", theme["text"])
         self.screen.blit(info_text, (SCREEN_WIDTH // 2 - int(SCREEN_WIDTH * 0.05), int(SCREEN_HEIGHT * 0.08)))
 
-        # Draw board
-        board_x, board_y, cell_size, _ = self._calculate_board_dimensions()
+        if minimap_rect:
+            self._draw_minimap(minimap_rect, theme)
+
+    def _get_minimap_rect(self) -> Optional[pygame.Rect]:
+        """Where the minimap goes in the header, or None while the whole board is in view."""
+        camera = self.camera
+        if camera.board_pixels <= camera.viewport.width and camera.board_pixels <= camera.viewport.height:
+            return None
+        hint_rect = self.game_buttons["hint"].rect
+        side = int(self.screen.get_height() * 0.12) - 10 - 2 * hint_rect.top
+        return pygame.Rect(hint_rect.right + 20, hint_rect.top, side, side)
+
+    def _draw_minimap(self, rect: pygame.Rect, theme: Palette):
+        """Draw the whole board's progress into `rect`, outlining the part in view."""
+        pixels = render_minimap(self.cell_codes, build_color_table(theme), rect.width)
+        area = pygame.Rect(rect.topleft, pixels.shape[:2])
+        with self.surfaces.borrow(area.size, 0) as surface:
+            pygame.surfarray.blit_array(surface, pixels)
+            self.screen.blit(surface, area)
+        pygame.draw.rect(self.screen, theme["border"], area.inflate(2, 2), 1)
+
+        scale = area.width / self.board_size
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        view = pygame.Rect(area.x + int(x0 * scale), area.y + int(y0 * scale),
+                           max(2, round((x1 - x0) * scale)), max(2, round((y1 - y0) * scale)))
+        pygame.draw.rect(self.screen, theme["text"], view.clip(area), 1)
+
+    def _get_hovered_cell(
+        self, mouse_pos: Tuple[int, int], board_x: int, board_y: int, cell_size: int
+    ) -> Optional[Tuple[int, int]]:
+        """Get the cell drawn under the mouse while playing (the gaps between cells belong to none)."""
+        cell_pos = self._get_cell_from_pos(mouse_pos)
+        if cell_pos is None or self.state != GameState.PLAYING:
+            return None
+        x, y = cell_pos
+        base_rect = pygame.Rect(board_x + x * cell_size, board_y + y * cell_size, cell_size - 2, cell_size - 2)
+        return cell_pos if base_rect.collidepoint(mouse_pos) else None
 
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                self._draw_cell(x, y, board_x, board_y, cell_size, mouse_pos)
+    def _redraw_cell_region(
+        self, x: int, y: int, board_x: int, board_y: int, cell_size: int, mouse_pos: Tuple[int, int], theme: Palette
+    ):
+        """Redraw a cell and the margin its animations may cover, including overlapping neighbours."""
+        region = self._get_cell_region(x, y, board_x, board_y, cell_size)
+        self.screen.set_clip(region)
+        self.screen.fill(theme["background"])
+        self.screen.blit(self.board_layer.surface, (board_x, board_y))
+        neighbours = {
+            (nx, ny)
+            for ny in range(max(0, y - 1), min(self.board_size, y + 2))
+            for nx in range(max(0, x - 1), min(self.board_size, x + 2))
+        }
+        self._draw_board_overlay(neighbours, board_x, board_y, cell_size, mouse_pos)
+        self.screen.set_clip(None)
+        self.dirty.add(region)
+
+    def _get_cell_region(self, x: int, y: int, board_x: int, board_y: int, cell_size: int) -> pygame.Rect:
+        """Screen area of a cell and the margin its animations may cover, within the viewport."""
+        region = pygame.Rect(board_x + x * cell_size, board_y + y * cell_size, cell_size, cell_size)
+        return region.inflate(cell_size // 2, cell_size // 2).clip(self.camera.viewport)
+
+    def _draw_hint(self, board_x: int, board_y: int, cell_size: int, theme: Palette):
+        """Outline the advised cell for a few seconds after a hint request."""
+        if self.hint is None or self.state != GameState.PLAYING:
+            return
+        if self.current_time - self.hint_time > HINT_DISPLAY_DURATION:
+            self.hint = None
+            self.dirty.invalidate_all()
+            return
+
+        rect = pygame.Rect(board_x + self.hint.x * cell_size, board_y + self.hint.y * cell_size, cell_size - 2, cell_size - 2)
+        self.screen.set_clip(self.camera.viewport)
+        pygame.draw.rect(self.screen, theme["cell_flag"], rect.inflate(4, 4), 3, border_radius=6)
+        self.screen.set_clip(None)
+        self.dirty.add(rect.inflate(4, 4).clip(self.camera.viewport))
+
+        if self.hint.mine_probability > 0:
+            label = f"Best guess: {self.hint.mine_probability * 100:.0f}% mine, {self.hint.win_probability * 100:.0f}% win"
+        else:
+            label = "Safe cell"
+        hint_text = render_text(self.small_font, label, theme["text"])
+        board_bottom = min(board_y + self.board_size * cell_size, self.camera.viewport.bottom)
+        hint_rect = hint_text.get_rect(midtop=(self.screen.get_width() // 2, board_bottom + 4))
+        self.screen.fill(theme["background"], hint_rect)  # Drawn every frame; don't blend it over itself
+        self.screen.blit(hint_text, hint_rect)
+        self.dirty.add(hint_rect)
 
     def _draw_end_screen(self):
         theme = self._get_theme()
 
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.surfaces.get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 180)), (0, 0))
 
         # Result box
         box_width = int(SCREEN_WIDTH * 0.35)
@@ -1143,11 +1739,11 @@ class Minesweeper:
 
         # Title
         if self.state == GameState.WON:
-            title = self.header_font.render("*** YOU WON! ***", True, (50, 205, 50))
-            time_text = self.text_font.render(f"Time: {self.elapsed_time:.2f} seconds", True, theme["text"])
+            title = render_text(self.header_font, "*** YOU WON! ***", (50, 205, 50))
+            time_text = render_text(self.text_font, f"Time: {self.elapsed_time:.2f} seconds", theme["text"])
         else:
-            title = self.header_font.render("*** GAME OVER ***", True, (255, 99, 71))
-            time_text = self.text_font.render("Better luck next time!", True, theme["text"])
+            title = render_text(self.header_font, "*** GAME OVER ***", (255, 99, 71))
+            time_text = render_text(self.text_font, "Better luck next time!", theme["text"])
 
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * 0.25)))
         self.screen.blit(title, title_rect)
@@ -1156,17 +1752,53 @@ class Minesweeper:
         self.screen.blit(time_text, time_rect)
 
         # Stats
-        stats_text = self.small_font.render(
-            f"Board: {self.board_size}x{self.board_size} | Mines: {self.num_mines}", True, theme["text"]
+        rating = self._get_board_rating()
+        rating_text = f" | Difficulty: {rating.difficulty} (3BV {rating.three_bv})" if rating else ""
+        stats_text = render_text(
+            self.small_font, f"Board: {self.board_size}x{self.board_size} | Mines: {self.num_mines}{rating_text}", theme["text"]
         )
         stats_rect = stats_text.get_rect(center=(SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * 0.38)))
         self.screen.blit(stats_text, stats_rect)
 
+        # Post-game analysis of the lost game
+        if self.state == GameState.LOST:
+            self._draw_post_mortem(theme)
+
         # Buttons
         for button in self.end_buttons.values():
             button.draw(self.screen, theme)
 
+    def _draw_post_mortem(self, theme: Palette):
+        """Draw the move analysis summary (or its progress) on the end screen."""
+        self.post_mortem.poll()
+        done, total = self.post_mortem.get_progress()
+
+        if not self.post_mortem.finished:
+            lines = [f"Analyzing moves... {min(done, total)}/{total}"]
+        elif not self.post_mortem.analyses:
+            lines = []
+        else:
+            lines = [
+                f"Safe: {self.post_mortem.count(SAFE)} | Forced guesses: {self.post_mortem.count(FORCED_GUESS)}"
+                f" | Avoidable guesses: {self.post_mortem.count(AVOIDABLE_GUESS)}"
+            ]
+            fatal = self.post_mortem.analyses[-1]
+            if fatal.hit_mine:
+                lines.append(
+                    f"Fatal click ({fatal.x + 1}, {fatal.y + 1}): {fatal.verdict}, "
+                    f"{fatal.mine_probability * 100:.0f}% mine chance"
+                )
+
+        for i, line in enumerate(lines):
+            text = render_text(self.small_font, line, theme["text"])
+            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * (0.52 + 0.03 * i))))
+            self.screen.blit(text, text_rect)
+
     def _draw_leaderboard(self):
+        self._draw_retained(self.leaderboard_ui, self._draw_leaderboard_static)
+
+    def _draw_leaderboard_static(self):
+        """Draw the leaderboard screen without its buttons."""
         theme = self._get_theme()
         current_width = self.screen.get_width()
         current_height = self.screen.get_height()
@@ -1174,23 +1806,21 @@ class Minesweeper:
         self.screen.fill(theme["background"])
 
         # Title
-        title = self.header_font.render("Leaderboard", True, theme["text"])
+        title = render_text(self.header_font, "Leaderboard", theme["text"])
         title_rect = title.get_rect(center=(current_width // 2, int(current_height * 0.08)))
         self.screen.blit(title, title_rect)
 
         configs = self._get_all_leaderboard_configs()
+        self.leaderboard_ui.set_visible("prev", len(configs) > 1)
+        self.leaderboard_ui.set_visible("next", len(configs) > 1)
         if not configs:
-            no_data = self.text_font.render("No leaderboard data yet!", True, theme["text"])
+            no_data = render_text(self.text_font, "No leaderboard data yet!", theme["text"])
             no_data_rect = no_data.get_rect(center=(current_width // 2, current_height // 2))
             self.screen.blit(no_data, no_data_rect)
         else:
             self._draw_leaderboard_content(configs, theme)
 
-        # Buttons
-        self.lb_buttons["back"].draw(self.screen, theme)
-        self.lb_buttons["clear"].draw(self.screen, theme)
-
-    def _draw_leaderboard_content(self, configs: List[Tuple[int, int]], theme: dict):
+    def _draw_leaderboard_content(self, configs: List[Tuple[int, int]], theme: Palette):
         """Draw the leaderboard content when there are entries."""
         current_width = self.screen.get_width()
         current_height = self.screen.get_height()
@@ -1200,17 +1830,12 @@ class Minesweeper:
         size, mines = configs[self.current_lb_index]
 
         # Config selector
-        config_text = self.text_font.render(f"{size}x{size} - {mines} mines", True, theme["text"])
+        config_text = render_text(self.text_font, f"{size}x{size} - {mines} mines", theme["text"])
         config_rect = config_text.get_rect(center=(current_width // 2, int(current_height * 0.15)))
         self.screen.blit(config_text, config_rect)
 
-        # Navigation buttons
-        if len(configs) > 1:
-            self.lb_buttons["prev"].draw(self.screen, theme)
-            self.lb_buttons["next"].draw(self.screen, theme)
-
         # Page indicator
-        page_text = self.small_font.render(f"{self.current_lb_index + 1} / {len(configs)}", True, theme["text"])
+        page_text = render_text(self.small_font, f"{self.current_lb_index + 1} / {len(configs)}", theme["text"])
         page_rect = page_text.get_rect(center=(current_width // 2, int(current_height * 0.22)))
         self.screen.blit(page_text, page_rect)
 
@@ -1219,21 +1844,22 @@ class Minesweeper:
 
         # Table header
         header_y = int(current_height * 0.28)
-        headers = ["Rank", "Name", "Time", "Date"]
+        headers = ["Rank", "Name", "Time", "Class", "Date"]
         positions = [
-            current_width // 2 - int(current_width * 0.2),
-            current_width // 2 - int(current_width * 0.08),
-            current_width // 2 + int(current_width * 0.04),
-            current_width // 2 + int(current_width * 0.14),
+            current_width // 2 - int(current_width * 0.26),
+            current_width // 2 - int(current_width * 0.16),
+            current_width // 2 - int(current_width * 0.02),
+            current_width // 2 + int(current_width * 0.07),
+            current_width // 2 + int(current_width * 0.16),
         ]
 
         for header, pos in zip(headers, positions):
-            header_surface = self.text_font.render(header, True, theme["text"])
+            header_surface = render_text(self.text_font, header, theme["text"])
             self.screen.blit(header_surface, (pos, header_y))
 
         self._draw_leaderboard_entries(entries, header_y, positions, theme)
 
-    def _draw_leaderboard_entries(self, entries: List[LeaderboardEntry], header_y: int, positions: List[int], theme: dict):
+    def _draw_leaderboard_entries(self, entries: List[LeaderboardEntry], header_y: int, positions: List[int], theme: Palette):
         """Draw individual leaderboard entries."""
         current_width = self.screen.get_width()
         current_height = self.screen.get_height()
@@ -1244,17 +1870,19 @@ class Minesweeper:
                 y = header_y + 40 + i * row_height
                 color = theme["cell_flag"] if i < 3 else theme["text"]
 
-                rank_text = self.text_font.render(f"#{i + 1}", True, color)
-                name_text = self.text_font.render(entry.name[:12], True, color)
-                time_text = self.text_font.render(f"{entry.time:.2f}s", True, color)
-                date_text = self.small_font.render(entry.date, True, color)
+                rank_text = render_text(self.text_font, f"#{i + 1}", color)
+                name_text = render_text(self.text_font, entry.name[:12], color)
+                time_text = render_text(self.text_font, f"{entry.time:.2f}s", color)
+                class_text = render_text(self.small_font, entry.difficulty or "-", color)
+                date_text = render_text(self.small_font, entry.date, color)
 
                 self.screen.blit(rank_text, (positions[0], y))
                 self.screen.blit(name_text, (positions[1], y))
                 self.screen.blit(time_text, (positions[2], y))
-                self.screen.blit(date_text, (positions[3], y))
+                self.screen.blit(class_text, (positions[3], y))
+                self.screen.blit(date_text, (positions[4], y))
         else:
-            no_entries = self.text_font.render("No entries yet for this configuration", True, theme["text"])
+            no_entries = render_text(self.text_font, "No entries yet for this configuration", theme["text"])
             no_entries_rect = no_entries.get_rect(center=(current_width // 2, int(current_height * 0.4)))
             self.screen.blit(no_entries, no_entries_rect)
 
@@ -1267,27 +1895,37 @@ class Minesweeper:
         self.screen.fill(theme["background"])
 
         # Title and stats
-        title = self.title_font.render("ACHIEVEMENTS", True, theme["text"])
+        title = render_text(self.title_font, "ACHIEVEMENTS", theme["text"])
         title_rect = title.get_rect(center=(current_width // 2, int(current_height * 0.05)))
         self.screen.blit(title, title_rect)
 
         # Stats
         unlocked = self.stats_mgr.get_unlocked_count()
         total = self.stats_mgr.get_total_count()
-        stats_text = self.text_font.render(f"Unlocked: {unlocked}/{total}", True, theme["text"])
+        stats_text = render_text(self.text_font, f"Unlocked: {unlocked}/{total}", theme["text"])
         stats_rect = stats_text.get_rect(center=(current_width // 2, int(current_height * 0.10)))
         self.screen.blit(stats_text, stats_rect)
 
         # Game stats
         game_stats = self.stats_mgr.get_stats()
-        games_text = self.text_font.render(
+        games_text = render_text(
+            self.text_font,
             f"Games: {game_stats['total_games']} | Wins: {game_stats['total_wins']} | Win Rate: {self.stats_mgr.get_win_rate():.1f}%",
-            True,
             theme["text"],
         )
         games_rect = games_text.get_rect(center=(current_width // 2, int(current_height * 0.14)))
         self.screen.blit(games_text, games_rect)
 
+        # Win rate per rated board class
+        win_rates = self.stats_mgr.get_win_rate_by_rating()
+        if win_rates:
+            rates = " | ".join(
+                f"{difficulty}: {win_rates[difficulty]:.0f}%" for difficulty in DIFFICULTY_CLASSES if difficulty in win_rates
+            )
+            rates_text = render_text(self.small_font, f"Win rate by board class - {rates}", theme["text"])
+            rates_rect = rates_text.get_rect(center=(current_width // 2, int(current_height * 0.175)))
+            self.screen.blit(rates_text, rates_rect)
+
         # Draw achievements list
         achievements = self.stats_mgr.get_achievements()
         ach_list = list(achievements.items())
@@ -1321,24 +1959,24 @@ class Minesweeper:
             icon_text = ach.icon if ach.icon else "🏆"  # Fallback to trophy emoji
             try:
                 # Try to render emoji with a font that supports it
-                icon = self.header_font.render(icon_text, True, theme["text"])
+                icon = render_text(self.header_font, icon_text, theme["text"])
                 self.screen.blit(icon, (int(current_width * 0.08), y + int(row_height * 0.08)))
             except Exception:
                 # Fallback: just render the emoji symbol as is
-                icon = self.small_font.render(icon_text, True, theme["text"])
+                icon = render_text(self.small_font, icon_text, theme["text"])
                 self.screen.blit(icon, (int(current_width * 0.08), y + int(row_height * 0.15)))
 
             # Name and description with better spacing
             name_color = theme["text"] if ach.unlocked else (100, 100, 100)
-            name = self.header_font.render(ach.name, True, name_color)
+            name = render_text(self.header_font, ach.name, name_color)
             self.screen.blit(name, (int(current_width * 0.18), y + int(row_height * 0.08)))
 
-            desc = self.small_font.render(ach.description, True, name_color)
+            desc = render_text(self.small_font, ach.description, name_color)
             self.screen.blit(desc, (int(current_width * 0.18), y + int(row_height * 0.48)))
 
             # Unlock date if unlocked
             if ach.unlocked and ach.unlock_date:
-                date_text = self.small_font.render(f"Unlocked: {ach.unlock_date[:10]}", True, theme["cell_flag"])
+                date_text = render_text(self.small_font, f"Unlocked: {ach.unlock_date[:10]}", theme["cell_flag"])
                 self.screen.blit(date_text, (int(current_width * 0.70), y + int(row_height * 0.48)))
 
         # Navigation buttons - positioned to avoid overlap
@@ -1360,9 +1998,9 @@ class Minesweeper:
         self.ach_back_button = back_btn
 
         # Navigation info
-        nav_text = self.small_font.render(
+        nav_text = render_text(
+            self.small_font,
             f"Achievements {self.current_ach_index + 1}-{min(self.current_ach_index + rows_per_screen, len(ach_list))} of {len(ach_list)}",
-            True,
             theme["text"],
         )
         nav_rect = nav_text.get_rect(center=(current_width // 2, button_y - int(button_height * 0.8)))
@@ -1416,19 +2054,26 @@ class Minesweeper:
             self._toggle_fullscreen()
             return
 
-        if self.menu_buttons["play"].handle_event(event):
+        clicked = self.menu_ui.route(event)
+        if clicked == "play":
             self._create_board()
             self.state = GameState.PLAYING
-        elif self.menu_buttons["leaderboard"].handle_event(event):
+        elif clicked == "leaderboard":
             self.state = GameState.LEADERBOARD
-        elif self.menu_buttons["achievements"].handle_event(event):
+        elif clicked == "achievements":
             self.state = GameState.ACHIEVEMENTS
             self.current_ach_index = 0
-        elif self.menu_buttons["settings"].handle_event(event):
+        elif clicked == "settings":
             self.state = GameState.SETTINGS
-        elif self.menu_buttons["fullscreen"].handle_event(event):
+        elif clicked == "fullscreen":
             self._toggle_fullscreen()
-        elif self.menu_buttons["quit"].handle_event(event):
+        elif clicked == "quit":
+            self._record_pending_ratings()
+            self.board_rater.shutdown()
+            self.post_mortem.shutdown()
+            self.board_layer.shutdown()
+            if self.recorder is not None:
+                self.recorder.close()
             pygame.quit()
             exit()
 
@@ -1456,52 +2101,39 @@ class Minesweeper:
             self.settings_mgr.set("player_name", self.player_name)
             return
 
-        self.size_slider.handle_event(event)
-        self.mines_slider.handle_event(event)
-
-        self.board_size = self.size_slider.value
-        self.num_mines = self.mines_slider.value
-        
-        # Save settings
-        self.settings_mgr.set("board_size", self.board_size)
-        self.settings_mgr.set("num_mines", self.num_mines)
-
-        if self.settings_buttons["back"].handle_event(event):
+        clicked = self.settings_ui.route(event)
+        if clicked == "back":
             self.state = GameState.MENU
-        elif self.settings_buttons["beginner"].handle_event(event):
-            self.size_slider.value = 9
-            self.mines_slider.value = 10
-            self.board_size = 9
-            self.num_mines = 10
-            self.settings_mgr.set("board_size", 9)
-            self.settings_mgr.set("num_mines", 10)
-        elif self.settings_buttons["intermediate"].handle_event(event):
-            self.size_slider.value = 16
-            self.mines_slider.value = 40
-            self.board_size = 16
-            self.num_mines = 40
-            self.settings_mgr.set("board_size", 16)
-            self.settings_mgr.set("num_mines", 40)
-        elif self.settings_buttons["expert"].handle_event(event):
-            self.size_slider.value = 22
-            self.mines_slider.value = 99
-            self.board_size = 22
-            self.num_mines = 99
-            self.settings_mgr.set("board_size", 22)
-            self.settings_mgr.set("num_mines", 99)
-
-        for name, button in self.theme_buttons.items():
-            if button.handle_event(event):
-                self.current_theme = name
-                self.settings_mgr.set("theme", name)
+        elif clicked in PRESETS:
+            self.size_slider.value, self.mines_slider.value = PRESETS[clicked]
+            self.settings_ui.mark_changed("size")
+            self.settings_ui.mark_changed("mines")
+        elif clicked is not None and clicked.startswith("theme:"):
+            self.current_theme = clicked[len("theme:"):]
+            self.settings_mgr.set("theme", self.current_theme)
+        self._sync_mines_slider()
+
+        # Save the board settings when a slider or preset changed them
+        if (self.size_slider.value, self.mines_slider.value) != (self.board_size, self.num_mines):
+            self.board_size = self.size_slider.value
+            self.num_mines = self.mines_slider.value
+            self.settings_mgr.set("board_size", self.board_size)
+            self.settings_mgr.set("num_mines", self.num_mines)
 
     def _handle_game_events(self, event: pygame.event.Event):
-        if self.game_buttons["menu"].handle_event(event):
+        clicked = self.game_ui.route(event)
+        if clicked == "menu":
             self.state = GameState.MENU
             return
-        elif self.game_buttons["restart"].handle_event(event):
+        elif clicked == "restart":
             self._create_board()
             return
+        elif clicked == "hint" or (event.type == pygame.KEYDOWN and event.key == pygame.K_h):
+            self._request_hint()
+            return
+
+        if self._handle_camera_event(event):
+            return
 
         if event.type == pygame.MOUSEBUTTONDOWN:
             cell_pos = self._get_cell_from_pos(event.pos)
@@ -1509,45 +2141,74 @@ class Minesweeper:
                 x, y = cell_pos
                 if event.button == 1:  # Left click
                     if self.first_click:
-                        self._place_mines(x, y)
+                        self._clear_safe_zone(x, y)
+                        self._rate_board(x, y)
                         self.first_click = False
-                        self.start_time = time.time()
+                        self.first_click_pos = (x, y)
+                        self.start_time = self.current_time
                         self.audio_mgr.play("click")
                     else:
                         cell = self.board[y][x]
                         # Check if clicking on a revealed numbered cell with all flags correctly placed
                         if cell.is_revealed and cell.adjacent_mines > 0 and not cell.is_mine:
-                            if self._check_auto_reveal(x, y):
-                                self.audio_mgr.play("win")
-                            else:
-                                self._reveal_cell(x, y)
-                                self.audio_mgr.play("click")
+                            self.move_history.append(("chord", x, y))
+                            targets = self._get_chord_targets(x, y)
+                            self._apply_move(targets)
+                            self.audio_mgr.play("win" if targets else "click")
                         else:
-                            self._reveal_cell(x, y)
+                            self.move_history.append(("reveal", x, y))
+                            self._apply_move([(x, y)])
                             self.audio_mgr.play("click")
                 elif event.button == 3:  # Right click
                     if not self.first_click:
+                        self.move_history.append(("flag", x, y))
                         self._toggle_flag(x, y)
                         self.audio_mgr.play("flag")
 
+    def _handle_camera_event(self, event: pygame.event.Event) -> bool:
+        """
+        Zoom the board with the mouse wheel and pan it by dragging with the middle button.
+
+        Returns:
+            True if the event was used
+        """
+        self._calculate_board_dimensions()
+        moved = False
+        if event.type == pygame.MOUSEWHEEL:
+            moved = self.camera.zoom_at(pygame.mouse.get_pos(), event.y)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:
+            self.pan_anchor = event.pos
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+            self.pan_anchor = None
+        elif event.type == pygame.MOUSEMOTION and self.pan_anchor is not None:
+            moved = self.camera.pan(event.pos[0] - self.pan_anchor[0], event.pos[1] - self.pan_anchor[1])
+            self.pan_anchor = event.pos
+        else:
+            return False
+
+        if moved:
+            self.dirty.invalidate_all()
+        return True
+
     def _handle_end_events(self, event: pygame.event.Event):
-        if self.end_buttons["menu"].handle_event(event):
+        clicked = self.end_ui.route(event)
+        if clicked == "menu":
             self.state = GameState.MENU
-        elif self.end_buttons["restart"].handle_event(event):
+        elif clicked == "restart":
             self._create_board()
             self.state = GameState.PLAYING
 
     def _handle_leaderboard_events(self, event: pygame.event.Event):
-        configs = self._get_all_leaderboard_configs()
-
-        if self.lb_buttons["back"].handle_event(event):
+        clicked = self.leaderboard_ui.route(event)
+        if clicked == "back":
             self.state = GameState.MENU
-        elif self.lb_buttons["clear"].handle_event(event):
+        elif clicked == "clear":
             self._clear_current_leaderboard()
-        elif self.lb_buttons["prev"].handle_event(event) and configs:
-            self.current_lb_index = (self.current_lb_index - 1) % len(configs)
-        elif self.lb_buttons["next"].handle_event(event) and configs:
-            self.current_lb_index = (self.current_lb_index + 1) % len(configs)
+        elif clicked in ("prev", "next"):
+            configs = self._get_all_leaderboard_configs()
+            if configs:
+                step = 1 if clicked == "next" else -1
+                self.current_lb_index = (self.current_lb_index + step) % len(configs)
 
     def _handle_achievements_events(self, event: pygame.event.Event):
         """Handle achievements screen events."""
@@ -1564,41 +2225,113 @@ class Minesweeper:
 
     def run(self):
         running = True
-
         while running:
-            self.current_time = time.time()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.state == GameState.MENU:
-                            running = False
-                        else:
-                            self.state = GameState.MENU
-                    elif event.key == pygame.K_F11:
-                        self._toggle_fullscreen()
-                elif event.type == pygame.VIDEORESIZE:
-                    # Handle window resize in windowed mode
-                    if not self.is_fullscreen:
-                        self.windowed_size = (event.w, event.h)
-                        self._setup_fonts()
-                        self._setup_ui()
-
-                # Handle events based on state
-                self._dispatch_event(event)
-
-            # Draw based on state
-            self._draw_current_state()
+            running = self._run_frame()
+
+        self._record_pending_ratings()
+        self.board_rater.shutdown()
+        self.post_mortem.shutdown()
+        self.board_layer.shutdown()
+        if self.recorder is not None:
+            self.recorder.close()
+        pygame.quit()
+
+    def _run_frame(self) -> bool:
+        """
+        Handle input and draw one frame, first sleeping until input arrives if nothing
+        on screen can change (see `_get_idle_timeout`).
+
+        Returns:
+            False once the game should quit
+        """
+        timeout = self._get_idle_timeout()
+        if timeout is None:
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(max(1, int(timeout * 1000)))
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        events = coalesce_motion(events)
 
+        self.frame_clock.tick(paced=timeout is None)
+        self.current_time = self.frame_clock.now
+        self._record_pending_ratings()
+        running = True
+        resize = None
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    if self.state == GameState.MENU:
+                        running = False
+                    else:
+                        self.state = GameState.MENU
+                elif event.key == pygame.K_F11:
+                    self._toggle_fullscreen()
+            elif event.type == pygame.VIDEORESIZE:
+                # Handle window resize in windowed mode; a drag sends many, laid out once below
+                if not self.is_fullscreen:
+                    resize = (event.w, event.h)
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                self.dirty.invalidate_all()
+            if event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+                self.window_focused = event.type == pygame.WINDOWFOCUSGAINED
+
+            # Handle events based on state
+            self._dispatch_event(event)
+
+        if resize is not None:
+            self.windowed_size = resize
+            self.surfaces.clear()
+            self._setup_fonts()
+            self._setup_ui()
+
+        # Draw based on state, then push only the regions that changed
+        self._draw_current_state()
+        full = self.dirty.needs_full_redraw()
+        rects = self.dirty.collect(self.screen.get_rect())
+        if full:
             pygame.display.flip()
-            self.clock.tick(60)
+        elif rects:
+            pygame.display.update(rects)
+        if self.recorder is not None and (full or rects):
+            self.recorder.capture(self.screen, self.current_time)
+        self.frame_clock.limit()
+        return running
+
+    def _get_idle_timeout(self) -> Optional[float]:
+        """
+        How long the next frame may wait for input before drawing.
 
-        pygame.quit()
+        Frames run at full rate while cells animate, on the focused menu (its background
+        moves) and right after a frame that changed the screen. Otherwise the loop sleeps
+        until input, the next change of the timer label or hint, or IDLE_TIMEOUT, which
+        also bounds how late background results (rating, analysis) show up. An unfocused
+        window always sleeps between frames, so its menu background slows down.
+
+        Returns:
+            Seconds to wait, or None to poll without waiting
+        """
+        if len(self.animations):
+            return None
+        if self.window_focused and (self.state == GameState.MENU or self.dirty.pixels_pushed):
+            return None
+
+        timeout = IDLE_TIMEOUT
+        now = time.perf_counter()  # The frame clock's timeline
+        if self.state == GameState.PLAYING and self.start_time:
+            timeout = min(timeout, 0.1 - (now - self.start_time) % 0.1)  # Timer shows tenths
+        if self.hint is not None:
+            timeout = min(timeout, max(0.0, self.hint_time + HINT_DISPLAY_DURATION - now))
+        return timeout
 
     def _dispatch_event(self, event: pygame.event.Event):
         """Dispatch event to appropriate handler based on game state."""
+        # Pointer moves and releases on the settings and leaderboard screens only change
+        # widgets, which their trees repaint; anything else redraws the screen
+        retained = self.state in (GameState.SETTINGS, GameState.LEADERBOARD)
+        if not (retained and event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP)):
+            self.input_since_draw = True
         if self.state == GameState.MENU:
             self._handle_menu_events(event)
         elif self.state == GameState.SETTINGS:
@@ -1613,21 +2346,60 @@ class Minesweeper:
             self._handle_achievements_events(event)
 
     def _draw_current_state(self):
-        """Draw the current game state."""
+        """
+        Draw the current game state.
+
+        Static screens are only redrawn after input, the end screen when its content
+        changes and the game screen region by region (see `_draw_game`); everything
+        drawn is recorded in `self.dirty`.
+        """
+        size = self.screen.get_size()
+        if self.state != self.drawn_state or size != self.drawn_size:
+            self.dirty.invalidate_all()
+            self.drawn_state = self.state
+            self.drawn_size = size
+        input_seen = self.input_since_draw
+        self.input_since_draw = False
+
         if self.state == GameState.MENU:
+            # The parallax background moves every frame
+            self.dirty.invalidate_all()
             self._draw_menu()
-        elif self.state == GameState.SETTINGS:
-            self._draw_settings()
         elif self.state == GameState.PLAYING:
             self._draw_game()
         elif self.state in (GameState.WON, GameState.LOST):
-            self._draw_game()
-            self._draw_end_screen()
-        elif self.state == GameState.LEADERBOARD:
-            self._draw_leaderboard()
-        elif self.state == GameState.ACHIEVEMENTS:
-            self._draw_achievements()
-
+            signature = self._get_end_screen_signature()
+            if input_seen or signature != self.end_screen_signature:
+                self.dirty.invalidate_all()
+            self.end_screen_signature = signature
+            if self.dirty.needs_full_redraw():
+                self._draw_game()
+                self._draw_end_screen()
+        else:
+            if input_seen:
+                self.dirty.invalidate_all()
+            tree = {GameState.SETTINGS: self.settings_ui, GameState.LEADERBOARD: self.leaderboard_ui}.get(self.state)
+            if self.dirty.needs_full_redraw():
+                if self.state == GameState.SETTINGS:
+                    self._draw_settings()
+                elif self.state == GameState.LEADERBOARD:
+                    self._draw_leaderboard()
+                elif self.state == GameState.ACHIEVEMENTS:
+                    self._draw_achievements()
+            elif tree is not None and tree.changed and tree.static is not None:
+                for region in tree.repaint(self.screen, self._get_theme()):
+                    self.dirty.add(region)
+
+    def _get_end_screen_signature(self) -> tuple:
+        """Everything that changes the win/loss screen without input; a new value forces a redraw."""
+        self.post_mortem.poll()
+        animating = len(self.animations) > 0 or self.board_layer.building
+        return (
+            self.current_time if animating else None,
+            self.post_mortem.get_progress(),
+            self.post_mortem.finished,
+            self._get_board_rating() is not None,
+        )
 
 if __name__ == "__main__":
     game = Minesweeper()
@@ -0,0 +1,85 @@
+"""
+Pixel Renderer for Minesweeper
+Draws the board as solid colour blocks straight from a grid of cell codes, for zoomed-out views and the minimap
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+
+from themes import Palette
+from tile_atlas import TILE_FLAG, TILE_HIDDEN, TILE_MINE, TILE_REVEALED, TileKey
+
+# Cells smaller than this are drawn by the pixel renderer instead of from tiles
+PIXEL_CELL_SIZE = 6
+
+# Cells at least this big get a one-pixel gap like the tiled board
+GAP_CELL_SIZE = 3
+
+# Cell codes: 0-8 are revealed cells by adjacent mine count
+CODE_HIDDEN = 9
+CODE_FLAG = 10
+CODE_MINE = 11
+CODE_BACKGROUND = 12  # Not a cell; the colour of the gaps
+
+TILE_CODES: Dict[TileKey, int] = {TILE_REVEALED: 0, TILE_HIDDEN: CODE_HIDDEN, TILE_FLAG: CODE_FLAG, TILE_MINE: CODE_MINE}
+TILE_CODES.update({number: number for number in range(1, 9)})
+
+
+@lru_cache(maxsize=None)
+def build_color_table(theme: Palette) -> np.ndarray:
+    """
+    Colour of each cell code for a theme variant.
+
+    Numbered cells are tinted halfway towards their number's colour, which keeps
+    openings readable when the digits are too small to draw.
+
+    Returns:
+        Array of shape (CODE_BACKGROUND + 1, 3)
+    """
+    table = np.zeros((CODE_BACKGROUND + 1, 3), dtype=np.uint8)
+    table[0] = theme.cell_revealed
+    for number in range(1, 9):
+        table[number] = (np.array(theme.cell_revealed) + np.array(theme.numbers[number])) // 2
+    table[CODE_HIDDEN] = theme.cell_hidden
+    table[CODE_FLAG] = theme.cell_flag
+    table[CODE_MINE] = theme.cell_mine
+    table[CODE_BACKGROUND] = theme.background
+    return table
+
+
+def render_cells(codes: np.ndarray, table: np.ndarray, cell_size: int) -> np.ndarray:
+    """
+    Map cell codes to a pixel array with `cell_size` pixels per cell.
+
+    Args:
+        codes: Cell codes indexed [x, y]
+        table: Colour table from `build_color_table`
+        cell_size: Pixels per cell side
+
+    Returns:
+        RGB array indexed [x, y], as `pygame.surfarray` expects
+    """
+    pixels = table[codes]
+    if cell_size > 1:
+        pixels = pixels.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+    if cell_size >= GAP_CELL_SIZE:
+        pixels[cell_size - 1::cell_size, :] = table[CODE_BACKGROUND]
+        pixels[:, cell_size - 1::cell_size] = table[CODE_BACKGROUND]
+    return pixels
+
+
+def render_minimap(codes: np.ndarray, table: np.ndarray, side: int) -> np.ndarray:
+    """
+    Shrink (by sampling) or enlarge (by whole pixels) the board to at most `side` pixels.
+
+    Returns:
+        RGB array indexed [x, y]
+    """
+    board_size = codes.shape[0]
+    if board_size > side:
+        step = -(-board_size // side)
+        return table[codes[::step, ::step]]
+    return render_cells(codes, table, side // board_size)
+
@@ -0,0 +1,228 @@
+"""
+Post-Mortem Move Analysis for Minesweeper
+Replays a finished game and classifies every click with the solver
+"""
+
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set, Tuple
+
+from solver import HIDDEN, adjacent_counts, deduce, mine_probabilities, neighbors, reveal
+
+# Move verdicts
+SAFE = "safe"
+FORCED_GUESS = "forced guess"
+AVOIDABLE_GUESS = "avoidable guess"
+
+# A recorded user action: (kind, x, y) with kind "reveal", "chord" or "flag"
+Move = Tuple[str, int, int]
+
+
+@dataclass
+class MoveAnalysis:
+    """Classification of one click."""
+
+    index: int  # Position of the move in the recorded sequence
+    kind: str  # 'reveal' or 'chord'
+    x: int
+    y: int
+    verdict: str  # SAFE, FORCED_GUESS or AVOIDABLE_GUESS
+    mine_probability: float  # For a chord, the riskiest cell it opened
+    hit_mine: bool
+
+
+def iter_move_analysis(size: int, mines: List[bool], first_click: Tuple[int, int],
+                       moves: List[Move]) -> Iterator[MoveAnalysis]:
+    """
+    Replay a game and classify each reveal or chord in order.
+
+    A move is safe if the solver could prove every cell it opened safe, a forced
+    guess if no provably safe cell existed and no hidden cell was less likely to be
+    a mine, and an avoidable guess otherwise. Moves that opened nothing and moves
+    after the one that hit a mine are skipped (see `count_analyzed_moves`).
+
+    Args:
+        size: Board side length
+        mines: Flat mine layout
+        first_click: (x, y) of the click that placed the mines; its 3x3 block is safe
+        moves: Recorded user actions in order
+    """
+    total_mines = sum(mines)
+    fx, fy = first_click
+    safe_zone = {
+        ny * size + nx
+        for ny in range(max(0, fy - 1), min(size, fy + 2))
+        for nx in range(max(0, fx - 1), min(size, fx + 2))
+    }
+
+    for index, (kind, x, y), targets, visible in _replay(size, mines, moves):
+        known_safe = {c for c in safe_zone if visible[c] == HIDDEN}
+        safe, known_mines = deduce(size, visible, known_safe=known_safe)
+        if all(target in safe for target in targets):
+            verdict = SAFE
+            probability = 0.0
+        else:
+            probs = mine_probabilities(size, visible, total_mines, known_mines, known_safe)
+            probability = max(probs.get(target, 1.0) for target in targets)
+            best = min(probs.values(), default=1.0)
+            verdict = FORCED_GUESS if not safe and probability <= best + 1e-9 else AVOIDABLE_GUESS
+
+        hit_mine = any(mines[target] for target in targets)
+        yield MoveAnalysis(index, kind, x, y, verdict, probability, hit_mine)
+
+
+def count_analyzed_moves(size: int, mines: List[bool], moves: List[Move]) -> int:
+    """Number of moves `iter_move_analysis` classifies (replays the game without the solver)."""
+    return sum(1 for _ in _replay(size, mines, moves))
+
+
+def _replay(size: int, mines: List[bool], moves: List[Move]) -> Iterator[Tuple[int, Move, List[int], List[int]]]:
+    """
+    Replay the moves that open cells, following the game's rules, up to the first mine hit.
+
+    Yields:
+        (index, move, cells it opens, visible board before it); the move is applied
+        once the consumer asks for the next one
+    """
+    counts = adjacent_counts(size, mines)
+    adj = neighbors(size)
+    visible = [HIDDEN] * (size * size)
+    flags: Set[int] = set()
+
+    for index, (kind, x, y) in enumerate(moves):
+        cell = y * size + x
+        if kind == "flag":
+            if visible[cell] == HIDDEN:
+                flags.symmetric_difference_update({cell})
+            continue
+
+        # Cells the move opens, following the game's rules
+        if kind == "chord":
+            # `_get_chord_targets` only opens neighbours once the flags match the number
+            if sum(1 for n in adj[cell] if n in flags) == counts[cell]:
+                targets = [n for n in adj[cell] if visible[n] == HIDDEN and n not in flags and not mines[n]]
+            else:
+                targets = []
+        elif visible[cell] == HIDDEN and cell not in flags:
+            targets = [cell]
+        else:
+            targets = []
+        if not targets:
+            continue
+
+        yield index, (kind, x, y), targets, visible
+        if any(mines[target] for target in targets):
+            return
+        for target in targets:
+            reveal(size, mines, counts, visible, target, flags)
+
+
+def analyze_moves(size: int, mines: List[bool], first_click: Tuple[int, int], moves: List[Move]) -> List[MoveAnalysis]:
+    """Classify every move of a game in the current process."""
+    return list(iter_move_analysis(size, mines, first_click, moves))
+
+
+def _analysis_worker(jobs, results, current_job):
+    """
+    Worker loop: analyze queued games, streaming each move result back.
+
+    A game stops being analyzed (between moves) once `current_job` no longer holds its id.
+    """
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, args = job
+        if current_job.value != job_id:
+            continue  # Cancelled while queued
+        for analysis in iter_move_analysis(*args):
+            if current_job.value != job_id:
+                break
+            results.put((job_id, analysis))
+        else:
+            results.put((job_id, None))
+
+
+class PostMortemAnalyzer:
+    """
+    Runs move analysis in a background process and reports progress.
+
+    The worker process is kept alive between games so the solver's component cache
+    is reused across analyses. It is started with the "spawn" method so it does not
+    inherit the game's SDL state.
+    """
+
+    def __init__(self):
+        """Initialize analyzer (the worker process starts on first use)."""
+        self._process: Optional[multiprocessing.Process] = None
+        self._jobs = None
+        self._results = None
+        self._current_job = None  # Shared with the worker: id of the only job worth finishing
+        self._job_id = 0
+        self.analyses: List[MoveAnalysis] = []
+        self.total = 0
+        self.finished = True
+
+    def start(self, size: int, mines: List[bool], first_click: Tuple[int, int], moves: List[Move]):
+        """Start analyzing a game, discarding any analysis still in progress."""
+        if self._process is None or not self._process.is_alive():
+            context = multiprocessing.get_context("spawn")
+            self._jobs = context.Queue()
+            self._results = context.Queue()
+            self._current_job = context.Value("q", 0, lock=False)
+            self._process = context.Process(
+                target=_analysis_worker, args=(self._jobs, self._results, self._current_job), daemon=True
+            )
+            self._process.start()
+
+        self._next_job()
+        self.total = count_analyzed_moves(size, mines, moves)
+        self.finished = self.total == 0
+        self._jobs.put((self._job_id, (size, list(mines), first_click, list(moves))))
+
+    def cancel(self):
+        """Stop the current analysis; the worker drops it at its next move and late results are ignored."""
+        self._next_job()
+        self.total = 0
+        self.finished = True
+
+    def _next_job(self):
+        """Start a new job id, which tells the worker to stop any older job."""
+        self._job_id += 1
+        if self._current_job is not None:
+            self._current_job.value = self._job_id
+        self.analyses = []
+
+    def poll(self):
+        """Collect results produced since the last call (never blocks)."""
+        if self._results is None:
+            return
+        while True:
+            try:
+                job_id, analysis = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if job_id != self._job_id:
+                continue
+            if analysis is None:
+                self.finished = True
+            else:
+                self.analyses.append(analysis)
+
+    def get_progress(self) -> Tuple[int, int]:
+        """Get (moves analyzed, moves to analyze)."""
+        return len(self.analyses), self.total
+
+    def count(self, verdict: str) -> int:
+        """Number of analyzed moves with the given verdict."""
+        return sum(1 for analysis in self.analyses if analysis.verdict == verdict)
+
+    def shutdown(self):
+        """Stop the worker process."""
+        if self._process is not None and self._process.is_alive():
+            self._jobs.put(None)
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
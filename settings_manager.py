@@ -30,6 +30,10 @@ class SettingsManager:
             "player_name": "Player",
             "window_width": 1280,
             "window_height": 720,
+            "hint_deadline_ms": 50,
+            "max_fps": 60,  # Frame rate cap, e.g. 144 for high refresh displays; 0 for uncapped
+            "capture_dir": "",  # Folder to record the shown frames into (see frame_capture.py); empty for off
+            "capture_format": "png",  # Or "raw" for one compressed stream
         }
         self._load_settings()
 
@@ -101,6 +105,10 @@ class SettingsManager:
             "player_name": "Player",
             "window_width": 1280,
             "window_height": 720,
+            "hint_deadline_ms": 50,
+            "max_fps": 60,  # Frame rate cap, e.g. 144 for high refresh displays; 0 for uncapped
+            "capture_dir": "",  # Folder to record the shown frames into (see frame_capture.py); empty for off
+            "capture_format": "png",  # Or "raw" for one compressed stream
         }
         self.settings = default_settings
         self.save_settings()
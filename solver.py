@@ -0,0 +1,437 @@
+"""
+Minesweeper Solver
+Deterministic deductions and exact mine probabilities for a visible board
+
+Boards are flat lists indexed by `y * size + x`. A visible board holds HIDDEN (-1)
+for cells that are not revealed and the adjacent mine count otherwise.
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+HIDDEN = -1
+
+# Components larger than this are not enumerated exactly
+MAX_COMPONENT_CELLS = 48
+
+Constraint = Tuple[FrozenSet[int], int]
+
+
+@lru_cache(maxsize=32)
+def neighbors(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Neighbour indices of every cell of a size x size board."""
+    result = []
+    for y in range(size):
+        for x in range(size):
+            result.append(tuple(
+                ny * size + nx
+                for ny in range(max(0, y - 1), min(size, y + 2))
+                for nx in range(max(0, x - 1), min(size, x + 2))
+                if nx != x or ny != y
+            ))
+    return tuple(result)
+
+
+def adjacent_counts(size: int, mines: List[bool]) -> List[int]:
+    """Number of adjacent mines for every cell."""
+    adj = neighbors(size)
+    return [sum(mines[n] for n in adj[i]) for i in range(size * size)]
+
+
+def reveal(size: int, mines: List[bool], counts: List[int], visible: List[int], cell: int,
+           flags: Optional[Set[int]] = None) -> int:
+    """
+    Reveal a cell on a visible board, flood-filling openings like `_open_cells`.
+
+    Flagged cells are never opened, neither directly nor by the flood fill.
+
+    Returns:
+        Number of cells newly revealed (the cell itself may be a mine)
+    """
+    flags = flags or set()
+    if visible[cell] != HIDDEN or cell in flags:
+        return 0
+    adj = neighbors(size)
+    visible[cell] = counts[cell]
+    revealed = 1
+    if mines[cell] or counts[cell]:
+        return revealed
+    stack = [cell]
+    while stack:
+        current = stack.pop()
+        for n in adj[current]:
+            if visible[n] == HIDDEN and not mines[n] and n not in flags:
+                visible[n] = counts[n]
+                revealed += 1
+                if counts[n] == 0:
+                    stack.append(n)
+    return revealed
+
+
+def constraints(size: int, visible: List[int], known_mines: Set[int],
+                known_safe: Optional[Set[int]] = None) -> List[Constraint]:
+    """
+    Build the constraints given by revealed numbers.
+
+    Each constraint is (unknown hidden neighbours, mines still needed among them).
+    Hidden cells in `known_safe` are not unknowns. A number that cannot be satisfied
+    is kept even without unknowns, so callers can detect the contradiction.
+    """
+    adj = neighbors(size)
+    known_safe = known_safe or set()
+    result = []
+    for i, value in enumerate(visible):
+        if value == HIDDEN:
+            continue
+        unknown = []
+        needed = value
+        for n in adj[i]:
+            if visible[n] == HIDDEN:
+                if n in known_mines:
+                    needed -= 1
+                elif n not in known_safe:
+                    unknown.append(n)
+        if unknown or needed != 0:
+            result.append((frozenset(unknown), needed))
+    return result
+
+
+def _contradicts(rules: List[Constraint]) -> bool:
+    """True if some constraint needs more mines than it has cells, or fewer than none."""
+    return any(needed < 0 or needed > len(cells) for cells, needed in rules)
+
+
+def deduce_constraints(rules: Iterable[Constraint]) -> Tuple[Set[int], Set[int]]:
+    """
+    Find cells a set of constraints proves safe or mined.
+
+    Applies the single-point rule and the subset rule until neither makes progress.
+
+    Returns:
+        (safe cells, mine cells)
+    """
+    rules = {(cells, needed) for cells, needed in rules if cells}
+    safe: Set[int] = set()
+    mines: Set[int] = set()
+
+    while True:
+        found_safe: Set[int] = set()
+        found_mines: Set[int] = set()
+        by_cell: Dict[int, List[Constraint]] = {}
+        for rule in rules:
+            cells, needed = rule
+            if needed == 0:
+                found_safe |= cells
+            elif needed == len(cells):
+                found_mines |= cells
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(rule)
+
+        if not found_safe and not found_mines:
+            # Subset rule: A within B means B - A holds needed(B) - needed(A) mines
+            for cells_a, needed_a in rules:
+                others = {rule for cell in cells_a for rule in by_cell[cell]}
+                for cells_b, needed_b in others:
+                    if len(cells_b) <= len(cells_a) or not cells_a < cells_b:
+                        continue
+                    diff = cells_b - cells_a
+                    extra = needed_b - needed_a
+                    if extra == 0:
+                        found_safe |= diff
+                    elif extra == len(diff):
+                        found_mines |= diff
+
+        if not found_safe and not found_mines:
+            return safe, mines
+        safe |= found_safe
+        mines |= found_mines
+        rules = substitute(rules, found_safe, found_mines)
+
+
+def substitute(rules: Iterable[Constraint], safe: Set[int], mines: Set[int]) -> Set[Constraint]:
+    """
+    Remove decided cells from constraints.
+
+    Constraints left without cells are dropped once satisfied; unsatisfied ones are
+    kept so the contradiction stays visible.
+    """
+    decided = safe | mines
+    result = set()
+    for cells, needed in rules:
+        if cells & decided:
+            needed -= len(cells & mines)
+            cells = cells - decided
+        if cells or needed != 0:
+            result.add((cells, needed))
+    return result
+
+
+def deduce(size: int, visible: List[int], known_mines: Optional[Set[int]] = None,
+           known_safe: Optional[Set[int]] = None) -> Tuple[Set[int], Set[int]]:
+    """
+    Find cells that are certainly safe or certainly mines.
+
+    Args:
+        size: Board side length
+        visible: Visible board
+        known_mines: Cells already known to be mines (not modified)
+        known_safe: Hidden cells already known to be safe (not modified)
+
+    Returns:
+        (safe cells, mine cells), including `known_safe` and `known_mines`
+    """
+    mines = set(known_mines or ())
+    safe = set(known_safe or ())
+    found_safe, found_mines = deduce_constraints(constraints(size, visible, mines, safe))
+    return safe | found_safe, mines | found_mines
+
+
+def _split_components(rules: Iterable[Constraint]) -> List[List[Constraint]]:
+    """Group constraints into independent components of shared cells."""
+    components: List[Tuple[Set[int], List[Constraint]]] = []
+    for rule in rules:
+        cells = set(rule[0])
+        merged_cells, merged_rules = cells, [rule]
+        remaining = []
+        for comp_cells, comp_rules in components:
+            if comp_cells & cells:
+                merged_cells |= comp_cells
+                merged_rules.extend(comp_rules)
+            else:
+                remaining.append((comp_cells, comp_rules))
+        remaining.append((merged_cells, merged_rules))
+        components = remaining
+    return [rules for _, rules in components]
+
+
+def component_key(rules: List[Constraint]) -> Tuple[Tuple[Tuple[int, ...], int], ...]:
+    """Hashable, order-independent key for a component's constraints."""
+    return tuple(sorted((tuple(sorted(cells)), needed) for cells, needed in rules))
+
+
+@lru_cache(maxsize=4096)
+def enumerate_component(key: Tuple[Tuple[Tuple[int, ...], int], ...]) -> Tuple[Tuple[int, ...], Dict[int, Tuple[int, Tuple[int, ...]]]]:
+    """
+    Enumerate every mine assignment satisfying a component's constraints.
+
+    Results are cached by constraint set, so positions sharing a component (for
+    example successive positions of one game) only solve it once.
+
+    Args:
+        key: Component key from `component_key`
+
+    Returns:
+        (cells, solutions) where solutions maps a mine count k to
+        (number of assignments, per-cell count of assignments with a mine)
+    """
+    cell_rules: Dict[int, List[int]] = {}
+    for r, (cells, _) in enumerate(key):
+        for cell in cells:
+            cell_rules.setdefault(cell, []).append(r)
+
+    # Order cells breadth-first so constraints close early and prune the search
+    order: List[int] = []
+    seen: Set[int] = set()
+    for start in sorted(cell_rules):
+        if start in seen:
+            continue
+        queue = [start]
+        seen.add(start)
+        while queue:
+            cell = queue.pop(0)
+            order.append(cell)
+            for r in cell_rules[cell]:
+                for other in key[r][0]:
+                    if other not in seen:
+                        seen.add(other)
+                        queue.append(other)
+
+    needed = [rule[1] for rule in key]
+    unassigned = [len(rule[0]) for rule in key]
+    assignment = [0] * len(order)
+    solutions: Dict[int, List] = {}
+
+    def search(pos: int, mines: int):
+        if pos == len(order):
+            entry = solutions.setdefault(mines, [0, [0] * len(order)])
+            entry[0] += 1
+            counts = entry[1]
+            for i, value in enumerate(assignment):
+                if value:
+                    counts[i] += 1
+            return
+        rules = cell_rules[order[pos]]
+        for value in (0, 1):
+            ok = True
+            for r in rules:
+                left = needed[r] - value
+                if left < 0 or left > unassigned[r] - 1:
+                    ok = False
+                    break
+            if not ok:
+                continue
+            for r in rules:
+                needed[r] -= value
+                unassigned[r] -= 1
+            assignment[pos] = value
+            search(pos + 1, mines + value)
+            for r in rules:
+                needed[r] += value
+                unassigned[r] += 1
+        assignment[pos] = 0
+
+    search(0, 0)
+    return tuple(order), {k: (count, tuple(counts)) for k, (count, counts) in solutions.items()}
+
+
+def _convolve(a: Dict[int, int], b: Dict[int, int]) -> Dict[int, int]:
+    result: Dict[int, int] = {}
+    for ka, va in a.items():
+        for kb, vb in b.items():
+            result[ka + kb] = result.get(ka + kb, 0) + va * vb
+    return result
+
+
+def constraint_weight(rules: Iterable[Constraint], interior: int, remaining: int) -> Optional[int]:
+    """
+    Count the mine layouts satisfying constraints.
+
+    Args:
+        rules: Constraints over the frontier cells
+        interior: Number of unknown cells outside every constraint
+        remaining: Mines left among frontier and interior cells
+
+    Returns:
+        Number of layouts, or None if a component is too large to enumerate
+    """
+    rules = list(rules)
+    if _contradicts(rules):
+        return 0
+    total: Dict[int, int] = {0: 1}
+    for comp_rules in _split_components(rules):
+        if len({cell for cells, _ in comp_rules for cell in cells}) > MAX_COMPONENT_CELLS:
+            return None
+        _, sols = enumerate_component(component_key(comp_rules))
+        total = _convolve(total, {k: count for k, (count, _) in sols.items()})
+    return sum(count * math.comb(interior, remaining - k)
+               for k, count in total.items() if 0 <= remaining - k <= interior)
+
+
+def constraint_probabilities(rules: Iterable[Constraint], interior: int,
+                             remaining: int) -> Optional[Tuple[Dict[int, float], float]]:
+    """
+    Exact mine probabilities under a set of constraints.
+
+    Frontier components are enumerated independently and combined with the
+    unconstrained interior cells through the remaining mine count. Components too
+    large to enumerate get the tightest local density of their constraints instead.
+
+    Args:
+        rules: Constraints over the frontier cells
+        interior: Number of unknown cells outside every constraint
+        remaining: Mines left among frontier and interior cells
+
+    Returns:
+        (probability per frontier cell, probability of each interior cell), or
+        None if the constraints cannot be satisfied
+    """
+    rules = list(rules)
+    if _contradicts(rules):
+        return None
+
+    # Settle what deductions already prove; it also shrinks the components to enumerate
+    safe, mines = deduce_constraints(rules)
+    if safe or mines:
+        rules = list(substitute(rules, safe, mines))
+        remaining -= len(mines)
+        if _contradicts(rules):
+            return None
+
+    exact = []
+    approx: Dict[int, float] = {}
+    for comp_rules in _split_components(rules):
+        comp_cells = {cell for cells, _ in comp_rules for cell in cells}
+        if len(comp_cells) > MAX_COMPONENT_CELLS:
+            for cell in comp_cells:
+                approx[cell] = max(needed / len(cells) for cells, needed in comp_rules if cell in cells)
+            continue
+        exact.append(enumerate_component(component_key(comp_rules)))
+    approx_mines = int(round(sum(approx.values())))
+
+    def interior_weight(k: int) -> int:
+        free = remaining - k - approx_mines
+        if free < 0 or free > interior:
+            return 0
+        return math.comb(interior, free)
+
+    dists = [{k: count for k, (count, _) in sols.items()} for _, sols in exact]
+    total: Dict[int, int] = {0: 1}
+    for dist in dists:
+        total = _convolve(total, dist)
+    norm = sum(count * interior_weight(k) for k, count in total.items())
+    if norm == 0:
+        return None
+
+    probs: Dict[int, float] = dict(approx)
+    probs.update((cell, 0.0) for cell in safe)
+    probs.update((cell, 1.0) for cell in mines)
+    for idx, (cells, sols) in enumerate(exact):
+        rest: Dict[int, int] = {0: 1}
+        for other, dist in enumerate(dists):
+            if other != idx:
+                rest = _convolve(rest, dist)
+        mine_weight = [0] * len(cells)
+        for k, (_, counts) in sols.items():
+            weight = sum(count * interior_weight(k + j) for j, count in rest.items())
+            if weight:
+                for i, c in enumerate(counts):
+                    mine_weight[i] += c * weight
+        for i, cell in enumerate(cells):
+            probs[cell] = mine_weight[i] / norm
+
+    interior_prob = 0.0
+    if interior:
+        expected = sum(count * interior_weight(k) * (remaining - k - approx_mines) for k, count in total.items())
+        interior_prob = expected / norm / interior
+    return probs, interior_prob
+
+
+def mine_probabilities(size: int, visible: List[int], total_mines: int,
+                       known_mines: Optional[Set[int]] = None,
+                       known_safe: Optional[Set[int]] = None) -> Dict[int, float]:
+    """
+    Exact probability that each unknown hidden cell is a mine.
+
+    Args:
+        size: Board side length
+        visible: Visible board
+        total_mines: Number of mines on the board
+        known_mines: Cells known to be mines; they are excluded from the result
+        known_safe: Hidden cells known to be safe; reported with probability 0
+
+    Returns:
+        Mapping from hidden cell to mine probability
+    """
+    known_mines = known_mines or set()
+    known_safe = {cell for cell in known_safe or () if visible[cell] == HIDDEN}
+    rules = constraints(size, visible, known_mines, known_safe)
+    frontier = set().union(*(cells for cells, _ in rules)) if rules else set()
+    interior = [i for i, v in enumerate(visible)
+                if v == HIDDEN and i not in known_mines and i not in frontier and i not in known_safe]
+    remaining = total_mines - len(known_mines)
+    probs: Dict[int, float] = {cell: 0.0 for cell in known_safe}
+
+    result = constraint_probabilities(rules, len(interior), remaining)
+    if result is None:
+        # Inconsistent board: fall back to the global density
+        density = remaining / max(1, len(interior) + len(frontier))
+        probs.update((cell, density) for cell in frontier)
+        probs.update((cell, density) for cell in interior)
+        return probs
+
+    frontier_probs, interior_prob = result
+    probs.update(frontier_probs)
+    probs.update((cell, interior_prob) for cell in interior)
+    return probs
+
@@ -40,6 +40,8 @@ class StatsManager:
             "games_by_difficulty": {"beginner": 0, "intermediate": 0, "expert": 0},
             "total_flags_placed": 0,
             "total_cells_revealed": 0,
+            "games_by_rating": {},  # difficulty class -> games
+            "wins_by_rating": {},  # difficulty class -> wins
         }
         self.achievements = self._init_achievements()
         self._load_stats()
@@ -111,7 +113,8 @@ class StatsManager:
 
     def record_game(self, board_size: int, num_mines: int, time_taken: float, 
                     won: bool, flags_placed: int, cells_revealed: int, 
-                    flags_correct: bool = False, no_flags_used: bool = False):
+                    flags_correct: bool = False, no_flags_used: bool = False,
+                    difficulty: str = ""):
         """
         Record a completed game.
         
@@ -124,6 +127,7 @@ class StatsManager:
             cells_revealed: Number of cells revealed
             flags_correct: Whether all flags were placed correctly
             no_flags_used: Whether no flags were used
+            difficulty: Difficulty class of the board (empty if unrated)
         """
         config = f"{board_size}x{board_size}_{num_mines}mines"
         
@@ -147,6 +151,9 @@ class StatsManager:
             self.stats["games_by_difficulty"]["intermediate"] += 1
         elif board_size == 22:
             self.stats["games_by_difficulty"]["expert"] += 1
+
+        # Track rated difficulty class
+        self._count_rating(difficulty, won)
         
         self.stats["total_flags_placed"] += flags_placed
         self.stats["total_cells_revealed"] += cells_revealed
@@ -157,6 +164,27 @@ class StatsManager:
         
         self.save_stats()
 
+    def record_rating(self, difficulty: str, won: bool):
+        """
+        Add the difficulty class of a game recorded before its board was rated.
+
+        Args:
+            difficulty: Difficulty class of the board (empty if rating failed)
+            won: Whether the game was won
+        """
+        if difficulty:
+            self._count_rating(difficulty, won)
+            self.save_stats()
+
+    def _count_rating(self, difficulty: str, won: bool):
+        """Count a game in its rated difficulty class."""
+        if difficulty:
+            by_rating = self.stats["games_by_rating"]
+            by_rating[difficulty] = by_rating.get(difficulty, 0) + 1
+            if won:
+                wins = self.stats["wins_by_rating"]
+                wins[difficulty] = wins.get(difficulty, 0) + 1
+
     def _check_achievements(self, board_size: int, num_mines: int, time_taken: float,
                            won: bool, flags_placed: int, flags_correct: bool, 
                            no_flags_used: bool):
@@ -221,6 +249,15 @@ class StatsManager:
         """Get total number of achievements."""
         return len(self.achievements)
 
+    def get_win_rate_by_rating(self) -> Dict[str, float]:
+        """Get win rate percentage for each rated difficulty class."""
+        wins = self.stats["wins_by_rating"]
+        return {
+            difficulty: (wins.get(difficulty, 0) / games) * 100
+            for difficulty, games in self.stats["games_by_rating"].items()
+            if games
+        }
+
     def get_win_rate(self) -> float:
         """Get win rate percentage."""
         total = self.stats["total_games"]
@@ -0,0 +1,127 @@
+"""
+Surface Pool for Minesweeper
+Reuses the scratch surfaces of animated effects and overlays instead of allocating them every frame
+"""
+
+import contextlib
+import math
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Tuple
+
+import pygame
+
+# Number of idle scratch surfaces kept; the least recently used sizes are dropped first
+MAX_FREE_SURFACES = 64
+
+# Frames of the pre-rendered explosion glow
+GLOW_FRAMES = 12
+
+SurfaceKey = Tuple[Tuple[int, int], int]
+
+
+class SurfacePool:
+    """
+    Scratch surfaces keyed by size and flags, plus the effect surfaces built from them:
+    the explosion glow frames of each cell size and the dimming overlay of each screen size.
+
+    `allocations` counts every surface the pool creates, so a steady animation should
+    leave it unchanged from frame to frame; `reuses` counts the surfaces it hands out
+    again instead.
+    """
+
+    def __init__(self, capacity: int = MAX_FREE_SURFACES):
+        """
+        Initialize pool.
+
+        Args:
+            capacity: Number of idle scratch surfaces to keep
+        """
+        self.capacity = capacity
+        self._free: "OrderedDict[SurfaceKey, List[pygame.Surface]]" = OrderedDict()
+        self._free_count = 0
+        self._glows: Dict[int, Tuple[pygame.Surface, ...]] = {}
+        self._overlays: Dict[Tuple[Tuple[int, int], Tuple[int, int, int, int]], pygame.Surface] = {}
+
+        # Statistics
+        self.allocations = 0
+        self.reuses = 0
+
+    @contextlib.contextmanager
+    def borrow(self, size: Tuple[int, int], flags: int = pygame.SRCALPHA) -> Iterator[pygame.Surface]:
+        """
+        Lend a scratch surface for the duration of a `with` block.
+
+        Its contents are left over from the last user: draw over all of it, or fill it first.
+
+        Args:
+            size: Width and height
+            flags: Surface flags, e.g. pygame.SRCALPHA
+        """
+        key = (tuple(size), flags)
+        free = self._free.get(key)
+        if free:
+            surface = free.pop()
+            self._free_count -= 1
+            self.reuses += 1
+        else:
+            surface = self._allocate(size, flags)
+        try:
+            yield surface
+        finally:
+            self._release(key, surface)
+
+    def get_explosion_glow(self, cell_size: int, progress: float) -> pygame.Surface:
+        """
+        The glow behind an exploding mine, `progress` of the way through its animation.
+
+        The glow grows and shrinks once while fading out; its GLOW_FRAMES frames are
+        rendered the first time a cell size is used.
+        """
+        frames = self._glows.get(cell_size)
+        if frames is None:
+            frames = tuple(self._bake_glow(cell_size, (i + 0.5) / GLOW_FRAMES) for i in range(GLOW_FRAMES))
+            self._glows[cell_size] = frames
+        else:
+            self.reuses += 1
+        return frames[min(GLOW_FRAMES - 1, max(0, int(progress * GLOW_FRAMES)))]
+
+    def get_overlay(self, size: Tuple[int, int], color: Tuple[int, int, int, int]) -> pygame.Surface:
+        """A translucent fill of the given size and RGBA color, built once."""
+        key = (tuple(size), tuple(color))
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = self._allocate(size, pygame.SRCALPHA)
+            overlay.fill(color)
+            self._overlays[key] = overlay
+        else:
+            self.reuses += 1
+        return overlay
+
+    def clear(self):
+        """Drop every kept surface (after the window is resized, when their sizes change)."""
+        self._free.clear()
+        self._free_count = 0
+        self._glows.clear()
+        self._overlays.clear()
+
+    def _bake_glow(self, cell_size: int, progress: float) -> pygame.Surface:
+        glow_size = int(cell_size * (1 + 0.3 * math.sin(progress * math.pi)))
+        glow = self._allocate((glow_size, glow_size), pygame.SRCALPHA)
+        glow_color = (255, 200, 100, int(150 * (1 - progress)))
+        pygame.draw.rect(glow, glow_color, glow.get_rect(), border_radius=6)
+        return glow
+
+    def _allocate(self, size: Tuple[int, int], flags: int) -> pygame.Surface:
+        self.allocations += 1
+        return pygame.Surface(size, flags)
+
+    def _release(self, key: SurfaceKey, surface: pygame.Surface):
+        self._free.setdefault(key, []).append(surface)
+        self._free.move_to_end(key)
+        self._free_count += 1
+        while self._free_count > self.capacity:
+            oldest_key, oldest = next(iter(self._free.items()))
+            oldest.pop(0)
+            self._free_count -= 1
+            if not oldest:
+                del self._free[oldest_key]
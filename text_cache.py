@@ -0,0 +1,66 @@
+"""
+Text Surface Cache for Minesweeper
+Keeps rendered text surfaces so unchanged labels are not re-rasterised every frame
+"""
+
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+# Number of rendered strings kept; the least recently used are dropped first
+MAX_ENTRIES = 512
+
+
+class TextCache:
+    """Least-recently-used cache of rendered text, with hit/miss counters."""
+
+    def __init__(self, capacity: int = MAX_ENTRIES):
+        """
+        Initialize cache.
+
+        Args:
+            capacity: Number of rendered strings to keep
+        """
+        self.capacity = capacity
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, ...], antialias: bool = True) -> pygame.Surface:
+        """
+        Render text like `font.render`, reusing an earlier surface for the same arguments.
+
+        The returned surface is shared: blit or copy it, never draw on it.
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def get_hit_rate(self) -> float:
+        """Fraction of renders served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        """Drop every cached surface (e.g. after the fonts are rebuilt)."""
+        self._surfaces.clear()
+
+
+# Shared by every widget and screen
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, ...], antialias: bool = True) -> pygame.Surface:
+    """Render text through the shared cache."""
+    return text_cache.render(font, text, color, antialias)
@@ -3,6 +3,10 @@ Theme definitions for Minesweeper
 Contains all color schemes and visual themes
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
 THEMES = {
     "Ocean": {
         "background": (20, 30, 48),
@@ -505,3 +509,71 @@ THEMES = {
         ],
     },
 }
+
+Color = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class Palette:
+    """
+    Resolved colors of one theme variant.
+
+    Read colors as attributes (`palette.cell_hidden`) or by key (`palette["cell_hidden"]`)
+    like the raw THEMES entries.
+    """
+
+    background: Color
+    header: Color
+    cell_hidden: Color
+    cell_hidden_hover: Color
+    cell_revealed: Color
+    cell_mine: Color
+    cell_flag: Color
+    border: Color
+    text: Color
+    text_dark: Color
+    button: Color
+    button_hover: Color
+    numbers: Tuple[Color, ...]
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+
+def _darken(colors: dict) -> dict:
+    """Apply dark mode adjustment to theme colors with better contrast."""
+    darkened = dict(colors)
+
+    # Darken backgrounds more substantially for dark mode
+    darkened["background"] = tuple(max(0, c - 50) for c in colors["background"])
+    darkened["header"] = tuple(max(0, c - 50) for c in colors["header"])
+    darkened["cell_revealed"] = tuple(max(0, c - 80) for c in colors["cell_revealed"])
+    darkened["cell_hidden"] = tuple(max(0, c - 40) for c in colors["cell_hidden"])
+    darkened["cell_hidden_hover"] = tuple(max(0, c - 40) for c in colors["cell_hidden_hover"])
+
+    # Make text much lighter for visibility on dark backgrounds
+    darkened["text"] = tuple(min(255, max(200, c + 120)) for c in colors["text"])
+    darkened["text_dark"] = tuple(min(255, max(150, c + 100)) for c in colors["text_dark"])
+
+    # Enhance number colors for dark mode - make them brighter and more saturated
+    darkened["numbers"] = [tuple(min(255, c + 80) for c in color) for color in colors["numbers"]]
+
+    # Ensure good contrast on buttons and borders
+    darkened["border"] = tuple(min(255, c + 60) for c in colors["border"])
+
+    return darkened
+
+
+@lru_cache(maxsize=None)
+def compile_theme(name: str, dark_mode: bool = False) -> Palette:
+    """
+    Get the palette of a theme, computing each theme and dark-mode variant only once.
+
+    Args:
+        name: Key in THEMES
+        dark_mode: Apply the dark mode adjustment
+    """
+    colors = THEMES[name]
+    if dark_mode:
+        colors = _darken(colors)
+    return Palette(**{**colors, "numbers": tuple(colors["numbers"])})
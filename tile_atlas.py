@@ -0,0 +1,151 @@
+"""
+Tile Atlas for Minesweeper
+Pre-renders the static cell tiles of a theme and cell size so a cell is drawn with one blit
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, Tuple, Union
+
+import pygame
+
+from themes import Palette
+
+# Number of atlases kept around for recently used themes and cell sizes
+MAX_ATLASES = 8
+
+# Tile names besides the numbers 1-8
+TILE_HIDDEN = "hidden"
+TILE_HIDDEN_HOVER = "hidden_hover"
+TILE_FLAG = "flag"
+TILE_FLAG_HOVER = "flag_hover"
+TILE_REVEALED = "revealed"
+TILE_MINE = "mine"
+
+TileKey = Union[str, int]
+
+
+def draw_mine(surface: pygame.Surface, center: Tuple[int, int], cell_size: int, progress: float):
+    """Draw a mine; `progress` < 1 shrinks it and turns its spikes (explosion animation)."""
+    scale = 0.8 + 0.2 * progress
+
+    # Main circle
+    radius = int(cell_size // 4 * scale)
+    pygame.draw.circle(surface, (0, 0, 0), center, radius)
+    pygame.draw.circle(surface, (50, 50, 50), center, int(radius * 0.6))
+
+    # Spikes with rotation animation
+    rotation_offset = (1 - progress) * 45
+    for angle in range(0, 360, 45):
+        actual_angle = angle + rotation_offset
+        end_x = center[0] + int(math.cos(math.radians(actual_angle)) * cell_size // 3 * scale)
+        end_y = center[1] + int(math.sin(math.radians(actual_angle)) * cell_size // 3 * scale)
+        pygame.draw.line(surface, (0, 0, 0), center, (end_x, end_y), 2)
+
+
+def draw_flag(surface: pygame.Surface, center: Tuple[int, int], cell_size: int, scale: float,
+              color: Tuple[int, int, int]):
+    """Draw a flag scaled by `scale`."""
+    # Pole
+    pole_height = int(cell_size // 2 * scale)
+    pygame.draw.line(
+        surface, (100, 100, 100), (center[0], center[1] + pole_height // 2), (center[0], center[1] - pole_height // 2), 2
+    )
+
+    # Flag triangle
+    flag_size = int(cell_size // 4 * scale)
+    points = [
+        (center[0], center[1] - pole_height // 2),
+        (center[0] + flag_size, center[1] - pole_height // 2 + flag_size // 2),
+        (center[0], center[1] - pole_height // 2 + flag_size),
+    ]
+    pygame.draw.polygon(surface, color, points)
+
+
+class TileAtlas:
+    """The static tiles of one theme at one cell size."""
+
+    def __init__(self, theme: Palette, cell_size: int, font: pygame.font.Font):
+        """
+        Render every tile.
+
+        Args:
+            theme: Palette of the theme variant
+            cell_size: Board cell size; tiles are cell_size - 2 pixels square
+            font: Font for the numbers
+        """
+        self.cell_size = cell_size
+        self.tiles: Dict[TileKey, pygame.Surface] = {}
+
+        self.tiles[TILE_HIDDEN] = self._tile(theme.cell_hidden)
+        self.tiles[TILE_HIDDEN_HOVER] = self._tile(theme.cell_hidden_hover)
+        self.tiles[TILE_REVEALED] = self._tile(theme.cell_revealed)
+        for name, background in ((TILE_FLAG, TILE_HIDDEN), (TILE_FLAG_HOVER, TILE_HIDDEN_HOVER)):
+            tile = self.tiles[background].copy()
+            draw_flag(tile, tile.get_rect().center, cell_size, 1.0, theme.cell_flag)
+            self.tiles[name] = tile
+
+        mine = self._tile(theme.cell_mine)
+        draw_mine(mine, mine.get_rect().center, cell_size, 1.0)
+        self.tiles[TILE_MINE] = mine
+
+        for number in range(1, 9):
+            tile = self.tiles[TILE_REVEALED].copy()
+            text = font.render(str(number), True, theme.numbers[number])
+            tile.blit(text, text.get_rect(center=tile.get_rect().center))
+            self.tiles[number] = tile
+
+    def _tile(self, color: Tuple[int, int, int]) -> pygame.Surface:
+        """A cell background with the board's rounded corners left transparent."""
+        size = self.cell_size - 2
+        tile = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(tile, color, tile.get_rect(), border_radius=4)
+        return tile
+
+    def get(self, key: TileKey) -> pygame.Surface:
+        """Get a tile by name, or by number for a revealed cell with 1-8 adjacent mines."""
+        return self.tiles[key]
+
+
+class AtlasCache:
+    """Least-recently-used cache of tile atlases."""
+
+    def __init__(self, capacity: int = MAX_ATLASES):
+        """
+        Initialize cache.
+
+        Args:
+            capacity: Number of atlases to keep
+        """
+        self.capacity = capacity
+        self._atlases: "OrderedDict[tuple, TileAtlas]" = OrderedDict()
+        self.builds = 0
+
+    def get(self, theme_name: str, dark_mode: bool, cell_size: int, theme: Palette,
+            font: pygame.font.Font) -> TileAtlas:
+        """
+        Get the atlas for a theme variant and cell size, building it on first use.
+
+        The font height is part of the key since fonts are rebuilt when the window is
+        resized, even if the cell size stays the same.
+
+        Args:
+            theme_name: Name of the theme in THEMES
+            dark_mode: Whether dark mode is applied
+            cell_size: Board cell size
+            theme: Palette of the theme variant
+            font: Font for the numbers
+        """
+        key = (theme_name, dark_mode, cell_size, font.get_height())
+        atlas = self._atlases.get(key)
+        if atlas is not None:
+            self._atlases.move_to_end(key)
+            return atlas
+
+        atlas = TileAtlas(theme, cell_size, font)
+        self.builds += 1
+        self._atlases[key] = atlas
+        if len(self._atlases) > self.capacity:
+            self._atlases.popitem(last=False)
+        return atlas
+
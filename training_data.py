@@ -0,0 +1,216 @@
+"""
+Training Data Export for Minesweeper
+Generates labelled positions from seeded self-play games and stores them as .npy shards
+
+Each shard holds two fixed-shape arrays:
+    visible_XXXXX.npy  int8 (N, size, size)  - observation, HIDDEN (-1) on hidden cells
+    mines_XXXXX.npy    bool (N, size, size)  - true mine mask of the hidden cells
+
+An `index.json` file lists the completed shards. Generation is deterministic per shard
+seed and resumable: shards already listed in the index are skipped.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from batched_env import BatchedMinesweeperEnv
+
+INDEX_FILE = "index.json"
+
+
+def shard_seed(base_seed: int, shard: int) -> int:
+    """Derive the seed of one shard from the dataset seed."""
+    return int(np.random.SeedSequence([base_seed, shard]).generate_state(1)[0])
+
+
+def generate_positions(seed: int, count: int, board_size: int, num_mines: int,
+                       num_envs: int = 256, safe_move_prob: float = 0.9) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Play seeded games and collect `count` positions.
+
+    The policy reveals a random hidden safe cell with probability `safe_move_prob`
+    and a random hidden cell otherwise, so games reach mid- and late-game positions.
+
+    Args:
+        seed: Seed for board generation and the policy
+        count: Number of positions to collect
+        board_size: Board side length
+        num_mines: Number of mines per board
+        num_envs: Boards simulated in lockstep
+        safe_move_prob: Probability of playing a safe move
+
+    Returns:
+        (visible, mines) arrays of shape (count, size, size)
+    """
+    env = BatchedMinesweeperEnv(num_envs, board_size, num_mines, seed=seed)
+    rng = np.random.default_rng([seed, 1])
+    cells = board_size * board_size
+    shape = (count, board_size, board_size)
+    visible = np.empty(shape, dtype=np.int8)
+    mines = np.empty(shape, dtype=bool)
+    filled = 0
+
+    obs = env.reset()
+    while filled < count:
+        # Positions before the first click carry no information
+        started = np.flatnonzero(~env.first_click)
+        take = started[:count - filled]
+        visible[filled:filled + take.size] = obs[take]
+        mines[filled:filled + take.size] = env.mines[take] & ~env.revealed[take]
+        filled += take.size
+
+        hidden = env.action_mask()
+        safe_hidden = hidden & ~env.mines.reshape(num_envs, cells)
+        play_safe = (rng.random(num_envs) < safe_move_prob) & safe_hidden.any(axis=1)
+        candidates = np.where(play_safe[:, None], safe_hidden, hidden)
+        keys = np.where(candidates, rng.random((num_envs, cells)), -1.0)
+        obs, _, _, _ = env.step(keys.argmax(axis=1))
+
+    return visible, mines
+
+
+def _save_array(path: str, array: np.ndarray):
+    """Write an .npy file atomically so an interrupted run leaves no partial shard."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def write_shard(out_dir: str, shard: int, seed: int, count: int, board_size: int,
+                num_mines: int) -> Dict:
+    """
+    Generate one shard and write it to `out_dir`.
+
+    Returns:
+        Index entry describing the shard
+    """
+    visible, mines = generate_positions(seed, count, board_size, num_mines)
+    visible_file = f"visible_{shard:05d}.npy"
+    mines_file = f"mines_{shard:05d}.npy"
+    _save_array(os.path.join(out_dir, visible_file), visible)
+    _save_array(os.path.join(out_dir, mines_file), mines)
+    return {"shard": shard, "seed": seed, "count": count, "visible": visible_file, "mines": mines_file}
+
+
+def load_index(out_dir: str) -> Optional[Dict]:
+    """Load a dataset index, or None if the directory has none yet."""
+    path = os.path.join(out_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_index(out_dir: str, index: Dict):
+    index["shards"].sort(key=lambda entry: entry["shard"])
+    tmp_path = os.path.join(out_dir, INDEX_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, INDEX_FILE))
+
+
+def export_dataset(out_dir: str, num_shards: int, positions_per_shard: int = 65536,
+                   board_size: int = 16, num_mines: int = 40, base_seed: int = 0,
+                   workers: Optional[int] = None) -> Dict:
+    """
+    Generate a sharded dataset across worker processes, resuming an earlier run.
+
+    Args:
+        out_dir: Output directory
+        num_shards: Total number of shards the dataset should contain
+        positions_per_shard: Positions per shard
+        board_size: Board side length
+        num_mines: Number of mines per board
+        base_seed: Dataset seed; each shard derives its own seed from it
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        The dataset index
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    config = {
+        "board_size": board_size,
+        "num_mines": num_mines,
+        "positions_per_shard": positions_per_shard,
+        "base_seed": base_seed,
+    }
+    index = load_index(out_dir)
+    if index is None:
+        index = dict(config, shards=[])
+    elif any(index.get(key) != value for key, value in config.items()):
+        raise ValueError(f"{out_dir} already holds a dataset with a different configuration")
+
+    done = {entry["shard"] for entry in index["shards"]}
+    pending = [shard for shard in range(num_shards) if shard not in done]
+    if not pending:
+        return index
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(write_shard, out_dir, shard, shard_seed(base_seed, shard),
+                        positions_per_shard, board_size, num_mines)
+            for shard in pending
+        ]
+        for future in as_completed(futures):
+            index["shards"].append(future.result())
+            _save_index(out_dir, index)
+    return index
+
+
+def iter_batches(out_dir: str, batch_size: int = 1024,
+                 shuffle_seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream (visible, mines) batches from a dataset without loading it into RAM.
+
+    Shards are memory-mapped; only the rows of the current batch are read.
+
+    Args:
+        out_dir: Dataset directory
+        batch_size: Rows per batch (the last batch of a shard may be smaller)
+        shuffle_seed: Shuffle shard order and rows within each shard when given
+    """
+    index = load_index(out_dir)
+    if index is None:
+        raise FileNotFoundError(f"No {INDEX_FILE} in {out_dir}")
+
+    shards: List[Dict] = list(index["shards"])
+    rng = np.random.default_rng(shuffle_seed) if shuffle_seed is not None else None
+    if rng is not None:
+        rng.shuffle(shards)
+
+    for entry in shards:
+        visible = np.load(os.path.join(out_dir, entry["visible"]), mmap_mode="r")
+        mines = np.load(os.path.join(out_dir, entry["mines"]), mmap_mode="r")
+        order = np.arange(len(visible))
+        if rng is not None:
+            rng.shuffle(order)
+        for start in range(0, len(order), batch_size):
+            rows = np.sort(order[start:start + batch_size])
+            yield np.asarray(visible[rows]), np.asarray(mines[rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Minesweeper self-play training data")
+    parser.add_argument("out_dir")
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--positions", type=int, default=65536, help="positions per shard")
+    parser.add_argument("--size", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    index = export_dataset(args.out_dir, args.shards, args.positions, args.size, args.mines,
+                           args.seed, args.workers)
+    total = sum(entry["count"] for entry in index["shards"])
+    print(f"{len(index['shards'])} shards, {total} positions in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Retained UI Tree for Minesweeper
+A screen's widgets indexed by position, repainted one by one over a cached image of the rest of the screen
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pygame
+
+from themes import Palette
+
+# Side of the square buckets of the spatial index, in pixels
+GRID_CELL = 64
+
+# Events delivered to widgets
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+def get_bounds(widget) -> pygame.Rect:
+    """Area a widget draws in: its `bounds` if it has one (e.g. a slider's label), else its rect."""
+    return getattr(widget, "bounds", widget.rect)
+
+
+def coalesce_motion(events: Iterable[pygame.event.Event]) -> List[pygame.event.Event]:
+    """
+    Drop mouse motion events that are followed directly by another, so a burst of
+    motion is handled once at its latest position. Clicks keep their place in between.
+    """
+    events = list(events)
+    return [
+        event for i, event in enumerate(events)
+        if event.type != pygame.MOUSEMOTION or i + 1 == len(events) or events[i + 1].type != pygame.MOUSEMOTION
+    ]
+
+
+class WidgetTree:
+    """
+    The widgets of one screen (buttons and sliders: anything with `rect`, `draw` and
+    `handle_event`), with:
+
+    - a grid index, so a mouse event only reaches the widgets under it, the hovered
+      ones and the one being dragged;
+    - the names of widgets whose hover state or value changed since the last paint;
+    - `static`, an image of the screen without its widgets, to repaint a changed
+      widget over without redrawing the screen.
+    """
+
+    def __init__(self):
+        """Initialize an empty tree (filled by `set_widgets` after each layout)."""
+        self.widgets: Dict[str, object] = {}
+        self.hidden: Set[str] = set()
+        self.changed: Set[str] = set()
+        self.static: Optional[pygame.Surface] = None
+        self._grid: Dict[Tuple[int, int], List[str]] = {}
+        self._hovered: Set[str] = set()
+        self._captured: Optional[str] = None
+
+    def set_widgets(self, widgets: Dict[str, object]):
+        """Replace the widgets (after a layout) and rebuild the index."""
+        self.widgets = dict(widgets)
+        self.hidden &= set(self.widgets)
+        self.changed.clear()
+        self.static = None
+        self._hovered = {name for name, widget in self.widgets.items() if getattr(widget, "hovered", False)}
+        self._captured = None
+        self._grid = {}
+        for name, widget in self.widgets.items():
+            bounds = get_bounds(widget)
+            for gy in range(bounds.top // GRID_CELL, (bounds.bottom - 1) // GRID_CELL + 1):
+                for gx in range(bounds.left // GRID_CELL, (bounds.right - 1) // GRID_CELL + 1):
+                    self._grid.setdefault((gx, gy), []).append(name)
+
+    def set_visible(self, name: str, visible: bool):
+        """Show or hide a widget; hidden widgets are neither drawn nor sent events."""
+        if visible:
+            self.hidden.discard(name)
+        else:
+            self.hidden.add(name)
+
+    def widgets_at(self, pos: Tuple[int, int]) -> List[str]:
+        """Names of the visible widgets whose bounds contain a point, in insertion order."""
+        names = self._grid.get((pos[0] // GRID_CELL, pos[1] // GRID_CELL), ())
+        return [name for name in names
+                if name not in self.hidden and get_bounds(self.widgets[name]).collidepoint(pos)]
+
+    def route(self, event: pygame.event.Event) -> Optional[str]:
+        """
+        Deliver a mouse event to the widgets it concerns, recording any that change.
+
+        Returns:
+            Name of the first widget that took the event (a clicked button, a grabbed
+            or dragged slider), or None
+        """
+        if event.type not in MOUSE_EVENTS:
+            return None
+        names = set(self.widgets_at(event.pos))
+        if event.type == pygame.MOUSEMOTION:
+            names |= self._hovered
+        if self._captured is not None:
+            names.add(self._captured)
+
+        taken = None
+        for name in self.widgets:  # Insertion order, like the handlers' if/elif chains
+            if name not in names:
+                continue
+            widget = self.widgets[name]
+            before = _get_state(widget)
+            if widget.handle_event(event) and taken is None:
+                taken = name
+            if _get_state(widget) != before:
+                self.changed.add(name)
+            if getattr(widget, "hovered", False):
+                self._hovered.add(name)
+            else:
+                self._hovered.discard(name)
+
+        if event.type == pygame.MOUSEBUTTONDOWN and taken is not None and getattr(self.widgets[taken], "dragging", False):
+            self._captured = taken
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self._captured = None
+        return taken
+
+    def mark_changed(self, name: str):
+        """Repaint a widget whose look was changed from outside (e.g. a slider's range)."""
+        self.changed.add(name)
+
+    def draw(self, screen: pygame.Surface, theme: Palette):
+        """Draw every visible widget."""
+        for name, widget in self.widgets.items():
+            if name not in self.hidden:
+                widget.draw(screen, theme)
+        self.changed.clear()
+
+    def repaint(self, screen: pygame.Surface, theme: Palette) -> List[pygame.Rect]:
+        """
+        Redraw only the changed widgets, each over the cached static image.
+
+        Returns:
+            Screen regions that were redrawn
+        """
+        regions = []
+        for name in self.changed:
+            if name in self.hidden:
+                continue
+            region = get_bounds(self.widgets[name]).clip(screen.get_rect())
+            screen.set_clip(region)
+            screen.blit(self.static, region, region)
+            for other in self.widgets_overlapping(region):
+                self.widgets[other].draw(screen, theme)
+            screen.set_clip(None)
+            regions.append(region)
+        self.changed.clear()
+        return regions
+
+    def widgets_overlapping(self, region: pygame.Rect) -> List[str]:
+        """Names of the visible widgets whose bounds intersect a region, in drawing order."""
+        names = set()
+        for gy in range(region.top // GRID_CELL, (region.bottom - 1) // GRID_CELL + 1):
+            for gx in range(region.left // GRID_CELL, (region.right - 1) // GRID_CELL + 1):
+                names.update(self._grid.get((gx, gy), ()))
+        return [name for name in self.widgets
+                if name in names and name not in self.hidden and get_bounds(self.widgets[name]).colliderect(region)]
+
+
+def _get_state(widget) -> tuple:
+    """What a repaint depends on."""
+    return getattr(widget, "hovered", None), getattr(widget, "value", None), getattr(widget, "max_val", None)